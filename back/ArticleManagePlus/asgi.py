@@ -11,6 +11,19 @@ import os
 
 from django.core.asgi import get_asgi_application
 
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "AiFuture.settings")
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "ArticleManagePlus.settings")
 
-application = get_asgi_application()
+# 先初始化 Django，再导入依赖模型的路由
+django_asgi_app = get_asgi_application()
+
+from channels.routing import ProtocolTypeRouter, URLRouter  # noqa: E402
+
+from apps.users.routing import websocket_urlpatterns  # noqa: E402
+from utils.middleware import JWTAuthMiddleware  # noqa: E402
+
+application = ProtocolTypeRouter(
+    {
+        "http": django_asgi_app,
+        "websocket": JWTAuthMiddleware(URLRouter(websocket_urlpatterns)),
+    }
+)
@@ -55,6 +55,7 @@ ALLOWED_HOSTS = ["*"]
 # Application definition
 
 INSTALLED_APPS = [
+    "daphne",
     "simpleui",
     "django.contrib.admin",
     "django.contrib.auth",
@@ -66,6 +67,7 @@ INSTALLED_APPS = [
     "rest_framework_simplejwt",
     "django_filters",
     "drf_spectacular",
+    "channels",
     # "django_q",
     "apps.users",
     "apps.crawlers",
@@ -111,6 +113,16 @@ CACHES = {
     "default": env.cache_url("REDIS_URL"),
 }
 
+# 客户端推送通道（ws/push/），多进程部署时通过 Redis 分发消息
+CHANNEL_LAYERS = {
+    "default": {
+        "BACKEND": "channels_redis.core.RedisChannelLayer",
+        "CONFIG": {"hosts": [env("REDIS_URL")]},
+    }
+    if env("REDIS_URL")
+    else {"BACKEND": "channels.layers.InMemoryChannelLayer"}
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -5,3 +5,6 @@ class CrawlersConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.crawlers"
     verbose_name = "爬虫管理"
+
+    def ready(self):
+        from apps.crawlers import signals  # noqa: F401
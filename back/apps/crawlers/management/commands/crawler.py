@@ -4,47 +4,104 @@
 # @email:anningforchina@gmail.com
 # @time:2024/11/13 22:30
 # @file:crawler.py
-from django.core.management import BaseCommand
+import json
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.core.management import BaseCommand, CommandError
 from django.db import transaction
 
 from apps.crawlers.crawler_data.classify import data as classify_data
 from apps.crawlers.crawler_data.platform import data as platform_data
 from apps.crawlers.models import NewsCategory, Platform, PlatformCategory
+from utils.redis_cli import CRAWLER_CACHE_NAMESPACE, bump_cache_version
 
 
 class Command(BaseCommand):
     help = "增量更新爬虫平台及分类"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--catalog",
+            help="外部数据源目录文件（JSON/YAML），包含 classify 和 platform 两个列表，缺省的部分使用内置数据",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="只输出差异，不写入数据库",
+        )
+
     def handle(self, *args, **options):
-        with transaction.atomic():
+        self.dry_run = options["dry_run"]
+        self.verbose = self.dry_run or options["verbosity"] > 1
+        classify, platforms = self.load_catalog(options["catalog"])
+
+        with self.timed("数据同步"), transaction.atomic():
             # 更新分类数据
-            self.update_news_categories()
+            with self.timed("更新分类"):
+                self.update_news_categories(classify)
 
             # 更新平台数据
-            self.update_platforms()
+            with self.timed("更新平台"):
+                self.update_platforms(platforms)
 
             # 更新平台分类数据
-            self.update_platform_categories()
+            with self.timed("更新平台分类"):
+                self.update_platform_categories(platforms)
+
+            if self.dry_run:
+                transaction.set_rollback(True)
 
+        if self.dry_run:
+            self.stdout.write(self.style.WARNING("dry-run 模式，已回滚，未写入任何数据"))
+            return
+
+        # 使平台及分类列表接口的响应缓存失效
+        bump_cache_version(CRAWLER_CACHE_NAMESPACE)
         self.stdout.write(self.style.SUCCESS("数据同步完成"))
 
-    def update_news_categories(self):
+    @contextmanager
+    def timed(self, label):
+        start = time.perf_counter()
+        yield
+        self.stdout.write(f"{label} 耗时 {(time.perf_counter() - start) * 1000:.1f}ms")
+
+    def diff(self, message):
+        if self.verbose:
+            self.stdout.write(f"  {message}")
+
+    def load_catalog(self, path):
+        """读取外部数据源目录，未提供时使用内置数据"""
+        if not path:
+            return classify_data, platform_data
+
+        path = Path(path)
+        if not path.exists():
+            raise CommandError(f"数据源文件不存在: {path}")
+        text = path.read_text(encoding="utf-8")
+        if path.suffix in (".yaml", ".yml"):
+            try:
+                import yaml
+            except ImportError as e:
+                raise CommandError("读取 YAML 数据源需要安装 pyyaml") from e
+            catalog = yaml.safe_load(text)
+        else:
+            catalog = json.loads(text)
+
+        if not isinstance(catalog, dict):
+            raise CommandError("数据源文件格式错误，应为包含 classify / platform 的对象")
+        return catalog.get("classify", classify_data), catalog.get("platform", platform_data)
+
+    def update_news_categories(self, classify):
         """更新新闻分类数据"""
-        existing_categories = {category.code: category for category in NewsCategory.objects.all()}
-        new_categories = []
-        for category in classify_data:
-            if category["code"] in existing_categories:
-                # 如果分类已存在，检查是否需要更新
-                existing_category = existing_categories[category["code"]]
-                if (
-                    existing_category.name != category["name"]
-                    or existing_category.children != category["children"]
-                ):
-                    existing_category.name = category["name"]
-                    existing_category.children = category["children"]
-                    existing_category.save()
-            else:
+        existing_categories = NewsCategory.objects.in_bulk(field_name="code")
+        new_categories, changed_categories = [], []
+        for category in classify:
+            existing_category = existing_categories.get(category["code"])
+            if existing_category is None:
                 # 如果分类不存在，添加新的分类
+                self.diff(f"新增分类 {category['code']}: {category['name']}")
                 new_categories.append(
                     NewsCategory(
                         name=category["name"],
@@ -52,71 +109,87 @@ class Command(BaseCommand):
                         children=category["children"],
                     )
                 )
+            elif (
+                existing_category.name != category["name"]
+                or existing_category.children != category["children"]
+            ):
+                # 如果分类已存在且有变化，批量更新
+                self.diff(f"更新分类 {category['code']}: {existing_category.name} -> {category['name']}")
+                existing_category.name = category["name"]
+                existing_category.children = category["children"]
+                changed_categories.append(existing_category)
         NewsCategory.objects.bulk_create(new_categories)
+        NewsCategory.objects.bulk_update(changed_categories, ["name", "children"])
         self.stdout.write(
             self.style.SUCCESS(
-                f"更新分类: {len(new_categories)} 条新增，{len(existing_categories)} 条已存在"
+                f"更新分类: {len(new_categories)} 条新增，{len(changed_categories)} 条更新，{len(existing_categories)} 条已存在"
             )
         )
 
-    def update_platforms(self):
+    def update_platforms(self, platforms):
         """更新平台数据"""
-        existing_platforms = {platform.code: platform for platform in Platform.objects.all()}
-        new_platforms = []
-        for platform in platform_data:
-            if platform["code"] in existing_platforms:
-                # 如果平台已存在，检查是否需要更新
-                existing_platform = existing_platforms[platform["code"]]
-                if existing_platform.name != platform["name"]:
-                    existing_platform.name = platform["name"]
-                    existing_platform.save()
-            else:
+        existing_platforms = Platform.objects.in_bulk(field_name="code")
+        new_platforms, changed_platforms = [], []
+        for platform in platforms:
+            existing_platform = existing_platforms.get(platform["code"])
+            if existing_platform is None:
                 # 如果平台不存在，添加新的平台
+                self.diff(f"新增平台 {platform['code']}: {platform['name']}")
                 new_platforms.append(Platform(name=platform["name"], code=platform["code"]))
+            elif existing_platform.name != platform["name"]:
+                self.diff(f"更新平台 {platform['code']}: {existing_platform.name} -> {platform['name']}")
+                existing_platform.name = platform["name"]
+                changed_platforms.append(existing_platform)
         Platform.objects.bulk_create(new_platforms)
+        Platform.objects.bulk_update(changed_platforms, ["name"])
         self.stdout.write(
             self.style.SUCCESS(
-                f"更新平台: {len(new_platforms)} 条新增，{len(existing_platforms)} 条已存在"
+                f"更新平台: {len(new_platforms)} 条新增，{len(changed_platforms)} 条更新，{len(existing_platforms)} 条已存在"
             )
         )
 
-    def update_platform_categories(self):
+    def update_platform_categories(self, platforms):
         """更新平台分类数据"""
-        existing_platform_categories = {
-            (pc.platform.code, pc.code): pc
-            for pc in PlatformCategory.objects.select_related("platform", "news_category")
-        }
-        new_platform_categories = []
-        for platform in platform_data:
-            platform_instance = Platform.objects.get(code=platform["code"])
-            if "children" in platform:
-                for child in platform["children"]:
-                    category_key = (platform["code"], child["code"])
-                    if category_key in existing_platform_categories:
-                        # 如果平台分类已存在，检查是否需要更新
-                        existing_category = existing_platform_categories[category_key]
-                        news_category = NewsCategory.objects.get(code=child["classify"])
-                        if (
-                            existing_category.name != child["name"]
-                            or existing_category.news_category != news_category
-                        ):
-                            existing_category.name = child["name"]
-                            existing_category.news_category = news_category
-                            existing_category.save()
-                    else:
-                        # 如果平台分类不存在，添加新的平台分类
-                        news_category = NewsCategory.objects.get(code=child["classify"])
-                        new_platform_categories.append(
-                            PlatformCategory(
-                                platform=platform_instance,
-                                name=child["name"],
-                                code=child["code"],
-                                news_category=news_category,
-                            )
+        # bulk_create 在部分数据库上不会回填主键，这里重新加载一次映射
+        platform_map = Platform.objects.in_bulk(field_name="code")
+        category_map = NewsCategory.objects.in_bulk(field_name="code")
+        existing_platform_categories = PlatformCategory.objects.in_bulk(field_name="code")
+        new_platform_categories, changed_platform_categories = [], []
+        for platform in platforms:
+            platform_instance = platform_map[platform["code"]]
+            for child in platform.get("children", []):
+                news_category = category_map.get(child["classify"])
+                if news_category is None:
+                    raise CommandError(f"平台分类 {child['name']} 对应的新闻分类 {child['classify']} 不存在")
+                existing_category = existing_platform_categories.get(child["code"])
+                if existing_category is None:
+                    # 如果平台分类不存在，添加新的平台分类
+                    self.diff(f"新增平台分类 {platform['name']} - {child['name']}")
+                    new_platform_categories.append(
+                        PlatformCategory(
+                            platform=platform_instance,
+                            name=child["name"],
+                            code=child["code"],
+                            news_category=news_category,
                         )
+                    )
+                elif (
+                    existing_category.name != child["name"]
+                    or existing_category.platform_id != platform_instance.id
+                    or existing_category.news_category_id != news_category.id
+                ):
+                    # 如果平台分类已存在且有变化，批量更新
+                    self.diff(f"更新平台分类 {platform['name']} - {existing_category.name} -> {child['name']}")
+                    existing_category.name = child["name"]
+                    existing_category.platform = platform_instance
+                    existing_category.news_category = news_category
+                    changed_platform_categories.append(existing_category)
         PlatformCategory.objects.bulk_create(new_platform_categories)
+        PlatformCategory.objects.bulk_update(
+            changed_platform_categories, ["name", "platform", "news_category"]
+        )
         self.stdout.write(
             self.style.SUCCESS(
-                f"更新平台分类: {len(new_platform_categories)} 条新增，{len(existing_platform_categories)} 条已存在"
+                f"更新平台分类: {len(new_platform_categories)} 条新增，{len(changed_platform_categories)} 条更新，{len(existing_platform_categories)} 条已存在"
             )
         )
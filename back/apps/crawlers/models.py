@@ -59,6 +59,12 @@ class PlatformCategory(BaseModel):
 class ClientVersionManager(BaseModel):
     version = models.CharField(max_length=255, verbose_name="版本号")
     download_link = models.URLField(verbose_name="下载链接")
+    manifest_link = models.URLField(
+        blank=True,
+        default="",
+        verbose_name="更新清单链接",
+        help_text="增量更新的 manifest.json 地址，文件与清单放在同一目录下；为空时客户端下载完整安装包",
+    )
     content = models.TextField(verbose_name="更新内容")
 
     def __str__(self):
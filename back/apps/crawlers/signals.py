@@ -0,0 +1,15 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from apps.crawlers.models import ClientVersionManager
+from apps.crawlers.serializers import ClientVersionManagerSerializer
+from utils.push import push_broadcast
+
+
+@receiver(post_save, sender=ClientVersionManager)
+def push_version(sender, instance, **kwargs):
+    # 只推送最新版本，修改旧版本记录不通知客户端
+    if ClientVersionManager.objects.values_list("id", flat=True).first() == instance.id:
+        push_broadcast(
+            {"type": "version", "version": ClientVersionManagerSerializer(instance).data}
+        )
@@ -20,23 +20,27 @@ from apps.crawlers.models import ClientVersionManager
 from apps.users.models import AiArticle, Level
 from ArticleManagePlus.settings import main_url
 from utils import mixins, viewsets
+from utils.redis_cli import CRAWLER_CACHE_NAMESPACE, rate_limit
 
 # Create your views here.
 
 
-class PlatformViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
+class PlatformViewSet(mixins.CachedListModelMixin, viewsets.GenericViewSet):
+    cache_namespace = CRAWLER_CACHE_NAMESPACE
     permission_classes = [
         IsAuthenticated,
     ]
 
 
-class NewsCategoryViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
+class NewsCategoryViewSet(mixins.CachedListModelMixin, viewsets.GenericViewSet):
+    cache_namespace = CRAWLER_CACHE_NAMESPACE
     permission_classes = [
         IsAuthenticated,
     ]
 
 
-class PlatformCategoryViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
+class PlatformCategoryViewSet(mixins.CachedListModelMixin, viewsets.GenericViewSet):
+    cache_namespace = CRAWLER_CACHE_NAMESPACE
     filterset_fields = ("platform__name",)
     permission_classes = [
         IsAuthenticated,
@@ -143,6 +147,7 @@ class OnlineAPIView(APIView):
                 context["user"] = user
         return render(request, "online.html", context)
 
+    @rate_limit(user_limit=60, ip_limit=120, window=60 * 60)
     def post(self, request):
         token = request.COOKIES.get("access_token")
         data = json.loads(request.body)
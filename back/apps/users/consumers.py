@@ -0,0 +1,60 @@
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+
+from apps.crawlers.models import ClientVersionManager
+from apps.crawlers.serializers import ClientVersionManagerSerializer
+from apps.users.models import Notice
+from utils.push import BROADCAST_GROUP, user_group
+
+
+class PushConsumer(AsyncJsonWebsocketConsumer):
+    """
+    客户端推送通道：ws://<host>/ws/push/?token=<access token>
+
+    连接后先发送 hello（未读公告数、最新客户端版本），之后推送：
+    - notice：新公告，附带当前用户的未读数
+    - version：新客户端版本
+    - task：当前用户任务状态变化
+    客户端发送 {"type": "ping"} 时回复 pong，用于检测连接是否存活
+    """
+
+    async def connect(self):
+        self.push_groups = [BROADCAST_GROUP, user_group(self.scope["user"].id)]
+        for group in self.push_groups:
+            await self.channel_layer.group_add(group, self.channel_name)
+        await self.accept()
+        await self.send_json(
+            {
+                "type": "hello",
+                "unread": await self.unread_count(),
+                "version": await self.latest_version(),
+            }
+        )
+
+    async def disconnect(self, code):
+        for group in getattr(self, "push_groups", []):
+            await self.channel_layer.group_discard(group, self.channel_name)
+
+    async def receive_json(self, content, **kwargs):
+        if content.get("type") == "ping":
+            await self.send_json({"type": "pong"})
+
+    async def push_message(self, event):
+        message = event["message"]
+        if message["type"] == "notice":
+            # 广播的公告消息按连接的用户补充未读数
+            message = {**message, "unread": await self.unread_count()}
+        await self.send_json(message)
+
+    @database_sync_to_async
+    def unread_count(self):
+        return (
+            Notice.objects.filter(is_show=True)
+            .exclude(usernotice__user=self.scope["user"], usernotice__is_read=True)
+            .count()
+        )
+
+    @database_sync_to_async
+    def latest_version(self):
+        client = ClientVersionManager.objects.first()
+        return ClientVersionManagerSerializer(client).data if client else None
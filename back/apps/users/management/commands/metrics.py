@@ -0,0 +1,36 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+# @author:anning
+# @email:anningforchina@gmail.com
+# @time:2026/10/19 10:40
+# @file:metrics.py
+from datetime import timedelta
+
+from django.core.management import BaseCommand
+from django.db import transaction
+
+from apps.users.metrics import TRUNC_FUNCTIONS, refresh_rollups, refresh_snapshot
+
+
+class Command(BaseCommand):
+    help = "刷新仪表盘指标快照及小时/天汇总，建议通过定时任务每5分钟执行一次"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--lookback-days",
+            type=int,
+            default=3,
+            help="汇总数据的回看天数，用于覆盖历史数据的状态变化",
+        )
+
+    def handle(self, *args, **options):
+        lookback = timedelta(days=options["lookback_days"])
+        with transaction.atomic():
+            refresh_snapshot()
+            for granularity in TRUNC_FUNCTIONS:
+                created, updated = refresh_rollups(granularity, lookback)
+                self.stdout.write(
+                    self.style.SUCCESS(f"{granularity} 汇总: {created} 条新增，{updated} 条更新")
+                )
+
+        self.stdout.write(self.style.SUCCESS("指标刷新完成"))
@@ -0,0 +1,139 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+# @author:anning
+# @email:anningforchina@gmail.com
+# @time:2026/10/19 10:20
+# @file:metrics.py
+from datetime import datetime, timedelta
+
+from django.contrib.auth import get_user_model
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDay, TruncHour
+
+from apps.users.models import (
+    AccountNews,
+    AiArticle,
+    MetricsRollup,
+    MetricsSnapshot,
+    WechatPayOrder,
+)
+
+TRUNC_FUNCTIONS = {"hour": TruncHour, "day": TruncDay}
+
+# 汇总指标 -> (模型, 时间字段, 过滤条件, 聚合表达式)
+ROLLUP_SOURCES = {
+    "new_users": (get_user_model(), "date_joined", Q(), Count("id")),
+    "paid_orders": (WechatPayOrder, "created_at", Q(status=1), Count("id")),
+    "income": (WechatPayOrder, "created_at", Q(status=1), Sum("amount")),
+    "news_count": (AccountNews, "created_at", Q(), Count("id")),
+    "published_news_count": (AccountNews, "created_at", Q(status=2), Count("id")),
+    "token_count": (AiArticle, "created_at", Q(enable=True), Sum("use_token")),
+}
+
+
+def refresh_snapshot():
+    """
+    重新计算仪表盘快照，每张表只做一次条件聚合
+    :return: MetricsSnapshot
+    """
+    now = datetime.now()
+    today_start = datetime(now.year, now.month, now.day)
+
+    users = get_user_model().objects.aggregate(
+        user_count=Count("id"),
+        member_count=Count("id", filter=Q(expiry_time__gte=now)),
+    )
+    income = WechatPayOrder.objects.filter(status=1).aggregate(
+        total_income=Sum("amount"),
+        today_income=Sum("amount", filter=Q(created_at__gte=today_start)),
+    )
+    news = AccountNews.objects.aggregate(
+        news_count=Count("id"),
+        published_news_count=Count("id", filter=Q(status=2)),
+        unpublished_news_count=Count("id", filter=Q(status=0)),
+        today_news_count=Count("id", filter=Q(status=2, created_at__gte=today_start)),
+    )
+    tokens = AiArticle.objects.filter(enable=True).aggregate(
+        token_count=Sum("use_token"),
+        today_token_count=Sum("use_token", filter=Q(created_at__gte=today_start)),
+    )
+
+    values = {key: value or 0 for key, value in {**users, **income, **news, **tokens}.items()}
+    snapshot = MetricsSnapshot.objects.first()
+    if snapshot is None:
+        return MetricsSnapshot.objects.create(**values)
+    for key, value in values.items():
+        setattr(snapshot, key, value)
+    snapshot.save()
+    return snapshot
+
+
+def refresh_rollups(granularity, lookback=timedelta(days=3)):
+    """
+    增量更新汇总数据
+    只重算最后一个时间段及回看窗口内的数据，回看窗口用来覆盖旧新闻后续被发布等状态变化
+    :param granularity: hour / day
+    :param lookback: 回看窗口
+    :return: (新增数量, 更新数量)
+    """
+    trunc = TRUNC_FUNCTIONS[granularity]
+    last = (
+        MetricsRollup.objects.filter(granularity=granularity)
+        .order_by("-bucket")
+        .values_list("bucket", flat=True)
+        .first()
+    )
+    since = None
+    if last is not None:
+        since = min(last, datetime.now() - lookback)
+        since = since.replace(minute=0, second=0, microsecond=0)
+        if granularity == "day":
+            since = since.replace(hour=0)
+
+    buckets = {}
+    for field, (model, time_field, condition, aggregation) in ROLLUP_SOURCES.items():
+        queryset = model.objects.filter(condition)
+        if since is not None:
+            queryset = queryset.filter(**{f"{time_field}__gte": since})
+        rows = (
+            queryset.annotate(bucket=trunc(time_field))
+            .values("bucket")
+            .annotate(value=aggregation)
+            .order_by()
+        )
+        for row in rows:
+            buckets.setdefault(row["bucket"], {})[field] = row["value"] or 0
+
+    existing_rollups = MetricsRollup.objects.filter(granularity=granularity)
+    if since is not None:
+        existing_rollups = existing_rollups.filter(bucket__gte=since)
+    existing = {rollup.bucket: rollup for rollup in existing_rollups}
+
+    # 已有但本次没有数据的时间段（如新闻被删除）也需要归零
+    for bucket in existing:
+        buckets.setdefault(bucket, {})
+
+    new_rollups, changed_rollups = [], []
+    for bucket, values in buckets.items():
+        # 窗口内该时间段没有数据的指标要归零
+        values = {field: values.get(field, 0) for field in ROLLUP_SOURCES}
+        rollup = existing.get(bucket)
+        if rollup is None:
+            new_rollups.append(MetricsRollup(granularity=granularity, bucket=bucket, **values))
+        elif any(getattr(rollup, field) != value for field, value in values.items()):
+            for field, value in values.items():
+                setattr(rollup, field, value)
+            changed_rollups.append(rollup)
+
+    MetricsRollup.objects.bulk_create(new_rollups)
+    MetricsRollup.objects.bulk_update(changed_rollups, list(ROLLUP_SOURCES))
+    return len(new_rollups), len(changed_rollups)
+
+
+def get_rollups(granularity, since):
+    """获取图表使用的汇总数据"""
+    return list(
+        MetricsRollup.objects.filter(granularity=granularity, bucket__gte=since)
+        .order_by("bucket")
+        .values("bucket", *ROLLUP_SOURCES)
+    )
@@ -326,3 +326,48 @@ class UserNotice(models.Model):
 
     def __str__(self):
         return f"{self.user.nickname} - {self.notice.title} - {'已读' if self.is_read else '未读'}"
+
+
+class MetricsSnapshot(BaseModel):
+    """仪表盘指标快照，由 metrics 命令定时刷新，仪表盘只读取这一行"""
+
+    user_count = models.PositiveIntegerField(default=0, verbose_name="总用户数量")
+    member_count = models.PositiveIntegerField(default=0, verbose_name="会员数量")
+    total_income = models.PositiveIntegerField(default=0, verbose_name="总收款")
+    today_income = models.PositiveIntegerField(default=0, verbose_name="今日收款")
+    news_count = models.PositiveIntegerField(default=0, verbose_name="新闻总数量")
+    published_news_count = models.PositiveIntegerField(default=0, verbose_name="已发布新闻数量")
+    unpublished_news_count = models.PositiveIntegerField(default=0, verbose_name="待发布新闻数量")
+    today_news_count = models.PositiveIntegerField(default=0, verbose_name="今日发布新闻数量")
+    token_count = models.BigIntegerField(default=0, verbose_name="token总使用量")
+    today_token_count = models.BigIntegerField(default=0, verbose_name="token今日使用量")
+
+    class Meta:
+        verbose_name = "仪表盘指标快照"
+        verbose_name_plural = verbose_name
+        ordering = ["-id"]
+
+
+class MetricsRollup(BaseModel):
+    """按小时/按天汇总的指标，用于仪表盘图表"""
+
+    GRANULARITY_CHOICES = (("hour", "小时"), ("day", "天"))
+    granularity = models.CharField(
+        max_length=10, choices=GRANULARITY_CHOICES, verbose_name="汇总粒度"
+    )
+    bucket = models.DateTimeField(db_index=True, verbose_name="时间段")
+    new_users = models.PositiveIntegerField(default=0, verbose_name="新增用户")
+    paid_orders = models.PositiveIntegerField(default=0, verbose_name="支付订单数")
+    income = models.PositiveIntegerField(default=0, verbose_name="收款")
+    news_count = models.PositiveIntegerField(default=0, verbose_name="新增新闻")
+    published_news_count = models.PositiveIntegerField(default=0, verbose_name="已发布新闻")
+    token_count = models.BigIntegerField(default=0, verbose_name="token使用量")
+
+    class Meta:
+        verbose_name = "指标汇总"
+        verbose_name_plural = verbose_name
+        ordering = ["-bucket"]
+        unique_together = ("granularity", "bucket")
+
+    def __str__(self):
+        return f"{self.get_granularity_display()} - {self.bucket:%Y-%m-%d %H:%M}"
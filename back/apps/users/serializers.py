@@ -4,7 +4,7 @@ from django.contrib.auth import get_user_model
 from rest_framework import serializers
 
 from apps.users.models import AccountNews, Accounts, AiArticle, Notice, UserNotice
-from utils.serializers import BaseSerializer
+from utils.serializers import BaseSerializer, DynamicFieldsMixin
 
 User = get_user_model()
 
@@ -32,7 +32,7 @@ class AccountsSerializer(BaseSerializer):
         return attrs
 
 
-class AccountNewsSerializer(BaseSerializer):
+class AccountNewsSerializer(DynamicFieldsMixin, BaseSerializer):
     date_str = serializers.DateTimeField(format="%Y-%m-%d %H:%M:%S")
     account_name = serializers.CharField(source="account.nickname", read_only=True)
     account_uid = serializers.CharField(source="account.uid", read_only=True)
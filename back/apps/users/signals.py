@@ -0,0 +1,30 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from apps.users.models import AccountNews, Notice
+from utils.push import push_broadcast, push_to_user
+
+
+@receiver(post_save, sender=Notice)
+def push_notice(sender, instance, **kwargs):
+    if instance.is_show:
+        push_broadcast({"type": "notice", "id": instance.id, "title": instance.title})
+
+
+@receiver(post_save, sender=AccountNews)
+def push_task_status(sender, instance, created, update_fields=None, **kwargs):
+    """任务状态变化时通知任务所属用户；QuerySet.update 批量更新不经过信号，不会推送"""
+    if instance.account_id is None:
+        return
+    if update_fields is not None and "status" not in update_fields:
+        return
+    push_to_user(
+        instance.account.user_id,
+        {
+            "type": "task",
+            "id": instance.id,
+            "status": instance.status,
+            "status_value": instance.get_status_display(),
+            "created": created,
+        },
+    )
@@ -1 +1,88 @@
+from datetime import datetime, timedelta
+
+from django.test import TestCase
+from rest_framework.exceptions import NotFound
+from rest_framework.test import APIClient
+
+from apps.users.models import AccountNews, Accounts, Users
+from utils.pagination import KeysetPagination
+
 # Create your tests here.
+
+
+class AccountNewsListTests(TestCase):
+    url = "/api/user/news/"
+
+    def setUp(self):
+        self.user = Users.objects.create(open_id="test-user")
+        self.account = Accounts.objects.create(
+            user=self.user,
+            nickname="测试账号",
+            uid="test-uid",
+            expiry_time=datetime.now() + timedelta(days=30),
+        )
+        # 批量创建的任务 created_at 可能相同，分页需要按 id 区分
+        self.news = [
+            AccountNews.objects.create(
+                account=self.account,
+                title=f"标题{i}",
+                article_url=f"https://example.com/{i}",
+                article_info="正文" * 100,
+            )
+            for i in range(5)
+        ]
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()["result"]
+
+    def test_list_without_cursor_returns_all(self):
+        result = self.get()
+        self.assertEqual(len(result), 5)
+
+    def test_keyset_pages_cover_all_rows_once(self):
+        ids = []
+        page = self.get(size=2)
+        while True:
+            self.assertLessEqual(len(page["results"]), 2)
+            ids.extend(item["id"] for item in page["results"])
+            if not page["next"]:
+                break
+            page = self.get(size=2, cursor=page["next"])
+        self.assertEqual(ids, [news.id for news in reversed(self.news)])
+
+    def test_new_rows_do_not_shift_later_pages(self):
+        first = self.get(size=2)
+        AccountNews.objects.create(
+            account=self.account,
+            title="新标题",
+            article_url="https://example.com/new",
+            article_info="正文",
+        )
+        second = self.get(size=2, cursor=first["next"])
+        self.assertEqual(
+            [item["id"] for item in second["results"]], [self.news[2].id, self.news[1].id]
+        )
+
+    def test_invalid_cursor(self):
+        with self.assertRaises(NotFound):
+            KeysetPagination().decode_cursor("not-a-cursor")
+
+    def test_fields_limits_output(self):
+        result = self.get(fields="id,title")
+        self.assertEqual(set(result[0]), {"id", "title"})
+
+    def test_since_returns_only_updated_rows(self):
+        since = datetime.now()
+        AccountNews.objects.filter(id=self.news[0].id).update(
+            updated_at=since + timedelta(seconds=1)
+        )
+        result = self.get(since=since.isoformat())
+        self.assertEqual([item["id"] for item in result], [self.news[0].id])
+
+    def test_invalid_since(self):
+        response = self.client.get(self.url, {"since": "yesterday"})
+        self.assertNotEqual(response.json()["code"], 0)
@@ -4,6 +4,7 @@ from apps.users import views
 
 urlpatterns = [
     path("dashboard/", views.dashboard, name="dashboard"),
+    path("dashboard/metrics/", views.dashboard_metrics, name="dashboard_metrics"),
     path("package/", views.package, name="package"),
     path("pay/", views.pay, name="pay"),
     path("wechat/login/", views.wechat_login, name="wechat_login"),
@@ -5,14 +5,16 @@ from datetime import datetime, timedelta
 from urllib.parse import urlencode
 
 from django.conf import settings
-from django.contrib.auth import get_user_model
+from django.contrib.admin.views.decorators import staff_member_required
 from django.db import transaction
 from django.db.models import Sum
+from django.forms.models import model_to_dict
 from django.http import HttpResponse, JsonResponse
 from django.shortcuts import redirect, render
 from django.urls import reverse
 from django.views.decorators.csrf import csrf_exempt
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 from rest_framework_simplejwt.authentication import JWTAuthentication
@@ -21,11 +23,12 @@ from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.tokens import RefreshToken
 from wechatpy import WeChatOAuth
 
+from apps.users.metrics import TRUNC_FUNCTIONS, get_rollups, refresh_snapshot
 from apps.users.models import (
-    AccountNews,
     Accounts,
     ActivationCode,
     AiArticle,
+    MetricsSnapshot,
     Subscription,
     UserNotice,
     Users,
@@ -37,6 +40,7 @@ from utils import mixins, viewsets
 from utils.ai_model.writing_assistant import WritingAssistant
 from utils.common import generate_order_no
 from utils.encipher import encrypt_string, generate_key_from_string, initialize_fernet
+from utils.pagination import KeysetPagination
 from utils.permissons import IsNotExpiredUser
 from utils.redis_cli import rate_limit
 from utils.response import error_response, success_response
@@ -104,8 +108,18 @@ class AccountsViewSet(viewsets.ModelViewSet):
 
 
 class AccountNewsViewSet(viewsets.ModelViewSet):
+    """
+    列表接口支持：
+    - cursor / size: 按 (created_at, id) 的游标分页
+    - fields=id,title: 只返回指定字段，未请求的大字段不会从数据库读取
+    - since=2024-01-01 12:00:00: 只返回该时间之后新增或修改的数据，用于增量同步
+    """
+
     permission_classes = [IsAuthenticated, IsNotExpiredUser]
     filterset_fields = ["status", "account__id"]
+    pagination_class = KeysetPagination
+    # 列表中体积较大的字段，未通过 fields 请求时延迟加载
+    heavy_fields = ("article_info", "img_list", "platform_data")
 
     def get_permissions(self):
         if self.action == "list":
@@ -115,13 +129,24 @@ class AccountNewsViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         query_set = super().get_queryset()
         if self.action == "list":
-            # 性能优化 预取 account
+            # 性能优化 关联查询 account
             three_days_ago = datetime.now() - timedelta(days=3)
-            return (
-                query_set.prefetch_related("account")
+            query_set = (
+                query_set.select_related("account")
                 .exclude(account__status=4)
                 .filter(account__user=self.request.user, created_at__gte=three_days_ago)
             )
+            since = self.request.query_params.get("since")
+            if since:
+                try:
+                    query_set = query_set.filter(updated_at__gt=datetime.fromisoformat(since))
+                except ValueError:
+                    raise ValidationError({"since": "时间格式错误"}) from None
+            fields = self.request.query_params.get("fields")
+            if fields:
+                deferred = set(self.heavy_fields) - set(fields.split(","))
+                query_set = query_set.defer(*deferred)
+            return query_set
         return query_set.filter(account__user=self.request.user)
 
 
@@ -179,42 +204,32 @@ def dashboard(request):
     待发布新闻数量
     当前爬虫连接数量
     当前消费者连接数量
+
+    数据来自 metrics 命令定时刷新的快照，快照不存在时才现场计算一次
     """
-    context = {"user_count": get_user_model().objects.count()}
-    now = datetime.now()
-    context["member_count"] = get_user_model().objects.filter(expiry_time__gte=now).count()
-    context["total_income"] = (
-        WechatPayOrder.objects.filter(status=1).aggregate(Sum("amount"))["amount__sum"] or 0
-    )
-    # 计算当日的金额
-    today_start = datetime(now.year, now.month, now.day)
-    context["today_income"] = (
-        WechatPayOrder.objects.filter(status=1, created_at__gte=today_start).aggregate(
-            Sum("amount")
-        )["amount__sum"]
-        or 0
-    )
-    context["news_count"] = AccountNews.objects.count()
-    context["published_news_count"] = AccountNews.objects.filter(status=2).count()
-    context["unpublished_news_count"] = AccountNews.objects.filter(status=0).count()
-    # 今天新闻发布数量
-    context["today_news_count"] = AccountNews.objects.filter(
-        status=2, created_at__gte=today_start
-    ).count()
-    # token总使用量
-    context["token_count"] = (
-        AiArticle.objects.filter(enable=True).aggregate(Sum("use_token"))["use_token__sum"] or 0
-    )
-    # token今日使用量
-    context["today_token_count"] = (
-        AiArticle.objects.filter(enable=True, created_at__gte=today_start).aggregate(
-            Sum("use_token")
-        )["use_token__sum"]
-        or 0
-    )
+    snapshot = MetricsSnapshot.objects.first() or refresh_snapshot()
+    context = model_to_dict(snapshot, exclude=["id"])
+    context["updated_at"] = snapshot.updated_at
     return render(request, "dashboard.html", context)
 
 
+@staff_member_required
+def dashboard_metrics(request):
+    """仪表盘图表数据，granularity 为 hour 或 day，days 为查询天数"""
+    granularity = request.GET.get("granularity", "day")
+    if granularity not in TRUNC_FUNCTIONS:
+        return JsonResponse({"error": "granularity 只能为 hour 或 day"}, status=400)
+    try:
+        days = min(int(request.GET.get("days", 30)), 366)
+    except ValueError:
+        days = 30
+    since = datetime.now() - timedelta(days=days)
+    rollups = get_rollups(granularity, since)
+    for rollup in rollups:
+        rollup["bucket"] = rollup["bucket"].strftime("%Y-%m-%d %H:%M:%S")
+    return JsonResponse({"granularity": granularity, "result": rollups})
+
+
 def package(request):
     token = request.COOKIES.get("access_token")
 
@@ -393,6 +408,7 @@ def wx_notify(request):
 
 
 class AiArticleView(APIView):
+    @rate_limit(user_limit=30, ip_limit=60, window=60 * 60)
     def post(self, request):
         token = request.COOKIES.get("access_token")
         data = json.loads(request.body)
@@ -1,3 +1,11 @@
+import hashlib
+import json
+
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+from utils.redis_cli import generate_cache_key, get_cache_version, rd
 from utils.response import success_response
 
 
@@ -77,6 +85,48 @@ class ListModelMixin:
         return success_response(serializer.data)
 
 
+class CachedListModelMixin(ListModelMixin):
+    """
+    带版本号的列表响应缓存，支持 ETag / If-None-Match 协商缓存
+
+    cache_namespace: 缓存命名空间，调用 bump_cache_version(cache_namespace) 即可使缓存失效
+    cache_timeout: 缓存过期时间（秒）
+    """
+
+    cache_namespace = None
+    cache_timeout = 24 * 60 * 60
+
+    def get_list_cache_key(self, request):
+        namespace = self.cache_namespace or self.basename
+        version = get_cache_version(namespace)
+        return f"response:{namespace}:{version}:{self.basename}:{generate_cache_key(request.query_params)}"
+
+    def list(self, request, *args, **kwargs):
+        cache_key = self.get_list_cache_key(request)
+        cached = rd.get(cache_key)
+        if cached:
+            cached = json.loads(cached)
+            etag, data = cached["etag"], cached["data"]
+        else:
+            data = super().list(request, *args, **kwargs).data
+            body = json.dumps(data, cls=JSONEncoder, ensure_ascii=False)
+            etag = f'"{hashlib.md5(body.encode()).hexdigest()}"'
+            rd.set(
+                cache_key,
+                json.dumps({"etag": etag, "data": json.loads(body)}),
+                ex=self.cache_timeout,
+            )
+
+        if_none_match = request.headers.get("If-None-Match", "")
+        if etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]:
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(data)
+        response["ETag"] = etag
+        response["Cache-Control"] = "no-cache"
+        return response
+
+
 class RetrieveModelMixin:
     """
     Retrieve a model instance.
@@ -1,9 +1,16 @@
+import base64
+from datetime import datetime
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import (
-    PageNumberPagination as OriginPageNumberPagination,
+    BasePagination,
+    _positive_int,
 )
 from rest_framework.pagination import (
-    _positive_int,
+    PageNumberPagination as OriginPageNumberPagination,
 )
+from rest_framework.response import Response
 
 
 class PageNumberPagination(OriginPageNumberPagination):
@@ -31,3 +38,58 @@ class PageNumberPagination(OriginPageNumberPagination):
             except (KeyError, ValueError):
                 pass
         return self.page_size
+
+
+class KeysetPagination(BasePagination):
+    """
+    基于 (created_at, id) 的游标分页，翻页成本与页码无关，新增数据也不会导致翻页重复
+
+    - 只有传入 cursor 或 size 参数时才分页，兼容直接获取全部列表的旧客户端
+    - 返回的 next 为下一页游标，为 null 表示没有更多数据
+    """
+
+    page_size = 100
+    max_page_size = 500
+    cursor_query_param = "cursor"
+    page_size_query_param = "size"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if self.cursor_query_param not in params and self.page_size_query_param not in params:
+            return None
+
+        try:
+            page_size = _positive_int(
+                params[self.page_size_query_param], strict=True, cutoff=self.max_page_size
+            )
+        except (KeyError, ValueError):
+            page_size = self.page_size
+
+        queryset = queryset.order_by("-created_at", "-id")
+        cursor = params.get(self.cursor_query_param)
+        if cursor:
+            created_at, pk = self.decode_cursor(cursor)
+            queryset = queryset.filter(
+                Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+            )
+
+        page = list(queryset[: page_size + 1])
+        self.next_cursor = None
+        if len(page) > page_size:
+            page = page[:page_size]
+            self.next_cursor = self.encode_cursor(page[-1])
+        return page
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.next_cursor, "results": data})
+
+    def encode_cursor(self, instance):
+        position = f"{instance.created_at.isoformat()}|{instance.id}"
+        return base64.urlsafe_b64encode(position.encode()).decode()
+
+    def decode_cursor(self, cursor):
+        try:
+            created_at, pk = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+            return datetime.fromisoformat(created_at), int(pk)
+        except (ValueError, UnicodeDecodeError):
+            raise NotFound("无效的游标") from None
@@ -0,0 +1,41 @@
+"""
+客户端推送
+
+通过 channels 分组把消息发给已连接 ws/push/ 的客户端：
+- push_broadcast：所有在线用户（公告、版本发布）
+- push_to_user：指定用户（任务状态变化）
+
+消息在事务提交后发送；推送失败只记录日志，不影响业务数据的写入。
+"""
+
+import logging
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
+
+logger = logging.getLogger("django")
+
+BROADCAST_GROUP = "push_broadcast"
+
+
+def user_group(user_id):
+    return f"push_user_{user_id}"
+
+
+def _send(group, message):
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return
+    try:
+        async_to_sync(channel_layer.group_send)(group, {"type": "push.message", "message": message})
+    except Exception as e:
+        logger.warning(f"推送消息失败 {group}: {e}")
+
+
+def push_broadcast(message):
+    transaction.on_commit(lambda: _send(BROADCAST_GROUP, message))
+
+
+def push_to_user(user_id, message):
+    transaction.on_commit(lambda: _send(user_group(user_id), message))
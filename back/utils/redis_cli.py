@@ -5,6 +5,9 @@
 # @time:2024/10/26 10:12
 # @file:redis.py
 import hashlib
+import math
+import time
+import uuid
 from functools import wraps
 
 import django_redis
@@ -14,8 +17,41 @@ from utils.response import error_response
 rd = django_redis.get_redis_connection("default")
 
 
-def rate_limit(user_limit=100, ip_limit=200):
+# 滑动窗口限流脚本，所有键一起检查、一起计数，一次往返且原子执行
+# KEYS: 限流键  ARGV: 当前毫秒时间戳, 窗口毫秒数, 本次请求标识, 各键的限制次数...
+# 返回 {超限键的序号(0为未超限), 需要等待的毫秒数}
+SLIDING_WINDOW_SCRIPT = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+for i, key in ipairs(KEYS) do
+    redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+    if redis.call('ZCARD', key) >= tonumber(ARGV[i + 3]) then
+        local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+        return {i, tonumber(oldest[2]) + window - now}
+    end
+end
+for _, key in ipairs(KEYS) do
+    redis.call('ZADD', key, now, ARGV[3])
+    redis.call('PEXPIRE', key, window)
+end
+return {0, 0}
+"""
+
+sliding_window = rd.register_script(SLIDING_WINDOW_SCRIPT)
+
+
+def rate_limit(user_limit=100, ip_limit=200, window=24 * 60 * 60, scope=None):
+    """
+    滑动窗口限流
+    :param user_limit: 窗口内同一用户+IP的请求上限
+    :param ip_limit: 窗口内同一IP的请求上限
+    :param window: 窗口大小（秒），默认一天
+    :param scope: 限流范围，默认使用 视图类名.方法名，不同接口分别计数
+    """
+
     def decorator(view_func):
+        route = scope or view_func.__qualname__
+
         @wraps(view_func)
         def _wrapped_view(view, request, *args, **kwargs):
             ip = request.META.get("REMOTE_ADDR")
@@ -23,30 +59,20 @@ def rate_limit(user_limit=100, ip_limit=200):
             user_id = user.id if user else "anonymous"
 
             # 生成 Redis 键
-            user_ip_key = f"user_ip:{user_id}_{ip}"
-            ip_key = f"ip:{ip}"
-
-            # 获取当前的请求计数
-            user_ip_count = int(rd.get(user_ip_key) or 0)
-            ip_count = int(rd.get(ip_key) or 0)
-
-            # 检查限流条件
-            if user_ip_count >= user_limit:
-                return error_response(
-                    429,
-                    {"error": "已超过用户和IP的请求限制", "result": False},
-                )
-            if ip_count >= ip_limit:
-                return error_response(429, {"error": "已超过IP的请求限制", "result": False})
-
-            # 增加计数
-            rd.incr(user_ip_key)
-            rd.incr(ip_key)
-
-            # 设置键的到期时间（每天重置）
-            reset_time = 24 * 60 * 60  # 24小时
-            rd.expire(user_ip_key, reset_time)
-            rd.expire(ip_key, reset_time)
+            user_ip_key = f"rate_limit:{route}:user_ip:{user_id}_{ip}"
+            ip_key = f"rate_limit:{route}:ip:{ip}"
+
+            now = int(time.time() * 1000)
+            exceeded, retry_after = sliding_window(
+                keys=[user_ip_key, ip_key],
+                args=[now, window * 1000, f"{now}:{uuid.uuid4().hex}", user_limit, ip_limit],
+            )
+            if exceeded:
+                message = "已超过用户和IP的请求限制" if exceeded == 1 else "已超过IP的请求限制"
+                response = error_response(429, {"error": message, "result": False})
+                response.status_code = 429
+                response["Retry-After"] = str(max(math.ceil(int(retry_after) / 1000), 1))
+                return response
 
             # 调用原始视图函数
             return view_func(view, request, *args, **kwargs)
@@ -56,7 +82,24 @@ def rate_limit(user_limit=100, ip_limit=200):
     return decorator
 
 
-def generate_cache_key(page, platform, category):
-    # 生成缓存 key，使用请求参数并进行 hash 防止过长
-    key_string = f"page={page}&platform={platform}&category={category}"
+def generate_cache_key(params):
+    # 生成缓存 key，使用排序后的请求参数并进行 hash 防止过长
+    # params 为 QueryDict，同名参数有多个值时全部参与计算
+    key_string = "&".join(
+        f"{key}={value}" for key, values in sorted(params.lists()) for value in values
+    )
     return hashlib.md5(key_string.encode()).hexdigest()
+
+
+# 平台和分类数据只会在 crawler 命令执行时变化，命令结束后递增缓存版本号
+CRAWLER_CACHE_NAMESPACE = "crawlers"
+
+
+def get_cache_version(namespace):
+    """获取缓存版本号，版本号变化后旧缓存自动失效"""
+    return int(rd.get(f"cache_version:{namespace}") or 0)
+
+
+def bump_cache_version(namespace):
+    """递增缓存版本号，使该命名空间下的所有响应缓存失效"""
+    return rd.incr(f"cache_version:{namespace}")
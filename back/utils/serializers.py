@@ -10,3 +10,20 @@ from rest_framework import serializers
 class BaseSerializer(serializers.ModelSerializer):
     created_at = serializers.DateTimeField(format="%Y-%m-%d %H:%M:%S", read_only=True)
     updated_at = serializers.DateTimeField(format="%Y-%m-%d %H:%M:%S", read_only=True)
+
+
+class DynamicFieldsMixin:
+    """
+    支持通过请求参数 fields=id,title 只返回指定字段
+    """
+
+    fields_query_param = "fields"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get("request")
+        if request is None or self.fields_query_param not in request.query_params:
+            return
+        allowed = set(request.query_params[self.fields_query_param].split(","))
+        for field_name in set(self.fields) - allowed:
+            self.fields.pop(field_name)
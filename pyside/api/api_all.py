@@ -2,8 +2,84 @@
 # @Time    : 2024/12/9 14:08
 # @Author  : DNQTeach
 # @File    : api_all.py
+import copy
+import threading
+import time
+
 from api.request_handler import ApiRequest
 
+# 只读接口的本地缓存时间（秒），修改类接口调用后对应命名空间立即失效
+CACHE_TTL = {
+    "news": 15,
+    "account_list": 60,
+    "account_info": 300,
+}
+
+_cache = {}  # (命名空间, 参数) -> (过期时间, 结果)
+_inflight = {}  # (命名空间, 参数) -> _PendingCall
+_cache_lock = threading.Lock()
+
+
+class _PendingCall:
+    """正在进行的请求，相同请求的其他调用方等待它的结果"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.stale = False
+
+
+def _cached(namespace, params, loader, use_cache=True):
+    """
+    读穿缓存：命中且未过期时直接返回；未命中时同一时刻相同的请求只发一次，其余调用方等待结果
+    返回结果的副本，调用方修改不会影响缓存
+    """
+    key = (namespace, params)
+    with _cache_lock:
+        entry = _cache.get(key)
+        if use_cache and entry is not None and entry[0] > time.monotonic():
+            return copy.deepcopy(entry[1])
+        call = _inflight.get(key)
+        owner = call is None
+        if owner:
+            call = _inflight[key] = _PendingCall()
+
+    if not owner:
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return copy.deepcopy(call.result)
+
+    try:
+        call.result = loader()
+    except Exception as e:
+        call.error = e
+        raise
+    finally:
+        with _cache_lock:
+            _inflight.pop(key, None)
+            # 请求超时返回 None 时不缓存；请求期间发生过失效的结果也不缓存
+            if call.error is None and call.result is not None and not call.stale:
+                _cache[key] = (time.monotonic() + CACHE_TTL[namespace], call.result)
+        call.done.set()
+    return copy.deepcopy(call.result)
+
+
+def invalidate_cache(*namespaces):
+    """使指定命名空间的缓存失效，不指定时清空全部"""
+    with _cache_lock:
+        for key in list(_cache):
+            if not namespaces or key[0] in namespaces:
+                del _cache[key]
+        for key, call in _inflight.items():
+            if not namespaces or key[0] in namespaces:
+                call.stale = True
+
+
+def _params_key(params):
+    return tuple(sorted((params or {}).items()))
+
 
 # 获取用户信息
 def get_user():
@@ -35,18 +111,32 @@ def token_report(data=None):
     """
     base_request = ApiRequest()
     response = base_request.post("user/ai_article/", json=data)
+    # 上报会更新新闻的生成状态
+    invalidate_cache("news")
     return response
 
 
 # 创建新闻
 def create_news(data=None):
     base_request = ApiRequest()
-    return base_request.post("user/news/", json=data)
+    try:
+        return base_request.post("user/news/", json=data)
+    finally:
+        invalidate_cache("news")
 
 
-def get_news_list(params=None):
+def get_news_list(params=None, use_cache=True):
+    """获取新闻任务列表
+    Args:
+        use_cache: 为 False 时跳过缓存直接请求（结果仍会写入缓存），任务调度等需要最新状态的场景使用
+    """
     base_request = ApiRequest()
-    return base_request.get("user/news/", params=params)
+    return _cached(
+        "news",
+        _params_key(params),
+        lambda: base_request.get("user/news/", params=params),
+        use_cache=use_cache,
+    )
 
 
 def get_news_one(_id):
@@ -61,49 +151,72 @@ def get_news_one(_id):
 
 def update_news(news_id, data):
     base_request = ApiRequest()
-    return base_request.put(f"user/news/{news_id}/", json=data)
+    try:
+        return base_request.put(f"user/news/{news_id}/", json=data)
+    finally:
+        invalidate_cache("news")
 
 
 def partial_update_news(news_id, data):
     base_request = ApiRequest()
-    return base_request.patch(f"user/news/{news_id}/", json=data)
+    try:
+        return base_request.patch(f"user/news/{news_id}/", json=data)
+    finally:
+        invalidate_cache("news")
 
 
 def delete_news(task_id):
     base_request = ApiRequest()
-    return base_request.delete(f"user/news/{task_id}/")
+    try:
+        return base_request.delete(f"user/news/{task_id}/")
+    finally:
+        invalidate_cache("news")
 
 
 # 自媒体账号录入，查询
 def create_account(data):
     base_request = ApiRequest()
-    return base_request.post("user/accounts/", json=data)
+    try:
+        return base_request.post("user/accounts/", json=data)
+    finally:
+        invalidate_cache("account_list", "account_info")
 
 
 def delete_account(account_id):
     base_request = ApiRequest()
-    return base_request.delete(f"user/accounts/{account_id}/")
+    try:
+        return base_request.delete(f"user/accounts/{account_id}/")
+    finally:
+        # 账号删除后其新闻的账号字段被置空，新闻列表中的账号信息随之变化
+        invalidate_cache("account_list", "account_info", "news")
 
 
 def get_account_list(params=None):
     base_request = ApiRequest()
-    return base_request.get("user/accounts/", params=params)
+    return _cached(
+        "account_list",
+        _params_key(params),
+        lambda: base_request.get("user/accounts/", params=params),
+    )
 
 
 def get_account_info(id):
     base_request = ApiRequest()
-    return base_request.get(f"user/accounts/{id}/")
+    return _cached("account_info", id, lambda: base_request.get(f"user/accounts/{id}/"))
 
 
 # 发布数量
 def update_account(id, data):
     base_request = ApiRequest()
-    return base_request.patch(f"user/accounts/{id}/", json=data)
+    try:
+        return base_request.patch(f"user/accounts/{id}/", json=data)
+    finally:
+        invalidate_cache("account_list", "account_info")
 
 
 # 获取通知
-def get_notice():
-    base_request = ApiRequest()
+def get_notice(timeout=30):
+    base_request = ApiRequest(timeout)
     return base_request.get("user/notice/")
 
 
@@ -4,12 +4,62 @@
 # @email:anningforchina@gmail.com
 # @time:2024/11/02 18:17
 # @file:request_handler.py
+import os
+import threading
+
 import requests
 from PySide6.QtCore import QSettings
+from requests.adapters import HTTPAdapter
 from requests.exceptions import Timeout
 
 BASE_URL = "http://127.0.0.1:8001/api"  # 后台base API
 
+# 设置环境变量 AIMEDIA_LOG_RESPONSE=1 时打印原始响应内容，排查接口问题时使用
+LOG_RESPONSE_BODY = os.environ.get("AIMEDIA_LOG_RESPONSE") == "1"
+
+_session = None
+_session_lock = threading.Lock()
+
+# token 只在首次使用、登录、退出时读取 QSettings，未读取时为 _UNSET
+_UNSET = object()
+_token = _UNSET
+
+
+def get_session():
+    """进程内共享的 Session，复用 keep-alive 连接"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                # 发布线程、热点加载线程会并发请求，连接池按线程数预留
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                session.headers.update(
+                    {
+                        "Content-Type": "application/json",
+                        "Accept-Encoding": "gzip, deflate",
+                    }
+                )
+                _session = session
+    return _session
+
+
+def get_token():
+    """获取缓存的 token"""
+    global _token
+    if _token is _UNSET:
+        settings = QSettings("AiMedia", "ai-media")
+        _token = settings.value("token", None)
+    return _token
+
+
+def invalidate_token():
+    """登录、退出后调用，下次请求时重新读取 token"""
+    global _token
+    _token = _UNSET
+
 
 class ApiRequest:
     def __init__(self, timeout=30):
@@ -17,19 +67,16 @@ class ApiRequest:
         self.timeout = timeout
 
     def _build_headers(self):
-        """构建请求头"""
-        headers = {
-            "Content-Type": "application/json",
-        }
-        settings = QSettings("AiMedia", "ai-media")
-        token = settings.value("token", None)
+        """构建请求头，公共请求头由 Session 提供"""
+        token = get_token()
         if token:
-            headers["Authorization"] = f"Bearer {token}"
-        return headers
+            return {"Authorization": f"Bearer {token}"}
+        return {}
 
     def _handle_response(self, response):
         """统一处理响应"""
-        print(f"3. 原始响应内容：{response.text}")  # 打印原始字符串（关键！看具体返回了什么）
+        if LOG_RESPONSE_BODY:
+            print(f"{response.request.method} {response.url} 原始响应内容：{response.text}")
 
         data = response.json()
         if data["code"] == 2000:
@@ -39,49 +86,28 @@ class ApiRequest:
         else:
             raise Exception(data["message"])
 
-    def get(self, endpoint, params=None):
-        """GET 请求"""
+    def _request(self, method, endpoint, **kwargs):
         url = f"{self.base_url}/{endpoint}"
         try:
-            response = requests.get(
-                url, headers=self._build_headers(), params=params, timeout=self.timeout
+            response = get_session().request(
+                method, url, headers=self._build_headers(), timeout=self.timeout, **kwargs
             )
             return self._handle_response(response)
         except Timeout:
             print("请求超时")
             return None
 
+    def get(self, endpoint, params=None):
+        """GET 请求"""
+        return self._request("GET", endpoint, params=params)
+
     def post(self, endpoint, data=None, json=None):
         """POST 请求"""
-        url = f"{self.base_url}/{endpoint}"
-        try:
-            response = requests.post(
-                url,
-                headers=self._build_headers(),
-                data=data,
-                json=json,
-                timeout=self.timeout,
-            )
-            return self._handle_response(response)
-        except Timeout:
-            print("请求超时")
-            return None
+        return self._request("POST", endpoint, data=data, json=json)
 
     def put(self, endpoint, data=None, json=None):
         """PUT 请求"""
-        url = f"{self.base_url}/{endpoint}"
-        try:
-            response = requests.put(
-                url,
-                headers=self._build_headers(),
-                data=data,
-                json=json,
-                timeout=self.timeout,
-            )
-            return self._handle_response(response)
-        except Timeout:
-            print("请求超时")
-            return None
+        return self._request("PUT", endpoint, data=data, json=json)
 
     def patch(self, endpoint, data=None, json=None):
         """
@@ -91,27 +117,8 @@ class ApiRequest:
         :param json: PATCH请求的JSON数据
         :return: 返回请求的响应
         """
-        url = f"{self.base_url}/{endpoint}"
-
-        try:
-            response = requests.patch(
-                url,
-                headers=self._build_headers(),
-                data=data,
-                json=json,
-                timeout=self.timeout,
-            )
-            return self._handle_response(response)
-        except Timeout:
-            print("请求超时")
-            return None
+        return self._request("PATCH", endpoint, data=data, json=json)
 
     def delete(self, endpoint):
         """DELETE 请求"""
-        url = f"{self.base_url}/{endpoint}"
-        try:
-            response = requests.delete(url, headers=self._build_headers(), timeout=self.timeout)
-            return self._handle_response(response)
-        except Timeout:
-            print("请求超时")
-            return None
+        return self._request("DELETE", endpoint)
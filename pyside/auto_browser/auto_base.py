@@ -1,32 +1,47 @@
-import os
 import platform
-import random
-import shutil
+import socket
 import subprocess
 import time
-from io import BytesIO
 
 import requests
-from PIL import Image
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
-from webdriver_manager.chrome import ChromeDriverManager
 
 from auto_browser.baijiahao import publish_baijiahao
+from auto_browser.browser_pool import cookie_fingerprint, get_browser_pool
+from auto_browser.content_input import HEADLESS, get_content_input
+from auto_browser.driver_resolver import chrome_binary_path, get_chrome_version, get_driver_path
+from auto_browser.payload import prepare_payload
 from auto_browser.qiehao import publish_qiehao
+from auto_browser.tracing import PublishTrace
+from auto_browser.waits import Waiter
 from auto_browser.weixin import publish_weixin
 
-if platform.system() == "Windows":
-    import pyperclip
-    import pythoncom
-    import win32clipboard
-    from win32com import client as win_client
+# 头条号编辑页填写失败时刷新重试的次数
+TOUTIAO_EDIT_ATTEMPTS = 3
+HEADLESS_WINDOW_SIZE = (1920, 1080)
 
-elif platform.system() == "Darwin":  # macOS
-    from AppKit import NSImage, NSPasteboard
+
+def headless_arguments():
+    """无头模式启动参数，固定窗口大小，并去掉 User-Agent 中的 HeadlessChrome 标识"""
+    if platform.system() == "Windows":
+        system = "Windows NT 10.0; Win64; x64"
+    elif platform.system() == "Darwin":
+        system = "Macintosh; Intel Mac OS X 10_15_7"
+    else:
+        system = "X11; Linux x86_64"
+    user_agent = (
+        f"Mozilla/5.0 ({system}) AppleWebKit/537.36 (KHTML, like Gecko) "
+        f"Chrome/{get_chrome_version()} Safari/537.36"
+    )
+    return [
+        "--headless=new",
+        "--window-size={},{}".format(*HEADLESS_WINDOW_SIZE),
+        f"--user-agent={user_agent}",
+    ]
 
 
 class AutoTools:
@@ -39,45 +54,29 @@ class AutoTools:
             "企鹅号": "https://om.qq.com/main/creation/article",
         }
 
-    def get_driver(self):
+    def get_driver(self, user_data_dir=None, headless=False):
         chrome_options = Options()
         chrome_options.add_argument("--no-sandbox")  # 禁用沙盒模式git
         chrome_options.add_argument("--disable-gpu")
-        current_path = os.path.dirname(__file__)
-        parent_path = os.path.dirname(current_path)
-        if platform.system() == "Windows":
-            chrome_path = os.path.join(parent_path, "chrome", "chrome.exe")
-            pythoncom.CoInitialize()
-            win_obj = win_client.Dispatch("Scripting.FileSystemObject")
-            chrome_version = win_obj.GetFileVersion(chrome_path)
-            chrome_version = chrome_version.strip()
-        else:
-            chrome_path = os.path.join(
-                parent_path,
-                "chrome-mac-arm64",
-                "Google Chrome for Testing.app",
-                "Contents",
-                "MacOS",
-                "Google Chrome for Testing",
-            )
-            result = subprocess.run(
-                [chrome_path, "--version"],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-            )
-            chrome_version = result.stdout.decode("utf-8").strip().split()[-1]
-
+        if user_data_dir:
+            chrome_options.add_argument(f"--user-data-dir={user_data_dir}")
+        if headless:
+            for argument in headless_arguments():
+                chrome_options.add_argument(argument)
+        chrome_path = chrome_binary_path()
         chrome_options.binary_location = chrome_path
         chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
 
         driver = webdriver.Chrome(
             options=chrome_options,
-            service=Service(ChromeDriverManager(chrome_version).install()),
+            service=Service(get_driver_path()),
         )
         driver.execute_cdp_cmd(
             "Page.addScriptToEvaluateOnNewDocument",
             {"source": 'Object.defineProperty(navigator, "webdriver", {get: () => undefined})'},
         )
+        if headless:
+            return driver
         screen_width = driver.execute_script("return window.screen.width")
         screen_height = driver.execute_script("return window.screen.height")
         window_width = screen_width
@@ -93,29 +92,60 @@ class AutoTools:
         chrome_options.add_argument("--disable-gpu")
         chrome_options.add_experimental_option("debuggerAddress", f"127.0.0.1:{random_number}")
         if platform.system() == "Windows":
-            pythoncom.CoInitialize()
             chrome_options.add_argument(rf"--user-data-dir={user_data_dir}")
-            win_obj = win_client.Dispatch("Scripting.FileSystemObject")
-            chrome_version = win_obj.GetFileVersion(chrome_path)
-            chrome_version = chrome_version.strip()
             user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/130.0.0.0 Safari/537.36"
         else:
-            chrome_version = (
-                os.popen(f'"{chrome_path}" --version')
-                .read()
-                .strip()
-                .replace("Google Chrome for Testing ", "")
-            )
             user_agent = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/130.0.0.0 Safari/537.36"
         chrome_options.add_argument(f"user-agent={user_agent}")
 
         driver = webdriver.Chrome(
             options=chrome_options,
-            service=Service(ChromeDriverManager(chrome_version).install()),
+            service=Service(get_driver_path()),
         )
 
         return driver, random_number
 
+    def launch_debug_browser(self, user_data_dir, headless=False):
+        """以远程调试端口启动 Chrome 再连接，返回 (driver, Chrome 进程, 端口)"""
+        chrome_path = chrome_binary_path()
+        # 由系统分配空闲端口，避免随机端口与其他会话冲突
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        args = [
+            chrome_path,
+            f"--remote-debugging-port={port}",
+            f"--user-data-dir={user_data_dir}",
+            "--start-maximized",
+            "--no-first-run",
+            "--no-default-browser-check",
+        ]
+        if headless:
+            args += headless_arguments()
+        # 不经过 shell 启动，回收会话时可以直接结束 Chrome 进程
+        if platform.system() == "Windows":
+            startupinfo = subprocess.STARTUPINFO()
+            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+            process = subprocess.Popen(args, startupinfo=startupinfo)
+        else:
+            process = subprocess.Popen(args)
+        try:
+            driver, port = self.connect_driver(port, chrome_path, user_data_dir)
+        except Exception:
+            process.terminate()
+            raise
+        return driver, process, port
+
+    def launch_publish_browser(self, platform_, user_data_dir):
+        """
+        浏览器池的启动函数，头条号使用调试端口方式，其他平台由 chromedriver 启动
+
+        设置 AIMEDIA_HEADLESS=1 时以无头模式启动，正文通过 DOM 注入，不需要可见窗口
+        """
+        if platform_ == "头条号":
+            return self.launch_debug_browser(user_data_dir, HEADLESS)
+        return self.get_driver(user_data_dir, HEADLESS), None, None
+
     def run_as_admin(self, cmd):
         if platform.system() == "Windows":
             startupinfo = subprocess.STARTUPINFO()
@@ -197,313 +227,168 @@ class AutoTools:
                 break
         return cookies
 
-    def publish(self, cookie, content, platform_, imgs_path):
+    def publish(self, cookie, content, platform_, imgs_path, account_id=None, payload=None):
+        """
+        发布文章，浏览器从会话池借出，同一账号连续发布时复用已登录的浏览器
+
+        Args:
+            cookie: 账号 cookie 列表
+            content: 文章内容，第一行为标题
+            platform_: 发布平台
+            imgs_path: 文章配图目录
+            account_id: 账号ID，用于区分浏览器会话；未传入时按 cookie 区分
+            payload: 预先生成的发布内容，未传入时在借出浏览器之前生成
+        """
         urls = {
             "头条号": "https://mp.toutiao.com/profile_v4/graphic/publish",
             "百家号": "https://baijiahao.baidu.com/builder/rc/edit?type=news&is_from_cms=1",
             "微信公众号": "https://mp.weixin.qq.com/",
             "企鹅号": "https://om.qq.com/main/creation/article",
         }
-        if platform_ == "头条号":
-            url = urls[platform_]
-            current_path = os.path.dirname(__file__)
-            parent_path = os.path.dirname(current_path)
-            if platform.system() == "Windows":
-                chrome_path = os.path.join(parent_path, "chrome", "chrome.exe")
-            else:
-                chrome_path = os.path.join(
-                    parent_path,
-                    "chrome-mac-arm64",
-                    "Google Chrome for Testing.app",
-                    "Contents",
-                    "MacOS",
-                    "Google Chrome for Testing",
-                )
-            random_number = random.randint(9000, 9999)
-            if platform.system() == "Windows":
-                new_chrome_path = chrome_path
-                user_data_dir = rf"C:\selenium\ChromeProfile{random_number}"
-            else:
-                new_chrome_path = chrome_path
-                user_data_dir = rf"./ChromeProfile{random_number}"
-            cmd = rf'"{new_chrome_path}" --remote-debugging-port={random_number} --user-data-dir="{user_data_dir}" --start-maximized --no-first-run --no-default-browser-check'
-            self.run_as_admin(cmd)
-            driver, random_number = self.connect_driver(
-                random_number, new_chrome_path, user_data_dir
-            )
-            driver.delete_all_cookies()
-            driver.get(url)
-            time.sleep(1)
+        if platform_ not in urls:
+            return None
+        account = account_id if account_id is not None else cookie_fingerprint(cookie)[:12]
+        pool = get_browser_pool(self.launch_publish_browser)
+        trace = PublishTrace(platform_, account)
+        result = None
+        try:
+            if payload is None:
+                with trace.span("payload_prepare"):
+                    payload = prepare_payload(content, imgs_path)
+            with pool.session(
+                f"{platform_}_{account}", platform_, cookie, urls[platform_], trace
+            ) as driver:
+                if platform_ == "头条号":
+                    result = self.publish_toutiao(driver, payload, trace)
+                elif platform_ == "百家号":
+                    result = publish_baijiahao(driver, payload, trace)
+                elif platform_ == "微信公众号":
+                    result = publish_weixin(driver, payload, trace)
+                elif platform_ == "企鹅号":
+                    result = publish_qiehao(driver, payload, trace)
+        except Exception as e:
+            trace.finish(error=e)
+            raise
+        trace.finish(result)
+        result["timings"] = trace.as_list()
+        return result
 
+    def publish_toutiao(self, driver, payload, trace=None):
+        result = {
+            "status": False,
+            "msg": "",
+        }
+        trace = trace or PublishTrace("头条号")
+        wait = Waiter(driver)
+        # 点击发布前的步骤失败时刷新重试，已点击发布后不再重试，避免重复发文
+        for attempt in range(TOUTIAO_EDIT_ATTEMPTS):
+            if attempt:
+                with trace.span("refresh"):
+                    driver.refresh()
             try:
-                for ck in cookie:
-                    driver.add_cookie(ck)
+                self.fill_toutiao(driver, wait, trace, payload)
             except Exception as e:
-                print(e)
-            time.sleep(2)
-            lines = content.splitlines()
-            title = lines[0].strip()
-            title = title.replace("#", "")
-            info = "\n".join(lines[1:]).strip()
-            info = info.replace("#", "")
-            is_copy_content = False
-            out_flag = False
-            publish_flag = False
-            time_out = 60 * 2
-            tart_time = time.time()
-            imgs_list = os.listdir(imgs_path)
-            imgs_list_len = len(imgs_list)
-            result = {
-                "status": False,
-                "msg": "",
-            }
-            time.sleep(10)
-            while True:
-                try:
-                    if is_copy_content is False:
-                        textarea = driver.find_element(
-                            By.XPATH,
-                            '//*[@id="root"]/div/div[1]/div/div[1]/div[3]/div/div/div[2]/div/div/div/textarea',
-                        )
-                        textarea.send_keys(title)
-                        time.sleep(random.randint(1, 2))
-                        time.sleep(1)
-                        info_tag = driver.find_element(
-                            By.XPATH,
-                            '//*[@id="root"]/div/div[1]/div/div[1]/div[4]/div/div[1]',
-                        )
+                print(f"头条号第 {attempt + 1} 次填写失败：{e}")
+                result["msg"] = str(e)
+                continue
+            try:
+                with trace.span("submit"):
+                    wait.click((By.CLASS_NAME, "publish-btn-last"), timeout=30)
+                    # 预览页渲染完成后再确认发布
+                    wait.network_idle(timeout=15)
+                    wait.click((By.CLASS_NAME, "publish-btn-last"), timeout=30)
+                result["status"] = True
+                result["msg"] = ""
+                with trace.span("submit_confirm", optional=True):
+                    wait.network_idle(timeout=30)
+            except Exception as e:
+                print(f"头条号发布失败：{e}")
+                result["msg"] = str(e)
+            break
+        return result
 
-                        if imgs_list_len == 0:
-                            pyperclip.copy(info)
-                            info_tag.send_keys(Keys.CONTROL, "v")
-                            time.sleep(0.5)
-                            time.sleep(0.5)
-                            info_tag.send_keys(Keys.DOWN)
-                            is_copy_content = True
-                        else:
-                            info_len = info.split("\n")
-                            tep = int(len(info_len) / imgs_list_len)
-                            info1 = [i + "\n" for i in info_len[0:tep] if len(i) > 0]
-                            info2 = [i + "\n" for i in info_len[tep : tep * 2] if len(i) > 0]
-                            info3 = [i + "\n" for i in info_len[tep * 2 :] if len(i) > 0]
-                            ct = [info1, info2, info3]
-                            img_idx = 0
-                            for info_txt in ct:
-                                try:
-                                    # 检查操作系统
-                                    if platform.system() == "Windows":
-                                        image = Image.open(
-                                            os.path.join(imgs_path, imgs_list[img_idx])
-                                        )
-                                        output = BytesIO()
-                                        image.save(output, "BMP")
-                                        data = output.getvalue()[14:]
-                                        output.close()
-                                        win32clipboard.OpenClipboard()
-                                        win32clipboard.EmptyClipboard()
-                                        win32clipboard.SetClipboardData(win32clipboard.CF_DIB, data)
-                                        win32clipboard.CloseClipboard()
-                                        info_tag.send_keys(Keys.CONTROL, "v")
-                                        time.sleep(0.5)
-                                        # info_tag.send_keys(Keys.DOWN)
-                                    elif platform.system() == "Darwin":  # macOS
-                                        image = Image.open(
-                                            os.path.join(imgs_path, imgs_list[img_idx])
-                                        )
-                                        # 将图像转换为 NSImage
-                                        output = BytesIO()
-                                        image.save(output, "BMP")
-                                        output.seek(0)
-                                        ns_image = NSImage.alloc().initWithData_(output.getvalue())
-                                        # 获取系统剪贴板
-                                        pasteboard = NSPasteboard.generalPasteboard()
-                                        pasteboard.clearContents()
-                                        # 将 NSImage 写入剪贴板
-                                        pasteboard.writeObjects_([ns_image])
-                                        info_tag.send_keys(Keys.COMMAND, "v")
-                                        time.sleep(0.5)
-                                        # info_tag.send_keys(Keys.DOWN)
-                                except:
-                                    pass
-                                if platform.system() == "Windows":
-                                    pyperclip.copy("".join(info_txt))
-                                    info_tag.send_keys(Keys.CONTROL, "v")
-                                else:
-                                    pasteboard = NSPasteboard.generalPasteboard()
-                                    pasteboard.clearContents()
-                                    pasteboard.writeObjects_(info_txt)
-                                    info_tag.send_keys(Keys.COMMAND, "v")
-                                time.sleep(0.5)
-                                info_tag.send_keys(Keys.DOWN)
-                                is_copy_content = True
-                                img_idx += 1
-                except:
-                    pass
+    def fill_toutiao(self, driver, wait, trace, payload):
+        """填写头条号标题、正文、发布设置，失败时抛出异常"""
+        imgs_list_len = payload.image_count
+        with trace.span("title_fill"):
+            textarea = wait.present(
+                (
+                    By.XPATH,
+                    '//*[@id="root"]/div/div[1]/div/div[1]/div[3]/div/div/div[2]/div/div/div/textarea',
+                ),
+                timeout=30,
+            )
+            textarea.send_keys(payload.title)
 
-                print(is_copy_content, "is_copy_content")
-                if is_copy_content:
-                    print("投放广告赚收益")
-                    tags = driver.find_elements(By.CLASS_NAME, "edit-input")
-                    for i in tags:
-                        time.sleep(1)
-                        txt = i.text
-                        if txt == "投放广告赚收益不投放广告":
-                            try:
-                                i.find_element(By.CLASS_NAME, "byte-radio-inner").click()
-                            except:
-                                pass
-                        if "头条首发" in txt:
-                            driver.execute_script("arguments[0].scrollIntoView();", i)
-                            if "授权平台自动维权" not in txt:
-                                try:
-                                    i.find_element(By.CLASS_NAME, "byte-checkbox-wrapper").click()
-                                except:
-                                    pass
-                        # if "发布得更多收益" in txt:
-                        #     try:
-                        #         checked = i.find_element(By.CLASS_NAME, "combine-tip-wrap")
-                        #         child_elements = checked.find_element(By.TAG_NAME, "label")
-                        #         class_name = child_elements.get_attribute("class")
-                        #         if class_name == "byte-checkbox item-checkbox":
-                        #             i.find_element(
-                        #                 By.CLASS_NAME, "byte-checkbox-wrapper"
-                        #             ).click()
-                        #     except:
-                        #         pass
-                        if "个人观点" in txt:
-                            try:
-                                source = i.find_element(By.CLASS_NAME, "source-info-wrap")
-                                labels = source.find_element(By.CLASS_NAME, "byte-checkbox-group")
-                                child_elements = labels.find_elements(By.TAG_NAME, "label")
-                                for info_e in child_elements:
-                                    if info_e.text == "个人观点，仅供参考":
-                                        class_name = info_e.get_attribute("class")
-                                        if class_name == "byte-checkbox checkbot-item":
-                                            info_e.find_element(
-                                                By.CLASS_NAME, "byte-checkbox-wrapper"
-                                            ).click()
-                                            break
-                                    # if info_e.text == "引用AI":
-                                    #     class_name = info_e.get_attribute("class")
-                                    #     if class_name == "byte-checkbox checkbot-item checkbox-with-tip":
-                                    #         info_e.find_element(
-                                    #                     By.CLASS_NAME, "byte-checkbox-wrapper"
-                                    #                 ).click()
-                                    #         break
-                            except:
-                                pass
-                if is_copy_content:
-                    if imgs_list_len == 0:
-                        time.sleep(1)
-                        tags = driver.find_elements(By.CLASS_NAME, "byte-tabs-header-title")
-                        for item in tags:
-                            for a in range(0, 5):
-                                if "1" in item.text:
-                                    item.click()
-                                    time.sleep(2)
-                                    driver.find_element(
-                                        By.XPATH,
-                                        '//*[@id="root"]/div/div[2]/div[2]/div/div/div/div[2]/div/div[2]/div/div/div[2]/div/div/div[2]/ul/li[1]',
-                                    ).click()
-                                    publish_flag = True
-                                    time.sleep(2)
-                                    break
-                                elif "2" in item.text:
-                                    item.click()
-                                    time.sleep(2)
-                                    driver.find_element(
-                                        By.XPATH,
-                                        '//*[@id="root"]/div/div[2]/div/div/div/div/div[2]/div/div[2]/div/div/div[2]/div/div[2]/div[2]/ul/li[1]',
+        paster = get_content_input(driver)
+        with paster.lock(), trace.span("body_paste"):
+            info_tag = wait.present(
+                (By.XPATH, '//*[@id="root"]/div/div[1]/div/div[1]/div[4]/div/div[1]')
+            )
+            paster.paste_article(wait, info_tag, payload.chunks, after_text=Keys.DOWN)
+
+        if imgs_list_len:
+            with trace.span("image_upload", optional=True):
+                wait.images_uploaded(info_tag, min(imgs_list_len, 3), timeout=60)
+
+        with trace.span("settings", optional=True):
+            print("投放广告赚收益")
+            tags = driver.find_elements(By.CLASS_NAME, "edit-input")
+            for i in tags:
+                txt = i.text
+                if txt == "投放广告赚收益不投放广告":
+                    try:
+                        i.find_element(By.CLASS_NAME, "byte-radio-inner").click()
+                    except Exception:
+                        pass
+                if "头条首发" in txt:
+                    driver.execute_script("arguments[0].scrollIntoView();", i)
+                    if "授权平台自动维权" not in txt:
+                        try:
+                            i.find_element(By.CLASS_NAME, "byte-checkbox-wrapper").click()
+                        except Exception:
+                            pass
+                if "个人观点" in txt:
+                    try:
+                        source = i.find_element(By.CLASS_NAME, "source-info-wrap")
+                        labels = source.find_element(By.CLASS_NAME, "byte-checkbox-group")
+                        child_elements = labels.find_elements(By.TAG_NAME, "label")
+                        for info_e in child_elements:
+                            if info_e.text == "个人观点，仅供参考":
+                                class_name = info_e.get_attribute("class")
+                                if class_name == "byte-checkbox checkbot-item":
+                                    info_e.find_element(
+                                        By.CLASS_NAME, "byte-checkbox-wrapper"
                                     ).click()
-                                    publish_flag = True
-                                    time.sleep(2)
                                     break
-                                elif "内容建议" in item.text:
-                                    item.click()
-                                    driver.find_element(
-                                        By.XPATH,
-                                        '//*[@id="root"]/div/div[2]/div[2]/div/div/div/div[2]/div/div[2]/div/div/div[1]/div/a',
-                                    ).click()
-                                    time.sleep(5)
-                                else:
-                                    pass
-                    else:
-                        publish_flag = True
-                print("publish_flag:", publish_flag)
-                if publish_flag:
-                    try:
-                        driver.find_element(By.CLASS_NAME, "publish-btn-last").click()
-                        time.sleep(3)
-                        driver.find_element(By.CLASS_NAME, "publish-btn-last").click()
-                        out_flag = True
-                        time.sleep(3)
-                    except:
+                    except Exception:
                         pass
-                end_time = time.time()
-                if out_flag:
-                    result["status"] = True
-                    break
-                elif end_time - tart_time > time_out:
-                    break
-                else:
-                    is_copy_content = False
-                    out_flag = False
-                    publish_flag = False
-                    driver.refresh()
-                    time.sleep(3)
-            driver.delete_all_cookies()
-            driver.quit()
-            time.sleep(3)
-            self.close_chrome_tab(random_number)
-            try:
-                time.sleep(3)
-                shutil.rmtree(user_data_dir)
-            except:
-                pass
-            return result
-        elif platform_ == "百家号":
-            driver = self.get_driver()
-            url = urls[platform_]
-            driver.get(url)
-            driver.delete_all_cookies()
-            time.sleep(1)
-            try:
-                for ck in cookie:
-                    driver.add_cookie(ck)
-            except Exception as e:
-                print(e)
-            driver.get(url)
-            res = publish_baijiahao(driver, content, imgs_path)
-            return res
-        elif platform_ == "微信公众号":
-            driver = self.get_driver()
-            url = urls[platform_]
-            driver.get(url)
-            # driver.delete_all_cookies()
-            time.sleep(1)
-            try:
-                for ck in cookie:
-                    driver.add_cookie(ck)
-            except Exception as e:
-                print(e)
-            time.sleep(2)
-            driver.get(url)
-            res = publish_weixin(driver, content, imgs_path)
-            return res
-        elif platform_ == "企鹅号":
-            driver = self.get_driver()
-            url = urls[platform_]
-            driver.get(url)
-            driver.delete_all_cookies()
-            time.sleep(1)
-            try:
-                for ck in cookie:
-                    driver.add_cookie(ck)
-            except Exception as e:
-                print(e)
-            driver.get(url)
-            res = publish_qiehao(driver, content, imgs_path)
-            return res
+
+        if imgs_list_len == 0:
+            # 没有配图时从封面推荐中选择第一张
+            with trace.span("cover_select"):
+                cover_options = {
+                    "1": '//*[@id="root"]/div/div[2]/div[2]/div/div/div/div[2]/div/div[2]/div/div/div[2]/div/div/div[2]/ul/li[1]',
+                    "2": '//*[@id="root"]/div/div[2]/div/div/div/div/div[2]/div/div[2]/div/div/div[2]/div/div[2]/div[2]/ul/li[1]',
+                }
+                selected = False
+                for item in wait.all_present((By.CLASS_NAME, "byte-tabs-header-title")):
+                    key = next((k for k in cover_options if k in item.text), None)
+                    if key:
+                        item.click()
+                        wait.click((By.XPATH, cover_options[key]))
+                        selected = True
+                        break
+                    if "内容建议" in item.text:
+                        item.click()
+                        wait.click(
+                            (
+                                By.XPATH,
+                                '//*[@id="root"]/div/div[2]/div[2]/div/div/div/div[2]/div/div[2]/div/div/div[1]/div/a',
+                            )
+                        )
+                if not selected:
+                    raise RuntimeError("未找到封面推荐")
 
     def get_acconut_data(self, cookie, platform_):
         urls = {
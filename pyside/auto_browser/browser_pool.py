@@ -0,0 +1,258 @@
+#!/usr/bin/env python
+# @File    : browser_pool.py
+"""
+发布用浏览器会话池
+
+每个账号保留一个已启动的浏览器会话，并使用该账号固定的用户数据目录。连续发布时
+直接复用已加载好 cookie 的浏览器，不必每篇文章重新启动 Chrome 和 chromedriver。
+
+- 借出前做健康检查，浏览器进程退出或 WebDriver 无响应时重建
+- 发布次数达到 max_publishes、空闲超过 idle_timeout 或发布中出现异常时回收
+- 会话数达到 max_sessions 时关闭最久未使用的空闲会话
+- 程序退出时 shutdown 关闭所有浏览器
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+
+from auto_browser.tracing import PublishTrace
+
+PROFILE_ROOT = os.path.join("temp", "chrome_profiles")
+
+
+def cookie_fingerprint(cookie):
+    """cookie 内容摘要，用于判断会话中已加载的 cookie 是否需要更新"""
+    raw = json.dumps(cookie or [], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class BrowserSession:
+    """池中的一个浏览器会话"""
+
+    def __init__(self, key, driver, user_data_dir, process=None, port=None):
+        self.key = key
+        self.driver = driver
+        self.user_data_dir = user_data_dir
+        self.process = process  # 以调试端口方式启动时的 Chrome 进程
+        self.port = port
+        self.cookie_fingerprint = None
+        self.publish_count = 0
+        self.last_used = time.monotonic()
+        self.busy = False
+
+    def is_alive(self):
+        """浏览器进程仍在运行且 WebDriver 能正常执行脚本"""
+        if self.process is not None and self.process.poll() is not None:
+            return False
+        try:
+            return self.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def reset_tabs(self):
+        """只保留第一个标签页，避免上一次发布打开的页面影响下一次"""
+        handles = self.driver.window_handles
+        for handle in handles[1:]:
+            self.driver.switch_to.window(handle)
+            self.driver.close()
+        self.driver.switch_to.window(handles[0])
+
+    def close(self, remove_profile=False):
+        try:
+            self.driver.quit()
+        except Exception as e:
+            print(f"关闭浏览器失败：{e}")
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except Exception:
+                self.process.kill()
+        if remove_profile:
+            shutil.rmtree(self.user_data_dir, ignore_errors=True)
+
+
+class BrowserPool:
+    """
+    按账号管理浏览器会话
+
+    Args:
+        launcher: launcher(platform_, user_data_dir) -> (driver, process, port)
+        max_sessions: 同时保留的浏览器数量
+        max_publishes: 单个会话发布多少次后重建，避免长时间运行的浏览器内存增长
+        idle_timeout: 空闲多少秒后关闭会话
+    """
+
+    def __init__(self, launcher, max_sessions=4, max_publishes=20, idle_timeout=30 * 60):
+        self.launcher = launcher
+        self.max_sessions = max_sessions
+        self.max_publishes = max_publishes
+        self.idle_timeout = idle_timeout
+        self._sessions = {}
+        self._cond = threading.Condition()
+        self._closed = False
+
+    @staticmethod
+    def profile_dir(key):
+        """账号固定的用户数据目录，重启程序后仍可复用登录状态"""
+        return os.path.abspath(os.path.join(PROFILE_ROOT, re.sub(r"[^\w.-]", "_", key)))
+
+    @contextmanager
+    def session(self, key, platform_, cookie, url, trace=None):
+        """
+        借出账号对应的浏览器，打开 url 并确保已加载 cookie
+
+        Args:
+            key: 会话标识，同一账号使用同一个 key
+            platform_: 平台名称，传给 launcher 选择启动方式
+            cookie: 账号 cookie 列表
+            url: 发布页地址
+            trace: 发布追踪，记录浏览器启动和 cookie 注入耗时
+        """
+        trace = trace or PublishTrace(platform_)
+        with trace.span("browser_start") as span:
+            session = self._acquire(key, platform_)
+            span["reused"] = session.publish_count > 0
+        failed = False
+        try:
+            self._prepare(session, cookie, url, trace)
+            yield session.driver
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self._release(session, failed)
+
+    def _acquire(self, key, platform_):
+        stale = []
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("浏览器池已关闭")
+                stale.extend(self._pop_idle())
+                session = self._sessions.get(key)
+                if session is None or not session.busy:
+                    break
+                # 同一账号同时只允许一个发布任务使用浏览器
+                self._cond.wait()
+            if session is not None:
+                session.busy = True
+            else:
+                stale.extend(self._pop_oldest())
+                # 先占位，启动浏览器期间其他线程不会为同一账号再启动一个
+                session = self._sessions[key] = BrowserSession(key, None, self.profile_dir(key))
+                session.busy = True
+        # 关闭浏览器较慢，放到锁外进行
+        for old in stale:
+            old.close()
+
+        if session.driver is not None and session.is_alive():
+            return session
+        if session.driver is not None:
+            print(f"浏览器会话 {key} 已失效，重新启动")
+            session.close()
+        try:
+            driver, process, port = self.launcher(platform_, session.user_data_dir)
+        except BaseException:
+            with self._cond:
+                self._sessions.pop(key, None)
+                self._cond.notify_all()
+            raise
+        session.driver, session.process, session.port = driver, process, port
+        session.cookie_fingerprint = None
+        session.publish_count = 0
+        return session
+
+    def _prepare(self, session, cookie, url, trace):
+        driver = session.driver
+        session.reset_tabs()
+        fingerprint = cookie_fingerprint(cookie)
+        if session.cookie_fingerprint != fingerprint:
+            with trace.span("cookie_inject"):
+                # cookie 只能写入当前域名，先打开发布页再替换
+                driver.get(url)
+                driver.delete_all_cookies()
+                try:
+                    for ck in cookie:
+                        driver.add_cookie(ck)
+                except Exception as e:
+                    print(e)
+                session.cookie_fingerprint = fingerprint
+        with trace.span("open_page"):
+            driver.get(url)
+
+    def _release(self, session, failed):
+        session.publish_count += 1
+        session.last_used = time.monotonic()
+        recycle = failed or session.publish_count >= self.max_publishes
+        if recycle:
+            # 发布中途出错时页面状态不可信，连同用户数据目录一起重建
+            session.close(remove_profile=failed)
+        with self._cond:
+            session.busy = False
+            if recycle or self._closed:
+                self._sessions.pop(session.key, None)
+            self._cond.notify_all()
+        if self._closed and not recycle:
+            session.close()
+
+    def _pop_idle(self):
+        """移出空闲超时的会话，由调用方关闭"""
+        now = time.monotonic()
+        expired = [
+            s
+            for s in self._sessions.values()
+            if not s.busy and now - s.last_used > self.idle_timeout
+        ]
+        for session in expired:
+            del self._sessions[session.key]
+        return expired
+
+    def _pop_oldest(self):
+        """会话数达到上限时移出最久未使用的空闲会话，由调用方关闭"""
+        idle = sorted((s for s in self._sessions.values() if not s.busy), key=lambda s: s.last_used)
+        evicted = []
+        while len(self._sessions) >= self.max_sessions and idle:
+            session = idle.pop(0)
+            del self._sessions[session.key]
+            evicted.append(session)
+        return evicted
+
+    def shutdown(self):
+        """关闭所有空闲浏览器，正在发布的会话在归还时关闭"""
+        with self._cond:
+            self._closed = True
+            idle = [s for s in self._sessions.values() if not s.busy]
+            for session in idle:
+                del self._sessions[session.key]
+            self._cond.notify_all()
+        for session in idle:
+            session.close()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool(launcher):
+    """进程内共享的浏览器池，首次调用时使用传入的 launcher 创建"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = BrowserPool(launcher)
+                atexit.register(_pool.shutdown)
+    return _pool
+
+
+def shutdown_browser_pool():
+    """程序退出时调用"""
+    if _pool is not None:
+        _pool.shutdown()
@@ -0,0 +1,275 @@
+#!/usr/bin/env python
+# @File    : content_input.py
+"""
+正文输入方式
+
+- clipboard: 写入系统剪贴板后发送 Ctrl+V（macOS 为 Command+V），需要可见且获得焦点的窗口，
+  多个会话之间通过 CLIPBOARD_LOCK 互斥
+- dom: 在页面中构造 DataTransfer 并派发 paste 事件，编辑器按用户粘贴的流程处理 HTML 和图片
+  文件（图片同样由编辑器自己上传），不使用系统剪贴板，可以在无头浏览器中并发运行。
+  编辑器不处理粘贴的图片时，通过编辑器的图片上传控件（input[type=file]）上传，
+  找不到上传控件时抛出 ContentInputError
+
+通过环境变量选择：
+    AIMEDIA_HEADLESS=1          发布浏览器以无头模式运行，正文固定使用 dom 方式
+    AIMEDIA_CONTENT_INPUT=dom   有界面时也使用 dom 方式
+Windows、macOS 默认使用 clipboard，其他系统没有剪贴板实现，默认使用 dom，
+指定 clipboard 时导入即报错。
+"""
+
+import base64
+import html
+import mimetypes
+import os
+import platform
+import threading
+from abc import ABC, abstractmethod
+from contextlib import nullcontext
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+
+if platform.system() == "Windows":
+    import pyperclip
+    import win32clipboard
+
+elif platform.system() == "Darwin":  # macOS
+    from AppKit import NSImage, NSPasteboard
+
+CLIPBOARD_PLATFORMS = ("Windows", "Darwin")
+
+HEADLESS = os.environ.get("AIMEDIA_HEADLESS") == "1"
+if HEADLESS:
+    CONTENT_INPUT = "dom"
+else:
+    CONTENT_INPUT = os.environ.get("AIMEDIA_CONTENT_INPUT") or (
+        "clipboard" if platform.system() in CLIPBOARD_PLATFORMS else "dom"
+    )
+if CONTENT_INPUT not in ("clipboard", "dom"):
+    raise ValueError(f"AIMEDIA_CONTENT_INPUT 只能是 clipboard 或 dom：{CONTENT_INPUT}")
+if CONTENT_INPUT == "clipboard" and platform.system() not in CLIPBOARD_PLATFORMS:
+    raise ValueError(f"{platform.system()} 不支持剪贴板粘贴正文，请使用 AIMEDIA_CONTENT_INPUT=dom")
+
+# 系统剪贴板全进程共用，多个会话并发发布时粘贴正文、图片需要互斥
+CLIPBOARD_LOCK = threading.Lock()
+
+PASTE_KEY = Keys.COMMAND if platform.system() == "Darwin" else Keys.CONTROL
+
+# 编辑器工具栏中的图片上传控件，通常是隐藏的 input
+IMAGE_UPLOAD_SELECTOR = 'input[type="file"][accept*="image"]'
+
+# 切换到父 frame 前标记当前所在的 iframe，上传后据此切换回来；已在顶层时返回 false
+FRAME_MARK = "data-aimedia-frame"
+_MARK_FRAME_SCRIPT = f"""
+const frame = window.frameElement;
+if (!frame) return false;
+frame.setAttribute("{FRAME_MARK}", arguments[0]);
+return true;
+"""
+
+# 焦点不在编辑器时聚焦并把光标移到末尾，已在编辑器中则保留上次粘贴后的光标位置
+_FOCUS_SCRIPT = """
+const target = arguments[0];
+const doc = target.ownerDocument;
+if (doc.activeElement !== target && !target.contains(doc.activeElement)) {
+    target.focus();
+    const range = doc.createRange();
+    range.selectNodeContents(target);
+    range.collapse(false);
+    const selection = doc.getSelection();
+    selection.removeAllRanges();
+    selection.addRange(range);
+}
+"""
+
+# 派发 paste 事件，编辑器未处理时退回 insertHTML；返回编辑器是否处理了该事件
+_PASTE_SCRIPT = """
+const [target, htmlText, plainText, files] = arguments;
+const data = new DataTransfer();
+if (htmlText) data.setData("text/html", htmlText);
+if (plainText) data.setData("text/plain", plainText);
+for (const f of files) {
+    const bytes = Uint8Array.from(atob(f.data), c => c.charCodeAt(0));
+    data.items.add(new File([bytes], f.name, {type: f.type}));
+}
+const event = new ClipboardEvent("paste", {
+    clipboardData: data, bubbles: true, cancelable: true,
+});
+const handled = !target.dispatchEvent(event);
+if (!handled && htmlText) {
+    target.ownerDocument.execCommand("insertHTML", false, htmlText);
+}
+return handled;
+"""
+
+
+class ContentInputError(Exception):
+    """正文或图片无法注入编辑器"""
+
+
+def text_to_html(text):
+    """纯文本按行转换为段落"""
+    return "".join(f"<p>{html.escape(line)}</p>" for line in text.split("\n") if line.strip())
+
+
+class ContentInput(ABC):
+    """
+    正文输入基类
+
+    Args:
+        driver: WebDriver
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    def lock(self):
+        """粘贴期间需要持有的锁"""
+        return nullcontext()
+
+    @abstractmethod
+    def paste_image(self, target, image):
+        """在光标处插入 payload.PreparedImage"""
+
+    @abstractmethod
+    def paste_text(self, target, text):
+        """在光标处粘贴纯文本"""
+
+    def paste_article(self, wait, target, chunks, after_image=None, after_text=None):
+        """
+        依次粘贴正文各段，每段前先插入该段的配图
+
+        Args:
+            wait: Waiter
+            target: 编辑器元素
+            chunks: payload.PayloadChunk 列表
+            after_image: 图片插入后发送的按键
+            after_text: 每段文字粘贴后发送的按键
+
+        Raises:
+            ContentInputError: 编辑器没有可用的图片上传方式
+        """
+        for chunk in chunks:
+            if chunk.image:
+                try:
+                    img_count = len(target.find_elements(By.TAG_NAME, "img"))
+                    self.paste_image(target, chunk.image)
+                    # 图片插入编辑器后再粘贴文字，避免剪贴板内容被提前替换
+                    wait.image_inserted(target, img_count, timeout=5)
+                    if after_image:
+                        target.send_keys(after_image)
+                except ContentInputError:
+                    raise
+                except Exception:
+                    pass
+            self.paste_text(target, chunk.text)
+            if after_text:
+                target.send_keys(after_text)
+
+
+class ClipboardInput(ContentInput):
+    """写入系统剪贴板后发送粘贴快捷键"""
+
+    def lock(self):
+        return CLIPBOARD_LOCK
+
+    def paste_image(self, target, image):
+        if platform.system() == "Windows":
+            # CF_DIB 不包含 14 字节的 BMP 文件头
+            win32clipboard.OpenClipboard()
+            win32clipboard.EmptyClipboard()
+            win32clipboard.SetClipboardData(win32clipboard.CF_DIB, image.bmp[14:])
+            win32clipboard.CloseClipboard()
+        else:
+            # 将图像转换为 NSImage 写入剪贴板
+            ns_image = NSImage.alloc().initWithData_(image.bmp)
+            pasteboard = NSPasteboard.generalPasteboard()
+            pasteboard.clearContents()
+            pasteboard.writeObjects_([ns_image])
+        target.send_keys(PASTE_KEY, "v")
+
+    def paste_text(self, target, text):
+        if platform.system() == "Windows":
+            pyperclip.copy(text)
+        else:
+            pasteboard = NSPasteboard.generalPasteboard()
+            pasteboard.clearContents()
+            pasteboard.writeObjects_([text])
+        target.send_keys(PASTE_KEY, "v")
+
+
+class DomInput(ContentInput):
+    """
+    在页面中派发 paste 事件，不经过系统剪贴板
+
+    Args:
+        driver: WebDriver
+        upload_selector: 编辑器图片上传控件的 CSS 选择器，从当前 frame 开始逐级向上查找
+    """
+
+    def __init__(self, driver, upload_selector=IMAGE_UPLOAD_SELECTOR):
+        super().__init__(driver)
+        self.upload_selector = upload_selector
+
+    def _paste(self, target, html_text="", plain_text="", files=()):
+        self.driver.execute_script(_FOCUS_SCRIPT, target)
+        return self.driver.execute_script(_PASTE_SCRIPT, target, html_text, plain_text, files)
+
+    def paste_image(self, target, image):
+        file = {"name": image.name, "type": image.mime_type, "data": image.data}
+        if not self._paste(target, files=[file]):
+            self._upload_image(image)
+
+    def _upload_image(self, image):
+        """
+        编辑器不处理粘贴的文件时，通过图片上传控件上传
+
+        chromedriver 对文件 input 的 send_keys 通过 DOM.setFileInputFiles 设置文件并触发
+        change 事件，不要求控件可见。UEditor 的正文位于 iframe 中，工具栏和上传控件在父页面，
+        当前 frame 中找不到时逐级切换到父 frame 查找，上传后再切换回编辑器所在的 frame。
+        """
+        path = self._write_upload_file(image)
+        depth = 0
+        try:
+            while True:
+                inputs = self.driver.find_elements(By.CSS_SELECTOR, self.upload_selector)
+                if inputs:
+                    inputs[0].send_keys(path)
+                    return
+                if not self.driver.execute_script(_MARK_FRAME_SCRIPT, depth):
+                    break
+                self.driver.switch_to.parent_frame()
+                depth += 1
+            raise ContentInputError(
+                f"编辑器未处理粘贴的图片，且页面中没有图片上传控件（{self.upload_selector}）"
+            )
+        finally:
+            for level in reversed(range(depth)):
+                frame = self.driver.find_element(By.CSS_SELECTOR, f'iframe[{FRAME_MARK}="{level}"]')
+                self.driver.switch_to.frame(frame)
+
+    @staticmethod
+    def _write_upload_file(image):
+        """把预处理（缩小）后的图片写到配图目录，上传控件只能接收文件路径"""
+        stem = os.path.splitext(image.name)[0]
+        ext = mimetypes.guess_extension(image.mime_type) or ".jpg"
+        path = os.path.join(os.path.dirname(os.path.abspath(image.path)), f"{stem}.upload{ext}")
+        with open(path, "wb") as f:
+            f.write(base64.b64decode(image.data))
+        return path
+
+    def paste_text(self, target, text):
+        self._paste(target, text_to_html(text), text)
+
+
+def get_content_input(driver, upload_selector=IMAGE_UPLOAD_SELECTOR):
+    """
+    按配置返回正文输入方式
+
+    Args:
+        driver: WebDriver
+        upload_selector: dom 方式下编辑器图片上传控件的 CSS 选择器
+    """
+    if CONTENT_INPUT == "dom":
+        return DomInput(driver, upload_selector)
+    return ClipboardInput(driver)
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# @File    : driver_resolver.py
+"""
+Chrome 版本与 chromedriver 路径解析
+
+- Chrome 版本每个进程只检测一次（Windows 读取文件版本，macOS 执行 --version）
+- chromedriver 路径按 Chrome 版本缓存在磁盘上，之后启动浏览器不再访问网络，
+  只有缓存的文件不存在时才通过 ChromeDriverManager 重新下载
+"""
+
+import json
+import os
+import platform
+import subprocess
+import threading
+
+if platform.system() == "Windows":
+    import pythoncom
+    from win32com import client as win_client
+
+DRIVER_CACHE_FILE = os.path.join("temp", "chromedriver.json")
+
+_lock = threading.Lock()
+_chrome_version = None
+_driver_path = None
+
+
+def chrome_binary_path():
+    """随程序分发的 Chrome 可执行文件路径"""
+    parent_path = os.path.dirname(os.path.dirname(__file__))
+    if platform.system() == "Windows":
+        return os.path.join(parent_path, "chrome", "chrome.exe")
+    if platform.system() == "Linux":
+        # Chrome for Testing 的 Linux 发行包，用于无头发布
+        return os.path.join(parent_path, "chrome-linux64", "chrome")
+    return os.path.join(
+        parent_path,
+        "chrome-mac-arm64",
+        "Google Chrome for Testing.app",
+        "Contents",
+        "MacOS",
+        "Google Chrome for Testing",
+    )
+
+
+def _detect_chrome_version(chrome_path):
+    if platform.system() == "Windows":
+        pythoncom.CoInitialize()
+        win_obj = win_client.Dispatch("Scripting.FileSystemObject")
+        return win_obj.GetFileVersion(chrome_path).strip()
+    result = subprocess.run(
+        [chrome_path, "--version"],
+        capture_output=True,
+    )
+    return result.stdout.decode("utf-8").strip().split()[-1]
+
+
+def get_chrome_version():
+    """Chrome 版本号，进程内只检测一次"""
+    global _chrome_version
+    if _chrome_version is None:
+        with _lock:
+            if _chrome_version is None:
+                _chrome_version = _detect_chrome_version(chrome_binary_path())
+    return _chrome_version
+
+
+def _load_cache():
+    try:
+        with open(DRIVER_CACHE_FILE, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(cache):
+    os.makedirs(os.path.dirname(DRIVER_CACHE_FILE), exist_ok=True)
+    tmp_file = f"{DRIVER_CACHE_FILE}.tmp"
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        json.dump(cache, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_file, DRIVER_CACHE_FILE)
+
+
+def get_driver_path():
+    """当前 Chrome 版本对应的 chromedriver 路径"""
+    global _driver_path
+    if _driver_path is not None:
+        return _driver_path
+    chrome_version = get_chrome_version()
+    with _lock:
+        if _driver_path is None:
+            cache = _load_cache()
+            path = cache.get(chrome_version)
+            if not path or not os.path.isfile(path):
+                # 延迟导入，缓存命中时不需要加载 webdriver_manager
+                from webdriver_manager.chrome import ChromeDriverManager
+
+                path = ChromeDriverManager(chrome_version).install()
+                cache[chrome_version] = path
+                _save_cache(cache)
+            _driver_path = path
+    return _driver_path
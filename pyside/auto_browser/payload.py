@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+# @File    : payload.py
+"""
+发布内容预处理
+
+在生产线程中把文章整理为 PublishPayload：清理后的标题和正文、按图片分好的段落，以及按当前
+正文输入方式预先编码好的图片（剪贴板方式为 BMP，DOM 注入为 base64）。浏览器阶段只负责把
+这些内容注入编辑器，不再让浏览器空等图片解码和格式转换。
+"""
+
+import base64
+import mimetypes
+import os
+import re
+from io import BytesIO
+
+from PIL import Image
+
+from auto_browser.content_input import CONTENT_INPUT
+
+# 每篇文章最多使用的配图数量，正文按图片数量分段
+MAX_IMAGES = 3
+# 长边超过该尺寸的图片先缩小，减少剪贴板数据量和上传时间
+MAX_IMAGE_SIDE = 1920
+
+
+class PreparedImage:
+    """
+    预先编码的配图
+
+    Args:
+        path: 原图路径
+        mime_type: 图片类型
+        bmp: BMP 数据（剪贴板方式使用）
+        data: base64 编码的图片（DOM 注入使用）
+    """
+
+    def __init__(self, path, mime_type, bmp=None, data=None):
+        self.path = path
+        self.name = os.path.basename(path)
+        self.mime_type = mime_type
+        self.bmp = bmp
+        self.data = data
+
+
+class PayloadChunk:
+    """正文的一段，粘贴时先插入 image 再粘贴 text"""
+
+    def __init__(self, text, image=None):
+        self.text = text
+        self.image = image
+
+
+class PublishPayload:
+    """
+    可直接注入编辑器的发布内容
+
+    Args:
+        title: 标题
+        body: 正文
+        chunks: PayloadChunk 列表
+        imgs_path: 配图目录
+        images: 配图文件名列表，封面等步骤按文件名查找
+    """
+
+    def __init__(self, title, body, chunks, imgs_path, images):
+        self.title = title
+        self.body = body
+        self.chunks = chunks
+        self.imgs_path = imgs_path
+        self.images = images
+
+    @property
+    def image_count(self):
+        return sum(1 for chunk in self.chunks if chunk.image)
+
+
+def clean_title(title):
+    """去掉 Markdown 标题、加粗标记和多余空白"""
+    title = re.sub(r"[#*]", "", title)
+    return re.sub(r"\s+", " ", title).strip()
+
+
+def split_article(body, parts):
+    """
+    按图片数量把正文的行平均分成 parts 段，余下的行放在最后一段
+
+    Returns:
+        list[str]: 每段文字，行尾保留换行
+    """
+    lines = body.split("\n")
+    if parts <= 1:
+        return ["".join(line + "\n" for line in lines if line)]
+    step = len(lines) // parts
+    chunks = []
+    for i in range(parts):
+        end = (i + 1) * step if i < parts - 1 else len(lines)
+        chunks.append("".join(line + "\n" for line in lines[i * step : end] if line))
+    return chunks
+
+
+def encode_image(path, content_input=CONTENT_INPUT):
+    """按正文输入方式编码图片，过大的图片先缩小"""
+    mime_type = mimetypes.guess_type(path)[0] or "image/jpeg"
+    with Image.open(path) as image:
+        resized = max(image.size) > MAX_IMAGE_SIDE
+        if resized:
+            image = image.convert("RGB")
+            image.thumbnail((MAX_IMAGE_SIDE, MAX_IMAGE_SIDE), Image.Resampling.LANCZOS)
+        output = BytesIO()
+        if content_input == "clipboard":
+            image.save(output, "BMP")
+            return PreparedImage(path, mime_type, bmp=output.getvalue())
+        if resized:
+            image.save(output, "JPEG", quality=95)
+            mime_type = "image/jpeg"
+        else:
+            with open(path, "rb") as f:
+                output.write(f.read())
+    return PreparedImage(path, mime_type, data=base64.b64encode(output.getvalue()).decode("ascii"))
+
+
+def prepare_payload(content, imgs_path, content_input=CONTENT_INPUT):
+    """
+    把文章整理为发布内容
+
+    Args:
+        content: 文章内容，第一行为标题
+        imgs_path: 配图目录
+        content_input: 正文输入方式，决定图片的编码格式
+    """
+    lines = content.splitlines()
+    title = clean_title(lines[0]) if lines else ""
+    body = "\n".join(lines[1:]).strip().replace("#", "")
+    images = sorted(os.listdir(imgs_path)) if imgs_path and os.path.isdir(imgs_path) else []
+
+    prepared = []
+    for name in images[:MAX_IMAGES]:
+        try:
+            prepared.append(encode_image(os.path.join(imgs_path, name), content_input))
+        except OSError as e:
+            # 图片损坏时跳过该图片，对应的段落只粘贴文字
+            print(f"图片处理失败 {name}: {e}")
+            prepared.append(None)
+
+    texts = split_article(body, len(prepared))
+    chunks = [
+        PayloadChunk(text, prepared[i] if i < len(prepared) else None)
+        for i, text in enumerate(texts)
+    ]
+    return PublishPayload(title, body, chunks, imgs_path, images)
@@ -2,11 +2,7 @@
 # @Time    : 2024/12/22 21:09
 # @Author  : DNQTeach
 # @File    : qiehao.py
-import os
-import platform
-import subprocess
 import time
-from io import BytesIO
 
 from PIL import Image
 from selenium import webdriver
@@ -15,53 +11,24 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
-from webdriver_manager.chrome import ChromeDriverManager
 
-if platform.system() == "Windows":
-    import pyperclip
-    import pythoncom
-    import win32clipboard
-    from win32com import client as win_client
-
-elif platform.system() == "Darwin":  # macOS
-    pass
+from auto_browser.content_input import get_content_input
+from auto_browser.driver_resolver import chrome_binary_path, get_driver_path
+from auto_browser.tracing import PublishTrace
+from auto_browser.waits import Waiter
 
 
 def get_driver():
     chrome_options = Options()
     chrome_options.add_argument("--no-sandbox")  # 禁用沙盒模式git
     chrome_options.add_argument("--disable-gpu")
-    current_path = os.path.dirname(__file__)
-    parent_path = os.path.dirname(current_path)
-    if platform.system() == "Windows":
-        chrome_path = os.path.join(parent_path, "chrome", "chrome.exe")
-        pythoncom.CoInitialize()
-        win_obj = win_client.Dispatch("Scripting.FileSystemObject")
-        chrome_version = win_obj.GetFileVersion(chrome_path)
-        chrome_version = chrome_version.strip()
-    else:
-        chrome_path = os.path.join(
-            parent_path,
-            "chrome-mac-arm64",
-            "Google Chrome for Testing.app",
-            "Contents",
-            "MacOS",
-            "Google Chrome for Testing",
-        )
-        result = subprocess.run(
-            [chrome_path, "--version"],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-        )
-        chrome_version = result.stdout.decode("utf-8").strip().split()[-1]
-
+    chrome_path = chrome_binary_path()
     chrome_options.binary_location = chrome_path
     chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
 
     driver = webdriver.Chrome(
         options=chrome_options,
-        service=Service(ChromeDriverManager(chrome_version).install()),
+        service=Service(get_driver_path()),
     )
     driver.execute_cdp_cmd(
         "Page.addScriptToEvaluateOnNewDocument",
@@ -154,98 +121,55 @@ def convert_to_portrait(image_path):
         print(f"图片已调整为1080x1920并覆盖原文件：{image_path}")
 
 
-def publish_qiehao(driver, content, imgs_path):
-    lines = content.splitlines()
-    title = lines[0].strip()
-    title = title.replace("#", "")
-    info = "\n".join(lines[1:]).strip()
-    info = info.replace("#", "")
-    imgs_list = os.listdir(imgs_path)
-    # convert_to_portrait(os.path.join(imgs_path,imgs_list[2]))
-    imgs_list_len = len(imgs_list)
+def publish_qiehao(driver, payload, trace=None):
+    """
+    发布文章
+
+    Args:
+        driver: 已打开编辑页的 WebDriver
+        payload: payload.prepare_payload 生成的发布内容
+        trace: 发布追踪
+    """
+    title = payload.title
+    imgs_list_len = payload.image_count
 
-    is_copy_content = False
-    out_flag = False
-    time_out = 60 * 2
-    tart_time = time.time()
     result = {
         "status": False,
         "msg": "",
     }
-    time.sleep(10)
-    while True:
-        if is_copy_content is False:
-            """标题"""
-            try:
-                title_input = WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located(
-                        (By.XPATH, '//*[@id="omEditorTitle"]/div/div[1]/div/span')
-                    )
-                )
-                title_input.clear()
-                title_input.send_keys(title)
-                time.sleep(1)
-                content_input = driver.find_element(By.CLASS_NAME, "ExEditor-basic")
-                content_input.clear()
-                info_len = info.split("\n")
-                tep = int(len(info_len) / imgs_list_len)
-                info1 = [i + "\n" for i in info_len[0:tep] if len(i) > 0]
-                info2 = [i + "\n" for i in info_len[tep : tep * 2] if len(i) > 0]
-                info3 = [i + "\n" for i in info_len[tep * 2 :] if len(i) > 0]
-                ct = [info1, info2, info3]
-                img_idx = 0
-                for info_txt in ct:
-                    try:
-                        # 检查操作系统
-                        image = Image.open(os.path.join(imgs_path, imgs_list[img_idx]))
-                        output = BytesIO()
-                        image.save(output, "BMP")
-                        data = output.getvalue()[14:]
-                        output.close()
-                        win32clipboard.OpenClipboard()
-                        win32clipboard.EmptyClipboard()
-                        win32clipboard.SetClipboardData(win32clipboard.CF_DIB, data)
-                        win32clipboard.CloseClipboard()
-                        content_input.send_keys(Keys.CONTROL, "v")
-                        time.sleep(0.5)
-                        content_input.send_keys(Keys.ENTER)
-                    except:
-                        pass
-                    pyperclip.copy("".join(info_txt))
-                    content_input.send_keys(Keys.CONTROL, "v")
-                    time.sleep(0.5)
-                    # content_input.send_keys(Keys.DOWN)
-                    img_idx += 1
-                is_copy_content = True
-            except:
-                pass
-        print("is_copy_content:", is_copy_content)
-        if is_copy_content is True:
-            time.sleep(10)
-            try:
-                wait = WebDriverWait(driver, 10)  # 等待时间设为10秒
-                # 使用显示等待来等待元素出现
-                publish_text_element = wait.until(
-                    EC.visibility_of_element_located((By.XPATH, '//span[text()="发布"]'))
-                )
-                # 从包含“发布”文本的元素出发，找到对应的按钮
-                button = publish_text_element.find_element(By.XPATH, "./parent::button")
-                button.click()
-                # 点击元素
-                # a.click()
-                time.sleep(5)
-                out_flag = True
-            except:
-                print("没有找到")
-        end_time = time.time()
-        if out_flag:
+    trace = trace or PublishTrace("企鹅号")
+    wait = Waiter(driver)
+    try:
+        """标题"""
+        with trace.span("title_fill"):
+            title_input = wait.present(
+                (By.XPATH, '//*[@id="omEditorTitle"]/div/div[1]/div/span'), timeout=30
+            )
+            title_input.clear()
+            title_input.send_keys(title)
+
+        paster = get_content_input(driver)
+        with paster.lock(), trace.span("body_paste"):
+            content_input = wait.present((By.CLASS_NAME, "ExEditor-basic"))
+            content_input.clear()
+            paster.paste_article(wait, content_input, payload.chunks, after_image=Keys.ENTER)
+
+        with trace.span("image_upload", optional=True):
+            wait.images_uploaded(content_input, min(imgs_list_len, 3), timeout=60)
+
+        with trace.span("submit"):
+            # 使用显示等待来等待元素出现
+            publish_text_element = wait.visible((By.XPATH, '//span[text()="发布"]'), timeout=30)
+            # 从包含“发布”文本的元素出发，找到对应的按钮
+            button = publish_text_element.find_element(By.XPATH, "./parent::button")
+            wait.until(EC.element_to_be_clickable(button)).click()
             result["status"] = True
-            break
-        elif end_time - tart_time > time_out:
-            break
-        else:
-            break
-    time.sleep(10)
+
+        with trace.span("submit_confirm", optional=True):
+            wait.network_idle(timeout=30)
+    except Exception as e:
+        print(f"企鹅号发布失败：{e}")
+        result["msg"] = str(e)
     return result
 
 
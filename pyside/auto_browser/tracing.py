@@ -0,0 +1,203 @@
+#!/usr/bin/env python
+# @File    : tracing.py
+"""
+发布过程追踪
+
+每次发布记录一条追踪：平台、账号、结果以及各步骤（span）的开始时间、耗时和是否成功，
+追加写入 temp/publish_trace.jsonl。
+
+查看各平台各步骤耗时分布（在 pyside 目录下执行）:
+    python -m auto_browser.tracing
+    python -m auto_browser.tracing --platform 头条号 --days 7
+"""
+
+import argparse
+import json
+import os
+import statistics
+import threading
+import time
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+
+TRACE_FILE = os.path.join("temp", "publish_trace.jsonl")
+# 超过该大小时轮转为 .1 文件，只保留一份历史
+TRACE_MAX_BYTES = 20 * 1024 * 1024
+
+_write_lock = threading.Lock()
+
+
+class PublishTrace:
+    """
+    一次发布的追踪记录
+
+    Args:
+        platform_: 发布平台
+        account: 账号标识
+    """
+
+    def __init__(self, platform_, account=None):
+        self.platform = platform_
+        self.account = account
+        self.trace_id = uuid.uuid4().hex
+        self.started_at = time.time()
+        self.spans = []
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def span(self, name, optional=False, **attrs):
+        """
+        记录一个步骤
+
+        Args:
+            name: 步骤名称，汇总时按名称分组
+            optional: 可选步骤出错时只记录失败并继续，必需步骤的异常继续抛出
+            attrs: 附加信息，例如会话是否复用
+        """
+        start = time.perf_counter()
+        span = {"name": name, "offset": round(start - self._start, 3), **attrs}
+        try:
+            yield span
+        except Exception as e:
+            span.update(seconds=round(time.perf_counter() - start, 3), ok=False)
+            span["error"] = f"{e.__class__.__name__}: {e}"[:200]
+            self.spans.append(span)
+            if not optional:
+                raise
+            print(f"[{self.platform}] {name} 跳过：{e.__class__.__name__}")
+        else:
+            span.update(seconds=round(time.perf_counter() - start, 3), ok=True)
+            self.spans.append(span)
+
+    def as_list(self):
+        return list(self.spans)
+
+    def report(self):
+        total = time.perf_counter() - self._start
+        print(f"[{self.platform}] 发布耗时 {total:.1f}s")
+        for span in self.spans:
+            flag = "" if span["ok"] else "  失败"
+            print(f"  {span['name']:<16} {span['seconds']:>6.2f}s{flag}")
+
+    def finish(self, result=None, error=None):
+        """
+        结束追踪，输出耗时并写入日志
+
+        Args:
+            result: 发布结果，包含 status/msg
+            error: 发布过程抛出的异常
+        """
+        record = {
+            "trace_id": self.trace_id,
+            "platform": self.platform,
+            "account": self.account,
+            "started_at": round(self.started_at, 3),
+            "seconds": round(time.perf_counter() - self._start, 3),
+            "status": bool(result and result.get("status")),
+            "msg": str(error) if error else (result or {}).get("msg", ""),
+            "spans": self.spans,
+        }
+        self.report()
+        try:
+            write_trace(record)
+        except OSError as e:
+            print(f"写入发布追踪失败：{e}")
+        return record
+
+
+def write_trace(record, path=TRACE_FILE):
+    line = json.dumps(record, ensure_ascii=False) + "\n"
+    with _write_lock:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if os.path.exists(path) and os.path.getsize(path) > TRACE_MAX_BYTES:
+            os.replace(path, f"{path}.1")
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(line)
+
+
+def load_traces(path=TRACE_FILE, platform_=None, since=None):
+    """读取追踪记录，跳过无法解析的行"""
+    if not os.path.exists(path):
+        return []
+    traces = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if platform_ and record.get("platform") != platform_:
+                continue
+            if since and record.get("started_at", 0) < since:
+                continue
+            traces.append(record)
+    return traces
+
+
+def percentile(sorted_values, ratio):
+    index = max(int(len(sorted_values) * ratio + 0.5) - 1, 0)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+def summarize(traces):
+    """
+    按平台、步骤汇总耗时
+
+    Returns:
+        {平台: {"total": 统计, "steps": {步骤: 统计}}}，统计包含 count/failed/p50/p95
+    """
+    totals = defaultdict(list)
+    steps = defaultdict(lambda: defaultdict(list))
+    for record in traces:
+        platform_ = record.get("platform")
+        totals[platform_].append((record.get("seconds", 0), record.get("status", False)))
+        for span in record.get("spans", []):
+            steps[platform_][span["name"]].append((span["seconds"], span["ok"]))
+
+    def stats(samples):
+        values = sorted(seconds for seconds, _ in samples)
+        return {
+            "count": len(values),
+            "failed": sum(1 for _, ok in samples if not ok),
+            "p50": statistics.median(values),
+            "p95": percentile(values, 0.95),
+        }
+
+    return {
+        platform_: {
+            "total": stats(totals[platform_]),
+            "steps": {name: stats(samples) for name, samples in steps[platform_].items()},
+        }
+        for platform_ in totals
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="发布步骤耗时汇总")
+    parser.add_argument("--file", default=TRACE_FILE, help="追踪日志路径")
+    parser.add_argument("--platform", help="只统计指定平台")
+    parser.add_argument("--days", type=float, help="只统计最近几天")
+    args = parser.parse_args()
+
+    since = time.time() - args.days * 86400 if args.days else None
+    summary = summarize(load_traces(args.file, args.platform, since))
+    if not summary:
+        print("没有发布追踪记录")
+        return
+    for platform_, data in summary.items():
+        total = data["total"]
+        print(
+            f"{platform_}  发布 {total['count']} 次  失败 {total['failed']} 次  "
+            f"p50 {total['p50']:.1f}s  p95 {total['p95']:.1f}s"
+        )
+        # 按中位耗时从高到低排列，最慢的步骤在最前
+        for name, s in sorted(data["steps"].items(), key=lambda item: -item[1]["p50"]):
+            print(
+                f"  {name:<16} 次数 {s['count']:>5}  失败 {s['failed']:>4}  "
+                f"p50 {s['p50']:>7.2f}s  p95 {s['p95']:>7.2f}s"
+            )
+
+
+if __name__ == "__main__":
+    main()
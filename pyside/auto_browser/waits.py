@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+# @File    : waits.py
+"""
+发布流程使用的显式等待
+
+Waiter 基于 WebDriverWait 封装常用等待条件（元素出现/可点击、按文字查找、网络空闲、
+图片上传完成），条件满足立即继续，不再固定 sleep。各步骤耗时由 tracing.PublishTrace 记录。
+"""
+
+import time
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+# 页面资源数稳定后再等待的时间（秒）
+NETWORK_IDLE_TIME = 0.5
+
+_RESOURCE_COUNT_SCRIPT = """
+performance.setResourceTimingBufferSize(100000);
+return [document.readyState, performance.getEntriesByType("resource").length];
+"""
+
+# 图片已加载且不再是本地 blob/data 地址，视为上传完成
+_UPLOADED_IMAGES_SCRIPT = """
+const imgs = Array.from(arguments[0].querySelectorAll("img"));
+const done = imgs.every(img => img.complete && img.naturalWidth > 0
+    && !img.src.startsWith("blob:") && !img.src.startsWith("data:"));
+return done ? imgs.length : -1;
+"""
+
+
+class Waiter:
+    """
+    显式等待工具
+
+    Args:
+        driver: WebDriver
+        timeout: 默认超时时间（秒）
+        poll: 轮询间隔（秒）
+    """
+
+    def __init__(self, driver, timeout=10, poll=0.2):
+        self.driver = driver
+        self.timeout = timeout
+        self.poll = poll
+
+    def until(self, condition, timeout=None, message=""):
+        """等待 condition(driver) 返回真值并返回该值，超时抛出 TimeoutException"""
+        wait = WebDriverWait(self.driver, timeout or self.timeout, poll_frequency=self.poll)
+        return wait.until(condition, message)
+
+    def present(self, locator, timeout=None):
+        return self.until(EC.presence_of_element_located(locator), timeout)
+
+    def visible(self, locator, timeout=None):
+        return self.until(EC.visibility_of_element_located(locator), timeout)
+
+    def clickable(self, locator, timeout=None):
+        return self.until(EC.element_to_be_clickable(locator), timeout)
+
+    def click(self, locator, timeout=None):
+        """等待元素可点击后点击，返回该元素"""
+        element = self.clickable(locator, timeout)
+        element.click()
+        return element
+
+    def all_present(self, locator, timeout=None):
+        return self.until(EC.presence_of_all_elements_located(locator), timeout)
+
+    def by_text(self, locator, text, timeout=None, contains=False):
+        """等待 locator 匹配的元素中出现文字为 text 的元素并返回"""
+
+        def condition(driver):
+            for element in driver.find_elements(*locator):
+                element_text = element.text
+                if (text in element_text) if contains else (element_text == text):
+                    return element
+            return False
+
+        return self.until(condition, timeout, f"未找到文字为 {text} 的元素")
+
+    def optional_click(self, locator, timeout=None):
+        """元素在超时前可点击则点击，返回是否点击"""
+        try:
+            self.click(locator, timeout)
+            return True
+        except TimeoutException:
+            return False
+
+    def frame(self, frame_reference, timeout=None):
+        """等待 iframe 可用并切换进去"""
+        return self.until(EC.frame_to_be_available_and_switch_to_it(frame_reference), timeout)
+
+    def new_window(self, old_handles, timeout=None):
+        """等待打开新标签页并切换过去"""
+        self.until(EC.new_window_is_opened(list(old_handles)), timeout)
+        new_handle = next(h for h in self.driver.window_handles if h not in old_handles)
+        self.driver.switch_to.window(new_handle)
+        return new_handle
+
+    def page_loaded(self, timeout=None):
+        return self.until(
+            lambda d: d.execute_script("return document.readyState") == "complete",
+            timeout,
+            "页面未加载完成",
+        )
+
+    def network_idle(self, timeout=None, idle_time=NETWORK_IDLE_TIME):
+        """页面加载完成且 idle_time 内没有新的网络请求"""
+        state = {"count": -1, "since": time.monotonic()}
+
+        def condition(driver):
+            ready, count = driver.execute_script(_RESOURCE_COUNT_SCRIPT)
+            now = time.monotonic()
+            if ready != "complete" or count != state["count"]:
+                state["count"], state["since"] = count, now
+                return False
+            return now - state["since"] >= idle_time
+
+        return self.until(condition, timeout, "网络请求未结束")
+
+    def images_uploaded(self, container, count, timeout=None):
+        """
+        等待编辑器中的图片上传完成
+
+        Args:
+            container: 编辑器元素
+            count: 至少应有的图片数量
+        """
+        return self.until(
+            lambda d: d.execute_script(_UPLOADED_IMAGES_SCRIPT, container) >= count,
+            timeout,
+            "图片上传未完成",
+        )
+
+    def image_inserted(self, container, before, timeout=None):
+        """粘贴图片后等待编辑器中的图片数量超过 before"""
+        return self.until(
+            lambda d: len(container.find_elements("tag name", "img")) > before,
+            timeout,
+            "图片未插入",
+        )
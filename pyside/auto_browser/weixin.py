@@ -2,67 +2,33 @@
 # @Time    : 2024/12/2 17:39
 # @Author  : DNQTeach
 # @File    : weixin.py
-import os
-import platform
-import subprocess
 import time
-from io import BytesIO
 
 from PIL import Image
 from selenium import webdriver
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
-from webdriver_manager.chrome import ChromeDriverManager
 
-if platform.system() == "Windows":
-    import pyperclip
-    import pythoncom
-    import win32clipboard
-    from win32com import client as win_client
-
-elif platform.system() == "Darwin":  # macOS
-    pass
+from auto_browser.content_input import get_content_input
+from auto_browser.driver_resolver import chrome_binary_path, get_driver_path
+from auto_browser.tracing import PublishTrace
+from auto_browser.waits import Waiter
 
 
 def get_driver():
     chrome_options = Options()
     chrome_options.add_argument("--no-sandbox")  # 禁用沙盒模式git
     chrome_options.add_argument("--disable-gpu")
-    current_path = os.path.dirname(__file__)
-    parent_path = os.path.dirname(current_path)
-    if platform.system() == "Windows":
-        chrome_path = os.path.join(parent_path, "chrome", "chrome.exe")
-        pythoncom.CoInitialize()
-        win_obj = win_client.Dispatch("Scripting.FileSystemObject")
-        chrome_version = win_obj.GetFileVersion(chrome_path)
-        chrome_version = chrome_version.strip()
-    else:
-        chrome_path = os.path.join(
-            parent_path,
-            "chrome-mac-arm64",
-            "Google Chrome for Testing.app",
-            "Contents",
-            "MacOS",
-            "Google Chrome for Testing",
-        )
-        result = subprocess.run(
-            [chrome_path, "--version"],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-        )
-        chrome_version = result.stdout.decode("utf-8").strip().split()[-1]
-
+    chrome_path = chrome_binary_path()
     chrome_options.binary_location = chrome_path
     chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
 
     driver = webdriver.Chrome(
         options=chrome_options,
-        service=Service(ChromeDriverManager(chrome_version).install()),
+        service=Service(get_driver_path()),
     )
     driver.execute_cdp_cmd(
         "Page.addScriptToEvaluateOnNewDocument",
@@ -148,239 +114,117 @@ def convert_to_portrait(image_path):
         print(f"图片已调整为1080x1920并覆盖原文件：{image_path}")
 
 
-def publish_weixin(driver, content, imgs_path):
-    lines = content.splitlines()
-    title = lines[0].strip()
-    title = title.replace("#", "")
-    info = "\n".join(lines[1:]).strip()
-    info = info.replace("#", "")
-    imgs_list = os.listdir(imgs_path)
-    # convert_to_portrait(os.path.join(imgs_path,imgs_list[2]))
-    imgs_list_len = len(imgs_list)
+def publish_weixin(driver, payload, trace=None):
+    """
+    发布文章
+
+    Args:
+        driver: 已打开编辑页的 WebDriver
+        payload: payload.prepare_payload 生成的发布内容
+        trace: 发布追踪
+    """
+    title = payload.title
+    imgs_list_len = payload.image_count
 
-    is_copy_content = False
-    out_flag = False
-    cover_flag = False
-    time_out = 60 * 2
-    tart_time = time.time()
     result = {
         "status": False,
         "msg": "",
     }
-    time.sleep(3)
-    elms = driver.find_elements(By.CLASS_NAME, "new-creation__menu-content")
-    try:
-        auth = driver.find_element(By.CLASS_NAME, "weui-desktop_name").text
-    except:
-        auth = "佚名"
+    trace = trace or PublishTrace("微信公众号")
+    wait = Waiter(driver)
     try:
-        current_window = driver.current_window_handle
-        for item in elms:
-            print(item.text)
-            if item.text == "文章":
-                item.click()
-                break
-        # 获取所有窗口的句柄
-        all_windows = driver.window_handles
-        # 切换到新打开的标签页
-        for window in all_windows:
-            if window != current_window:
-                driver.switch_to.window(window)
-                break
-    except:
-        pass
-    time.sleep(3)
-    while True:
-        if is_copy_content is False:
-            """标题内容"""
+        with trace.span("open_editor"):
             try:
-                title_input = WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((By.XPATH, '//*[@id="title"]'))
-                )
-                title_input.send_keys(title)
-                time.sleep(1)
-                """作者"""
-                author = driver.find_element(By.ID, "author")
-                author.send_keys(auth)
-                time.sleep(1)
-                """内容"""
+                auth = wait.present((By.CLASS_NAME, "weui-desktop_name"), timeout=15).text
+            except Exception:
+                auth = "佚名"
+            old_handles = driver.window_handles
+            wait.by_text((By.CLASS_NAME, "new-creation__menu-content"), "文章").click()
+            # 切换到新打开的标签页
+            wait.new_window(old_handles)
+
+        """标题内容"""
+        with trace.span("title_fill"):
+            title_input = wait.present((By.XPATH, '//*[@id="title"]'), timeout=30)
+            title_input.send_keys(title)
+            """作者"""
+            driver.find_element(By.ID, "author").send_keys(auth)
+
+        """内容"""
+        paster = get_content_input(driver)
+        try:
+            with paster.lock(), trace.span("body_paste"):
                 try:
                     """订阅号"""
-                    content_input = driver.find_element(By.CLASS_NAME, "ProseMirror")
-                    info_len = info.split("\n")
-                    tep = int(len(info_len) / imgs_list_len)
-                    info1 = [i + "\n" for i in info_len[0:tep] if len(i) > 0]
-                    info2 = [i + "\n" for i in info_len[tep : tep * 2] if len(i) > 0]
-                    info3 = [i + "\n" for i in info_len[tep * 2 :] if len(i) > 0]
-                    ct = [info1, info2, info3]
-                    img_idx = 0
-                    for info_txt in ct:
-                        try:
-                            image = Image.open(os.path.join(imgs_path, imgs_list[img_idx]))
-                            output = BytesIO()
-                            image.save(output, "BMP")
-                            data = output.getvalue()[14:]
-                            output.close()
-                            win32clipboard.OpenClipboard()
-                            win32clipboard.EmptyClipboard()
-                            win32clipboard.SetClipboardData(win32clipboard.CF_DIB, data)
-                            win32clipboard.CloseClipboard()
-                            content_input.send_keys(Keys.CONTROL, "v")
-                            time.sleep(0.5)
-                            # content_input.send_keys(Keys.DOWN)
-                        except:
-                            pass
-                        pyperclip.copy("".join(info_txt))
-                        content_input.send_keys(Keys.CONTROL, "v")
-                        time.sleep(0.5)
-                        # content_input.send_keys(Keys.DOWN)
-                        img_idx += 1
-                    is_copy_content = True
-                except:
+                    content_input = wait.present((By.CLASS_NAME, "ProseMirror"), timeout=5)
+                except TimeoutException:
                     """服务号"""
-                    driver.switch_to.frame("ueditor_0")
-                    content_input = driver.find_element(By.CLASS_NAME, "autoTypeSetting24psection")
-                    info_len = info.split("\n")
-                    tep = int(len(info_len) / imgs_list_len)
-                    info1 = [i + "\n" for i in info_len[0:tep] if len(i) > 0]
-                    info2 = [i + "\n" for i in info_len[tep : tep * 2] if len(i) > 0]
-                    info3 = [i + "\n" for i in info_len[tep * 2 :] if len(i) > 0]
-                    ct = [info1, info2, info3]
-                    img_idx = 0
-                    for info_txt in ct:
-                        try:
-                            image = Image.open(os.path.join(imgs_path, imgs_list[img_idx]))
-                            output = BytesIO()
-                            image.save(output, "BMP")
-                            data = output.getvalue()[14:]
-                            output.close()
-                            win32clipboard.OpenClipboard()
-                            win32clipboard.EmptyClipboard()
-                            win32clipboard.SetClipboardData(win32clipboard.CF_DIB, data)
-                            win32clipboard.CloseClipboard()
-                            content_input.send_keys(Keys.CONTROL, "v")
-                            time.sleep(0.5)
-                            # content_input.send_keys(Keys.DOWN)
-                        except:
-                            pass
-                        pyperclip.copy("".join(info_txt))
-                        content_input.send_keys(Keys.CONTROL, "v")
-                        time.sleep(0.5)
-                        # content_input.send_keys(Keys.DOWN)
-                        img_idx += 1
-                    is_copy_content = True
-                driver.switch_to.default_content()
-            except:
-                pass
-        if is_copy_content:
-            try:
-                """封面"""
-                time.sleep(1)
-                cover_ac = driver.find_element(By.ID, "js_cover_area")
-                driver.execute_script("arguments[0].scrollIntoView();", cover_ac)
-                time.sleep(1)
-                actions = ActionChains(driver)
-                actions.move_to_element(cover_ac).perform()
-                time.sleep(1)
-                popup_info = driver.find_elements(By.CLASS_NAME, "pop-opr__item")
-                for info in popup_info:
-                    print(info.text)
-                    if info.text == "从正文选择":
-                        info.click()
-                        break
-                time.sleep(1)
-                # 点击第一章图片
-                imgs = driver.find_elements(By.CLASS_NAME, "appmsg_content_img_item")
-                imgs[0].click()
-                # 下一步
-                buttons_cover = driver.find_elements(By.CLASS_NAME, "weui-desktop-btn_wrp")
-                for bnt in buttons_cover:
-                    if bnt.text == "下一步":
-                        bnt.find_element(By.TAG_NAME, "button").click()
-                        time.sleep(2)
-                        break
-                driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                buttons_cover2 = driver.find_elements(By.CLASS_NAME, "weui-desktop-btn_wrp")
-                for bnt2 in buttons_cover2:
-                    if bnt2.text == "确认":
-                        bnt2.find_element(By.TAG_NAME, "button").click()
-                        time.sleep(1)
-                        break
-                cover_flag = True
-            except Exception as e:
-                print(e)
-        try:
-            if cover_flag:
-                print("原创")
-                yc = driver.find_element(By.CLASS_NAME, "js_unset_original_title")
-                if yc.text == "未声明":
-                    yc.click()
-                    time.sleep(1)
-                    ag = driver.find_element(By.CLASS_NAME, "original_agreement")
-                    ag.find_element(By.CLASS_NAME, "weui-desktop-form__check-label").find_element(
-                        By.CLASS_NAME, "weui-desktop-icon-checkbox"
-                    ).click()
-
-                    bnts = driver.find_elements(By.CLASS_NAME, "weui-desktop-btn_primary")
-                    for b in bnts:
-                        if b.text == "确定":
-                            b.click()
-                            break
-        except:
-            pass
-        print("cover_flag:", cover_flag)
-        print("is_copy_content:", is_copy_content)
-        if cover_flag is True and is_copy_content is True:
-            time.sleep(3)
-            try:
-                wait = WebDriverWait(driver, 10)  # 等待时间设为10秒
-                # 使用显示等待来等待元素出现
-                publish_text_element = wait.until(
-                    EC.visibility_of_element_located((By.CLASS_NAME, "mass_send"))
-                )
-                publish_text_element.click()
-                # 取消群发
-                time.sleep(2)
-                check = driver.find_elements(By.CLASS_NAME, "weui-desktop-form__label")
-                for c in check:
-                    if c.text == "群发通知":
-                        inp = c.find_element(By.XPATH, "./following-sibling::div//input")
-                        if inp.is_selected():
-                            inp.find_element(By.XPATH, "./parent::*").click()
-                            break
-                time.sleep(1)
-                # 确定发布
-                footer_element = driver.find_element(
-                    By.CLASS_NAME, "mass-send__footer"
-                ).find_element(By.CLASS_NAME, "weui-desktop-popover__wrp")
-                divs = footer_element.find_elements(By.CLASS_NAME, "weui-desktop-btn_wrp")
-                for d in divs:
-                    if d.text == "发表":
-                        d.find_element(By.TAG_NAME, "button").click()
-                        break
-                time.sleep(1)
-                # 继续发表
-                continue_bnt = driver.find_elements(By.CLASS_NAME, "weui-desktop-btn_wrp")
-                for c in continue_bnt:
-                    if c.text == "继续发表":
-                        c.find_element(By.TAG_NAME, "button").click()
-                        print("发布成功")
-                        out_flag = True
-                        time.sleep(10)
-                        break
-            except:
-                print("没有找到")
-        end_time = time.time()
-        driver.close()
-        driver.quit()
-        if out_flag:
+                    wait.frame("ueditor_0")
+                    content_input = wait.present((By.CLASS_NAME, "autoTypeSetting24psection"))
+                paster.paste_article(wait, content_input, payload.chunks)
+            # 等待上传时不占用剪贴板
+            with trace.span("image_upload", optional=True):
+                wait.images_uploaded(content_input, min(imgs_list_len, 3), timeout=60)
+        finally:
+            driver.switch_to.default_content()
+
+        """封面"""
+        with trace.span("cover_select"):
+            cover_ac = wait.present((By.ID, "js_cover_area"))
+            driver.execute_script("arguments[0].scrollIntoView();", cover_ac)
+            ActionChains(driver).move_to_element(cover_ac).perform()
+            wait.by_text((By.CLASS_NAME, "pop-opr__item"), "从正文选择").click()
+            # 点击第一章图片
+            wait.clickable((By.CLASS_NAME, "appmsg_content_img_item")).click()
+            # 下一步
+            wait.by_text((By.CLASS_NAME, "weui-desktop-btn_wrp"), "下一步").find_element(
+                By.TAG_NAME, "button"
+            ).click()
+            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            wait.by_text((By.CLASS_NAME, "weui-desktop-btn_wrp"), "确认").find_element(
+                By.TAG_NAME, "button"
+            ).click()
+
+        with trace.span("declare", optional=True):
+            print("原创")
+            yc = driver.find_element(By.CLASS_NAME, "js_unset_original_title")
+            if yc.text == "未声明":
+                yc.click()
+                ag = wait.present((By.CLASS_NAME, "original_agreement"))
+                ag.find_element(By.CLASS_NAME, "weui-desktop-form__check-label").find_element(
+                    By.CLASS_NAME, "weui-desktop-icon-checkbox"
+                ).click()
+                wait.by_text((By.CLASS_NAME, "weui-desktop-btn_primary"), "确定").click()
+
+        with trace.span("submit"):
+            # 使用显示等待来等待元素出现
+            wait.click((By.CLASS_NAME, "mass_send"), timeout=30)
+            # 取消群发
+            c = wait.by_text((By.CLASS_NAME, "weui-desktop-form__label"), "群发通知")
+            inp = c.find_element(By.XPATH, "./following-sibling::div//input")
+            if inp.is_selected():
+                inp.find_element(By.XPATH, "./parent::*").click()
+            # 确定发布
+            footer_element = wait.present((By.CLASS_NAME, "mass-send__footer")).find_element(
+                By.CLASS_NAME, "weui-desktop-popover__wrp"
+            )
+            divs = footer_element.find_elements(By.CLASS_NAME, "weui-desktop-btn_wrp")
+            for d in divs:
+                if d.text == "发表":
+                    d.find_element(By.TAG_NAME, "button").click()
+                    break
+            # 继续发表
+            wait.by_text((By.CLASS_NAME, "weui-desktop-btn_wrp"), "继续发表").find_element(
+                By.TAG_NAME, "button"
+            ).click()
+            print("发布成功")
             result["status"] = True
-            break
-        elif end_time - tart_time > time_out:
-            break
-        else:
-            break
 
+        with trace.span("submit_confirm", optional=True):
+            wait.network_idle(timeout=30)
+    except Exception as e:
+        print(f"微信公众号发布失败：{e}")
+        result["msg"] = str(e)
     return result
 
 
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# @File    : api_request_bench.py
+"""
+ApiRequest 后台调用延迟基准
+
+用法（在 pyside 目录下执行）:
+    python benchmarks/api_request_bench.py -n 300
+    python benchmarks/api_request_bench.py -n 300 --url http://127.0.0.1:8001/api --endpoint user/news/
+
+不指定 --url 时在本地启动一个返回固定 JSON 列表的 HTTP/1.1 服务，对比旧实现
+（每次新建连接、每次读取 QSettings、打印完整响应）与当前实现的 p50/p95 延迟。
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests  # noqa: E402
+from PySide6.QtCore import QSettings  # noqa: E402
+
+from api import request_handler  # noqa: E402
+from api.request_handler import ApiRequest  # noqa: E402
+
+
+class FakeBackendHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # 响应头和响应体一次写出，避免 keep-alive 连接上 Nagle 与延迟确认叠加的 40ms 停顿
+    disable_nagle_algorithm = True
+    wbufsize = -1
+    body = json.dumps(
+        {
+            "code": 0,
+            "message": "ok",
+            "result": [{"id": i, "title": f"新闻标题{i}" * 3, "status": 0} for i in range(100)],
+        },
+        ensure_ascii=False,
+    ).encode()
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class LegacyApiRequest:
+    """模拟旧实现：每次请求新建连接、读取 QSettings、打印原始响应"""
+
+    def __init__(self, base_url, timeout=30):
+        self.base_url = base_url
+        self.timeout = timeout
+
+    def get(self, endpoint, params=None):
+        settings = QSettings("AiMedia", "ai-media")
+        token = settings.value("token", None)
+        headers = {"Content-Type": "application/json"}
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        response = requests.get(
+            f"{self.base_url}/{endpoint}", headers=headers, params=params, timeout=self.timeout
+        )
+        print(f"3. 原始响应内容：{response.text}")
+        data = response.json()
+        if data["code"] == 0:
+            return data.get("result")
+        raise Exception(data["message"])
+
+
+def measure(label, count, func):
+    samples = []
+    # 屏蔽响应打印，只计算格式化开销，不受终端输出速度影响
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(count):
+            start = time.perf_counter()
+            func()
+            samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    p50 = statistics.median(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(f"{label:<12} p50 {p50:>7.2f}ms  p95 {p95:>7.2f}ms  总计 {sum(samples):>8.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ApiRequest 延迟基准")
+    parser.add_argument("-n", type=int, default=300, help="每种实现的请求次数")
+    parser.add_argument("--url", help="后台 API 地址，不指定时使用本地模拟服务")
+    parser.add_argument("--endpoint", default="user/news/", help="测试的接口路径")
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.url
+    if not base_url:
+        server = ThreadingHTTPServer(("127.0.0.1", 0), FakeBackendHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    legacy = LegacyApiRequest(base_url)
+    current = ApiRequest()
+    current.base_url = base_url
+    request_handler.invalidate_token()
+
+    measure("旧实现", args.n, lambda: legacy.get(args.endpoint))
+    measure("当前实现", args.n, lambda: current.get(args.endpoint))
+
+    if server:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# @File    : local_data_bench.py
+"""
+LocalData 本地存储微基准
+
+用法（在 pyside 目录下执行）:
+    python benchmarks/local_data_bench.py -n 2000
+
+对比旧实现（DELETE 日志模式、每次调用 SELECT 1 检测连接、每条写入单独提交）
+与当前实现的插入、读取吞吐（次/秒）。
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.local_data import LocalData  # noqa: E402
+
+
+class LegacyLocalData:
+    """模拟旧实现的访问方式"""
+
+    def __init__(self, db_name):
+        self.conn = sqlite3.connect(db_name)
+        self.conn.execute("PRAGMA journal_mode=DELETE")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS account (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                platform TEXT NOT NULL,
+                nickname TEXT NOT NULL,
+                uid TEXT NOT NULL,
+                cookie TEXT,
+                status TEXT DEFAULT "正常",
+                publish_limit INTEGER DEFAULT 0,
+                create_time DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        self.cursor = self.conn.cursor()
+
+    def _get_cursor(self):
+        self.conn.execute("SELECT 1")
+        return self.cursor
+
+    def insert_account(self, platform, nickname, uid, cookie):
+        self._get_cursor().execute("SELECT COUNT(*) FROM account WHERE uid = ?", (uid,))
+        if self._get_cursor().fetchone()[0] == 0:
+            self._get_cursor().execute(
+                "INSERT INTO account (platform, nickname, uid, cookie) VALUES (?, ?, ?, ?)",
+                (platform, nickname, uid, cookie),
+            )
+            self.conn.commit()
+
+    def get_accounts(self, uid):
+        self._get_cursor().execute("SELECT * FROM account WHERE uid = ?", (uid,))
+        return self._get_cursor().fetchall()
+
+
+def measure(label, count, func):
+    # 屏蔽 LocalData 中的提示输出，避免影响计时
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+    print(f"{label:<28}{count / elapsed:>12.0f} 次/秒  ({elapsed * 1000:.1f}ms)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LocalData 微基准")
+    parser.add_argument("-n", type=int, default=2000, help="每项操作的次数")
+    args = parser.parse_args()
+    n = args.n
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = LegacyLocalData(os.path.join(tmp, "legacy.db"))
+        measure(
+            "旧实现 插入账号",
+            n,
+            lambda: [legacy.insert_account("头条号", "nick", f"uid{i}", "[]") for i in range(n)],
+        )
+        measure(
+            "旧实现 按uid读取",
+            n,
+            lambda: [legacy.get_accounts(f"uid{i}") for i in range(n)],
+        )
+        legacy.conn.close()
+
+        local_data = LocalData(os.path.join(tmp, "current.db"))
+        measure(
+            "当前实现 插入账号",
+            n,
+            lambda: [local_data.insert_account("头条号", "nick", f"uid{i}", "[]") for i in range(n)],
+        )
+        measure(
+            "当前实现 按uid读取",
+            n,
+            lambda: [local_data.get_accounts(f"uid{i}") for i in range(n)],
+        )
+        materials = [("标题", "内容" * 200, ["a.jpg", "b.jpg"], "头条号", "1", "nick")] * n
+        measure("当前实现 事务批量插入素材", n, lambda: local_data.insert_materials(materials))
+        measure("当前实现 读取全部素材", n, lambda: local_data.get_materials())
+        local_data.close()
+
+
+if __name__ == "__main__":
+    main()
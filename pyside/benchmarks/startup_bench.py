@@ -0,0 +1,164 @@
+#!/usr/bin/env python
+# @File    : startup_bench.py
+"""
+启动耗时基准
+
+用法（在 pyside 目录下执行）:
+    python benchmarks/startup_bench.py
+    python benchmarks/startup_bench.py -n 5 --top 20
+    python benchmarks/startup_bench.py --url http://127.0.0.1:8001/api
+
+分两部分：
+- 导入耗时：子进程以 -X importtime 导入 views.main_window，汇总总耗时和累计耗时最多的模块
+- 首帧耗时：子进程创建 MainWindow 并显示，从启动进程到窗口第一次绘制的时间（不含登录）。
+  不指定 --url 时在本地启动一个模拟后台，所有接口返回同一条用户/已读通知数据
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 子进程在 MainWindow 第一次收到 Paint 事件时输出 FIRST_PAINT 并退出
+_FIRST_PAINT_SCRIPT = """
+import sys
+from PySide6.QtCore import QEvent, QObject, QTimer
+from PySide6.QtWidgets import QApplication
+
+app = QApplication(sys.argv)
+
+from api import request_handler
+
+request_handler.BASE_URL = sys.argv[1]
+
+from views.main_window import MainWindow
+
+
+class PaintWatcher(QObject):
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint:
+            print("FIRST_PAINT", flush=True)
+            QTimer.singleShot(0, app.quit)
+            obj.removeEventFilter(self)
+        return False
+
+
+window = MainWindow()
+watcher = PaintWatcher()
+window.installEventFilter(watcher)
+window.show()
+sys.exit(app.exec())
+"""
+
+
+class FakeBackendHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    body = json.dumps(
+        {
+            "code": 0,
+            "result": [
+                {"id": 1, "nickname": "bench", "avatar": "", "level": "VIP", "is_read": True},
+            ],
+        }
+    ).encode()
+
+    def _respond(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    do_GET = _respond
+    do_POST = _respond
+
+    def log_message(self, format, *args):
+        pass
+
+
+def import_times(module):
+    """
+    以 -X importtime 导入模块
+
+    Returns:
+        list[tuple[str, int, int]]: (模块名, 自身耗时us, 累计耗时us)
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def first_paint_time(base_url, timeout=60):
+    """启动子进程到 MainWindow 第一次绘制的耗时（秒）"""
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-c", _FIRST_PAINT_SCRIPT, base_url],
+        cwd=ROOT,
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+    )
+    try:
+        for line in proc.stdout:
+            if line.strip() == "FIRST_PAINT":
+                return time.perf_counter() - start
+        raise RuntimeError("窗口未完成绘制")
+    finally:
+        try:
+            proc.wait(timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="启动耗时基准")
+    parser.add_argument("-n", type=int, default=3, help="首帧耗时的测量次数")
+    parser.add_argument("--top", type=int, default=15, help="列出累计耗时最多的模块数")
+    parser.add_argument("--module", default="views.main_window", help="统计导入耗时的模块")
+    parser.add_argument("--url", help="后台 API 地址，不指定时使用本地模拟服务")
+    args = parser.parse_args()
+
+    rows = import_times(args.module)
+    total = next((cumulative for name, _, cumulative in rows if name == args.module), 0)
+    print(f"导入 {args.module}: {total / 1000:.1f} ms，共 {len(rows)} 个模块")
+    print(f"{'累计(ms)':>10} {'自身(ms)':>10}  模块")
+    for name, self_us, cumulative_us in sorted(rows, key=lambda r: -r[2])[: args.top]:
+        print(f"{cumulative_us / 1000:>10.1f} {self_us / 1000:>10.1f}  {name}")
+
+    base_url = args.url
+    if not base_url:
+        server = ThreadingHTTPServer(("127.0.0.1", 0), FakeBackendHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    samples = [first_paint_time(base_url) for _ in range(args.n)]
+    print(
+        f"\n首帧耗时 ({args.n} 次): 中位数 {statistics.median(samples) * 1000:.0f} ms，"
+        f"最小 {min(samples) * 1000:.0f} ms，最大 {max(samples) * 1000:.0f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
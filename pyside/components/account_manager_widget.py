@@ -1,30 +1,23 @@
 from datetime import datetime, timedelta
 
-from PySide6.QtCore import Qt, QThread, Signal
-from PySide6.QtGui import QColor
+from PySide6.QtCore import QThread, Signal
 from PySide6.QtWidgets import (
     QComboBox,
     QDialog,
-    QDialogButtonBox,
     QFrame,
     QHBoxLayout,
     QHeaderView,
     QLabel,
     QLineEdit,
-    QMessageBox,
     QPushButton,
-    QSpinBox,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
     QVBoxLayout,
     QWidget,
 )
 
 from api.api_all import create_account, delete_account, get_account_info, update_account
-from auto_browser.auto_base import AutoTools
-from auto_browser.baijiahao import get_cookie_baijiahao
-from auto_browser.qiehao import get_cookie_qiehao
-from auto_browser.weixin import get_cookie_weixin
+from components.table_models import ButtonDelegate, Column, RecordTableModel
+from services.material_service import MaterialService
 from utils.account_service import AccountService
 from utils.local_data import LocalData
 from utils.message_popup import MessagePopup
@@ -132,6 +125,12 @@ class AddAccountDialog(QDialog):
 
         def run(self):
             """执行耗时操作"""
+            # 延迟导入浏览器自动化模块，打开账号页面时不加载 selenium
+            from auto_browser.auto_base import AutoTools
+            from auto_browser.baijiahao import get_cookie_baijiahao
+            from auto_browser.qiehao import get_cookie_qiehao
+            from auto_browser.weixin import get_cookie_weixin
+
             auto = AutoTools()
             if self.platform == "头条号":
                 nickname, cookie, uid = auto.get_cookies("头条号")
@@ -243,19 +242,56 @@ class AccountManagerWidget(QWidget):
         layout.addWidget(toolbar)
 
         # 账号列表
-        self.table = QTableWidget()
-        self.table.setObjectName("accountTable")
-        self.table.setColumnCount(7)  # 增加一列
-        self.table.setHorizontalHeaderLabels(
-            ["昵称", "UID", "平台", "失效时间", "设置发布量", "账号删除", "数据分析"]
+        self.model = RecordTableModel(
+            [
+                Column("昵称", "nickname"),
+                Column("UID", "uid"),
+                Column("平台", "platform"),
+                Column(
+                    "失效时间",
+                    "is_expired",
+                    color=lambda account: "#E74C3C" if account["is_expired"] else "#2ECC71",
+                ),
+                Column("设置发布量", lambda account: ""),
+                Column("账号删除", lambda account: ""),
+                Column("数据分析", lambda account: ""),
+            ],
+            parent=self,
         )
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)  # 禁用编辑
+        self.table = QTableView()
+        self.table.setObjectName("accountTable")
+        self.table.setModel(self.model)
+        self.table.setEditTriggers(QTableView.NoEditTriggers)  # 禁用编辑
+        self.table.setMouseTracking(True)  # 按钮悬停效果
+
+        # 按钮列由委托绘制，不再为每行创建 QPushButton
+        self.button_delegates = [
+            (
+                4,
+                ButtonDelegate("设置", "#ff9933", "#ff8c1a", size=(80, 28), parent=self.table),
+                self.show_publish_limit_dialog,
+            ),
+            (
+                5,
+                ButtonDelegate("删除", "#E74C3C", "#C0392B", size=(60, 28), parent=self.table),
+                self.delete_account,
+            ),
+            (
+                6,
+                ButtonDelegate("数据", "#3498DB", "#2980B9", size=(60, 28), parent=self.table),
+                self.show_data_analysis,
+            ),
+        ]
+        for column, delegate, handler in self.button_delegates:
+            delegate.clicked.connect(lambda row, h=handler: h(self.model.record(row)))
+            self.table.setItemDelegateForColumn(column, delegate)
 
         # 设置表格样式
         self.table.setShowGrid(False)
         self.table.setAlternatingRowColors(True)
         self.table.verticalHeader().hide()
-        self.table.setSelectionMode(QTableWidget.NoSelection)
+        self.table.verticalHeader().setDefaultSectionSize(50)  # 设置行高
+        self.table.setSelectionMode(QTableView.NoSelection)
 
         # 设置列宽为自适应
         header = self.table.horizontalHeader()
@@ -406,67 +442,22 @@ class AccountManagerWidget(QWidget):
             # cookie = local_data.get_cooke(self.account['uid'])
             cookies = get_account_info(self.account["id"])
             cookie = cookies["cookie"]
+            from auto_browser.auto_base import AutoTools
+
             auto = AutoTools()
             auto.get_acconut_data(cookie, platform)
             self.analysis_completed.emit()  # 发射信号，表示分析完成
 
     def load_data(self):
         """加载账号数据"""
+        # 账号增删后都会走到这里，素材列表的账号缓存需要同步失效
+        MaterialService.invalidate_accounts()
         accounts = self.account_service.get_accounts()
         self.display_accounts(accounts)
 
     def display_accounts(self, accounts):
-        """显示账号列表"""
-        self.table.setRowCount(len(accounts))
-        self.table.verticalHeader().setDefaultSectionSize(50)  # 设置行高
-
-        for row, account in enumerate(accounts):
-            # 昵称
-            nickname_item = QTableWidgetItem(account["nickname"])
-            nickname_item.setTextAlignment(Qt.AlignVCenter)
-            self.table.setItem(row, 0, nickname_item)
-
-            # UID
-            uid_item = QTableWidgetItem(account["uid"])
-            uid_item.setTextAlignment(Qt.AlignVCenter)
-            self.table.setItem(row, 1, uid_item)
-
-            # 平台
-            platform_item = QTableWidgetItem(account["platform"])
-            platform_item.setTextAlignment(Qt.AlignVCenter)
-            self.table.setItem(row, 2, platform_item)
-
-            # 是否过期
-            expired_text = account["is_expired"]
-            expired_item = QTableWidgetItem(expired_text)
-            expired_item.setTextAlignment(Qt.AlignVCenter)
-            expired_item.setForeground(
-                QColor("#E74C3C") if account["is_expired"] else QColor("#2ECC71")
-            )
-            self.table.setItem(row, 3, expired_item)
-
-            # 设置发布量按钮
-            publish_limit_btn = QPushButton("设置")
-            publish_limit_btn.setProperty("type", "setting")  # 添加type属性以应用橙色样式
-            publish_limit_btn.setFixedSize(80, 28)
-            publish_limit_btn.clicked.connect(
-                lambda checked, a=account: self.show_publish_limit_dialog(a)
-            )
-            self.table.setCellWidget(row, 4, publish_limit_btn)
-
-            # 删除按钮
-            delete_btn = QPushButton("删除")
-            delete_btn.setObjectName("deleteBtn")
-            delete_btn.setFixedSize(60, 28)
-            delete_btn.clicked.connect(lambda checked, a=account: self.delete_account(a))
-            self.table.setCellWidget(row, 5, delete_btn)
-
-            # 数据按钮
-            data_btn = QPushButton("数据")
-            data_btn.setObjectName("dataBtn")
-            data_btn.setFixedSize(60, 28)
-            data_btn.clicked.connect(lambda checked, a=account: self.show_data_analysis(a))
-            self.table.setCellWidget(row, 6, data_btn)
+        """显示账号列表，只更新发生变化的行"""
+        self.model.set_records(accounts)
 
     def filter_accounts(self):
         """根据平台筛选账号"""
@@ -593,135 +584,3 @@ class AccountManagerWidget(QWidget):
 
         except ValueError:
             MessagePopup("请输入有效的数字！", parent=self, message_type="warning").show()
-
-    def _init_table(self):
-        self.table.setColumnCount(7)
-        self.table.setHorizontalHeaderLabels(
-            ["昵称", "UID", "平台", "失效时间", "设置发布量", "账号删除", "数据分析"]
-        )
-
-        # 设置各列的宽度
-        header = self.table.horizontalHeader()
-        header.setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)  # 昵称
-        header.setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)  # UID
-        header.setSectionResizeMode(2, QHeaderView.ResizeMode.Fixed)  # 平台
-        header.setFixedWidth(2, 80)  # 平台列固定宽度，减小到80
-        header.setSectionResizeMode(3, QHeaderView.ResizeMode.ResizeToContents)  # 失效时间
-        header.setSectionResizeMode(4, QHeaderView.ResizeMode.Fixed)  # 设置发布量
-        header.setFixedWidth(4, 100)  # 设置发布量列固定宽度
-        header.setSectionResizeMode(5, QHeaderView.ResizeMode.Fixed)  # 账号删除
-        header.setFixedWidth(5, 100)  # 账号删除列固定宽度
-        header.setSectionResizeMode(6, QHeaderView.ResizeMode.Fixed)  # 数据分析
-        header.setFixedWidth(6, 100)  # 数据分析列固定宽度
-
-        # 设置表格样式
-        self.table.setStyleSheet("""
-            QTableWidget {
-                border: none;
-                background-color: white;
-                gridline-color: #f0f0f0;
-            }
-            QTableWidget::item {
-                padding: 5px;
-            }
-            QHeaderView::section {
-                background-color: #f8f9fa;
-                padding: 5px;
-                border: none;
-                border-bottom: 1px solid #dee2e6;
-            }
-        """)
-
-    def _refresh_table(self):
-        self.table.setRowCount(0)
-        accounts = self.account_service.get_accounts()
-
-        button_width = 70  # 统一设置按钮宽度
-        button_spacing = 15  # 统一设置按钮间距
-
-        for account in accounts:
-            row = self.table.rowCount()
-            self.table.insertRow(row)
-
-            nickname_item = QTableWidgetItem(account["nickname"])
-            uid_item = QTableWidgetItem(account["uid"])
-            platform_item = QTableWidgetItem(account["platform"])
-            status_item = QTableWidgetItem(account["status"])
-
-            self.table.setItem(row, 0, nickname_item)
-            self.table.setItem(row, 1, uid_item)
-            self.table.setItem(row, 2, platform_item)
-            self.table.setItem(row, 3, status_item)
-
-            # 设置发布量按钮
-            limit_widget = QWidget()
-            limit_layout = QHBoxLayout(limit_widget)
-            limit_layout.setContentsMargins(button_spacing, 2, button_spacing, 2)
-
-            limit_btn = QPushButton("设置")
-            limit_btn.setProperty("type", "setting")  # 添加type属性以应用橙色样式
-            limit_btn.setFixedWidth(button_width)
-            limit_btn.clicked.connect(lambda checked, r=row: self._set_publish_limit(r))
-
-            limit_layout.addWidget(limit_btn, alignment=Qt.AlignmentFlag.AlignCenter)
-            self.table.setCellWidget(row, 4, limit_widget)
-
-            # 删除按钮
-            delete_widget = QWidget()
-            delete_layout = QHBoxLayout(delete_widget)
-            delete_layout.setContentsMargins(button_spacing, 2, button_spacing, 2)
-
-            delete_btn = QPushButton("删除")
-            delete_btn.setFixedWidth(button_width)
-            delete_btn.clicked.connect(lambda checked, r=row: self._delete_account(r))
-
-            delete_layout.addWidget(delete_btn, alignment=Qt.AlignmentFlag.AlignCenter)
-            self.table.setCellWidget(row, 5, delete_widget)
-
-            # 数据分析按钮
-            analysis_widget = QWidget()
-            analysis_layout = QHBoxLayout(analysis_widget)
-            analysis_layout.setContentsMargins(button_spacing, 2, button_spacing, 2)
-
-            analysis_btn = QPushButton("数据")
-            analysis_btn.setFixedWidth(button_width)
-            analysis_btn.clicked.connect(lambda checked, r=row: self._show_data_analysis(r))
-
-            analysis_layout.addWidget(analysis_btn, alignment=Qt.AlignmentFlag.AlignCenter)
-            self.table.setCellWidget(row, 6, analysis_widget)
-
-    def _set_publish_limit(self, row):
-        """设置账号发布量限制"""
-        uid = self.table.item(row, 1).text()
-        current_limit = self.account_service.get_publish_limit(uid)
-
-        dialog = QDialog(self)
-        dialog.setWindowTitle("设置发布量限制")
-        layout = QVBoxLayout(dialog)
-
-        # 创建输入框和标签
-        input_layout = QHBoxLayout()
-        label = QLabel("每日发布量限制:")
-        input_box = QSpinBox()
-        input_box.setMinimum(0)
-        input_box.setMaximum(999999)
-        input_box.setValue(current_limit)
-
-        input_layout.addWidget(label)
-        input_layout.addWidget(input_box)
-        layout.addLayout(input_layout)
-
-        # 创建按钮
-        button_box = QDialogButtonBox(
-            QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel
-        )
-        button_box.accepted.connect(dialog.accept)
-        button_box.rejected.connect(dialog.reject)
-        layout.addWidget(button_box)
-
-        if dialog.exec() == QDialog.DialogCode.Accepted:
-            new_limit = input_box.value()
-            if self.account_service.update_publish_limit(uid, new_limit):
-                self._refresh_table()
-            else:
-                QMessageBox.warning(self, "错误", "更新发布量限制失败")
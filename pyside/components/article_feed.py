@@ -0,0 +1,195 @@
+from PySide6.QtCore import QAbstractListModel, QEvent, QModelIndex, QRect, QSize, Qt, Signal
+from PySide6.QtGui import QColor, QFont, QPainter, QPen
+from PySide6.QtWidgets import QStyle, QStyledItemDelegate
+
+ARTICLE_ROLE = Qt.UserRole + 1
+
+CARD_HEIGHT = 90
+CARD_SPACING = 10
+
+
+class TitleIndex:
+    """
+    标题过滤索引
+
+    按字符建立倒排表，查询时先取查询词中出现次数最少的字符对应的候选行，再做子串校验；
+    连续输入时新查询以上一次查询开头，直接在上一次的结果中继续过滤
+    """
+
+    def __init__(self, titles=()):
+        self.build(titles)
+
+    def build(self, titles):
+        self._titles = [title.lower() for title in titles]
+        self._postings = {}
+        for row, title in enumerate(self._titles):
+            for char in set(title):
+                self._postings.setdefault(char, []).append(row)
+        self._last_query = ""
+        self._last_rows = list(range(len(self._titles)))
+
+    def search(self, query):
+        """返回标题包含 query 的行号（保持原顺序）"""
+        query = query.strip().lower()
+        if not query:
+            rows = list(range(len(self._titles)))
+        elif self._last_query and query.startswith(self._last_query):
+            rows = [row for row in self._last_rows if query in self._titles[row]]
+        else:
+            postings = [self._postings.get(char, []) for char in set(query)]
+            candidates = min(postings, key=len)
+            rows = [row for row in candidates if query in self._titles[row]]
+        self._last_query, self._last_rows = query, rows
+        return rows
+
+
+class ArticleListModel(QAbstractListModel):
+    """热点文章列表模型，过滤在模型内通过 TitleIndex 完成"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._articles = []
+        self._rows = []
+        self._index = TitleIndex()
+        self._query = ""
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        article = self._articles[self._rows[index.row()]]
+        if role == Qt.DisplayRole:
+            return article["title"]
+        if role == ARTICLE_ROLE:
+            return article
+        return None
+
+    def article(self, row):
+        return self._articles[self._rows[row]]
+
+    def set_articles(self, articles):
+        """替换文章列表，保留当前过滤条件"""
+        self.beginResetModel()
+        self._articles = articles
+        self._index.build(article["title"] for article in articles)
+        self._rows = self._index.search(self._query)
+        self.endResetModel()
+
+    def set_filter(self, query):
+        self.beginResetModel()
+        self._query = query
+        self._rows = self._index.search(query)
+        self.endResetModel()
+
+    def refresh(self, article):
+        """文章配置状态变化后只重绘对应的行"""
+        for row, article_row in enumerate(self._rows):
+            if self._articles[article_row] is article:
+                index = self.index(row)
+                self.dataChanged.emit(index, index)
+                return
+
+
+class ArticleCardDelegate(QStyledItemDelegate):
+    """绘制文章卡片（标题、来源信息、查看/配置按钮），不为每篇文章创建控件"""
+
+    view_clicked = Signal(int)
+    config_clicked = Signal(int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.title_font = QFont()
+        self.title_font.setPixelSize(14)
+        self.title_font.setBold(True)
+        self.meta_font = QFont()
+        self.meta_font.setPixelSize(12)
+        self.button_font = QFont()
+        self.button_font.setPixelSize(13)
+
+    def sizeHint(self, option, index):
+        return QSize(400, CARD_HEIGHT + CARD_SPACING)
+
+    @staticmethod
+    def _card_rect(rect):
+        return QRect(rect.left(), rect.top(), rect.width(), CARD_HEIGHT)
+
+    def _button_rects(self, rect):
+        card = self._card_rect(rect)
+        top = card.top() + (CARD_HEIGHT - 30) // 2
+        config_rect = QRect(card.right() - 15 - 85, top, 85, 30)
+        view_rect = QRect(config_rect.left() - 8 - 70, top, 70, 30)
+        return view_rect, config_rect
+
+    @staticmethod
+    def _config_button(article):
+        """配置按钮的文字和颜色"""
+        if article.get("configured_account"):
+            return "取消配置", "#E74C3C"
+        if article.get("configured_other"):
+            return "他人已用", "#E74C3C"
+        return "开始配置", "#E67E22"
+
+    def paint(self, painter, option, index):
+        article = index.data(ARTICLE_ROLE)
+        card = self._card_rect(option.rect)
+        view_rect, config_rect = self._button_rects(option.rect)
+        hovered = bool(option.state & QStyle.State_MouseOver)
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        # 卡片背景
+        painter.setPen(QPen(QColor("#2ECC71" if hovered else "#dddddd"), 1))
+        painter.setBrush(QColor("white"))
+        painter.drawRoundedRect(card.adjusted(0, 0, -1, -1), 6, 6)
+
+        # 标题，最多两行
+        text_rect = QRect(
+            card.left() + 15, card.top() + 12, view_rect.left() - 15 - card.left() - 15, 40
+        )
+        painter.setPen(QColor("#333333"))
+        painter.setFont(self.title_font)
+        painter.drawText(
+            text_rect, Qt.AlignLeft | Qt.AlignVCenter | Qt.TextWordWrap, article["title"]
+        )
+
+        # 平台、分类、时间
+        meta_rect = QRect(text_rect.left(), text_rect.bottom() + 5, text_rect.width(), 20)
+        painter.setPen(QColor("#666666"))
+        painter.setFont(self.meta_font)
+        meta_text = f"{article['platform']} · {article['category']} · {article['time']}"
+        painter.drawText(
+            meta_rect,
+            Qt.AlignLeft | Qt.AlignVCenter,
+            painter.fontMetrics().elidedText(meta_text, Qt.ElideRight, meta_rect.width()),
+        )
+
+        # 按钮
+        config_text, config_color = self._config_button(article)
+        painter.setFont(self.button_font)
+        for rect, text, color in (
+            (view_rect, "查看", "#2ECC71"),
+            (config_rect, config_text, config_color),
+        ):
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor(color))
+            painter.drawRoundedRect(rect, 4, 4)
+            painter.setPen(QColor("white"))
+            painter.drawText(rect, Qt.AlignCenter, text)
+
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() != QEvent.MouseButtonRelease or event.button() != Qt.LeftButton:
+            return False
+        view_rect, config_rect = self._button_rects(option.rect)
+        position = event.position().toPoint()
+        if view_rect.contains(position):
+            self.view_clicked.emit(index.row())
+            return True
+        if config_rect.contains(position):
+            self.config_clicked.emit(index.row())
+            return True
+        return False
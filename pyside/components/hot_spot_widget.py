@@ -1,15 +1,17 @@
 from PySide6.QtWidgets import (
+    QApplication,
     QComboBox,
-    QFrame,
     QHBoxLayout,
     QLabel,
+    QLineEdit,
+    QListView,
     QPushButton,
-    QScrollArea,
     QVBoxLayout,
     QWidget,
 )
 
-from api.api_all import create_news, delete_news, get_news_list
+from api.api_all import create_news, delete_news
+from components.article_feed import ArticleCardDelegate, ArticleListModel
 from crawlers.ithome import ITHome
 from crawlers.pengpai import pengpai  # 导入pengpai模块
 from crawlers.souhu import SouHu  # 导入搜狐新闻爬虫
@@ -18,10 +20,12 @@ from crawlers.tengxuxinwen import TenXuNews  # 导入腾讯新闻爬虫
 from crawlers.wangyi import wangyi  # 导入wangyi模块
 from crawlers.xinlang import XinLangGuoJi
 from crawlers.zhongguoribao import ChineseDayNews  # 导入中国日报爬虫
+from threads.hot_spot_loader import HotSpotLoader
 from utils.account_service import AccountService
 from utils.article_service import ArticleService
 from utils.hot_spot_service import HotSpotService
 from utils.message_popup import MessagePopup
+from utils.news_sync import get_news_sync
 from views.account_dialog import AccountDialog
 from views.article_dialog import ArticleDialog
 
@@ -44,6 +48,25 @@ class HotSpotWidget(QWidget):
         self.tengxuntiyu_crawler = TenXun()  # 初始化腾讯体育爬虫
         self.xinlangguoji = XinLangGuoJi()
         self.it_honme = ITHome()
+        self.crawlers = {
+            "网易新闻": self.wangyi_crawler,
+            "中国日报": self.zhiguoribao_crawler,
+            "澎湃新闻": self.pengpai_crawler,
+            "搜狐新闻": self.souhu_crawler,
+            "腾讯新闻": self.tengxunxinwen_crawler,
+            "腾讯体育": self.tengxuntiyu_crawler,
+            "新浪国际": self.xinlangguoji,
+            "IT之家": self.it_honme,
+        }
+        self.articles = []
+        # (平台, 分类代码) -> 上次加载的文章列表，切换回来时先展示缓存
+        self.article_cache = {}
+        self.loading = None  # 正在加载的 (平台, 分类, 分类代码)
+        self.loader = HotSpotLoader()
+        self.loader.signals.loaded.connect(self.on_articles_loaded)
+        self.loader.signals.failed.connect(self.on_load_failed)
+        # 退出时放弃未完成的加载并等待线程池中的任务结束
+        QApplication.instance().aboutToQuit.connect(self.loader.shutdown)
         self.init_ui()
         self.update_categories()  # 初始化分类
         # self.load_data()
@@ -55,14 +78,6 @@ class HotSpotWidget(QWidget):
             QWidget {
                 background: transparent;
             }
-            QFrame#newsCard {
-                background: white;
-                border: 1px solid #ddd;
-                border-radius: 6px;
-            }
-            QFrame#newsCard:hover {
-                border-color: #2ECC71;
-            }
             QComboBox {
                 border: 1px solid #ddd;
                 border-radius: 4px;
@@ -85,24 +100,18 @@ class HotSpotWidget(QWidget):
             QPushButton#viewBtn {
                 background-color: #2ECC71;
             }
-            QPushButton#configBtn {
-                background-color: #E67E22;
-            }
-            QPushButton#configBtn:hover {
-                background-color: #D35400;
-            }
-            QPushButton#cancelBtn {
-                background-color: #E74C3C;
+            QLineEdit {
+                border: 1px solid #ddd;
+                border-radius: 4px;
+                padding: 5px 10px;
+                background: white;
             }
-            QPushButton#cancelBtn:hover {
-                background-color: #C0392B;
+            QLineEdit:focus {
+                border-color: #2ECC71;
             }
-            QLabel#titleLabel {
-                font-weight: bold;
-                font-size: 14px;
-                color: #333;
-                background: transparent;
+            QListView {
                 border: none;
+                background: transparent;
             }
             QLabel#metaLabel {
                 color: #666;
@@ -149,21 +158,37 @@ class HotSpotWidget(QWidget):
         refresh_btn.clicked.connect(self.load_data)
         toolbar.addWidget(refresh_btn)
 
+        # 加载状态
+        self.status_label = QLabel()
+        self.status_label.setObjectName("metaLabel")
+        toolbar.addWidget(self.status_label)
+
         toolbar.addStretch()
-        layout.addLayout(toolbar)
 
-        # 滚动区域
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setStyleSheet("QScrollArea { border: none; background: transparent; }")
-        layout.addWidget(scroll)
+        # 标题搜索
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("搜索标题")
+        self.search_input.setFixedWidth(200)
+        self.search_input.textChanged.connect(self.filter_articles)
+        toolbar.addWidget(self.search_input)
 
-        # 内容容器
-        self.content_widget = QWidget()
-        self.content_layout = QVBoxLayout()
-        self.content_layout.setSpacing(10)
-        self.content_widget.setLayout(self.content_layout)
-        scroll.setWidget(self.content_widget)
+        layout.addLayout(toolbar)
+
+        # 文章列表，卡片由委托绘制，滚动时只绘制可见的行
+        self.article_model = ArticleListModel(self)
+        self.article_view = QListView()
+        self.article_view.setModel(self.article_model)
+        self.article_view.setUniformItemSizes(True)
+        self.article_view.setMouseTracking(True)  # 卡片悬停效果
+        self.article_view.setSelectionMode(QListView.NoSelection)
+        self.article_view.setVerticalScrollMode(QListView.ScrollPerPixel)
+        self.article_delegate = ArticleCardDelegate(self.article_view)
+        self.article_delegate.view_clicked.connect(
+            lambda row: self.show_article(self.article_model.article(row))
+        )
+        self.article_delegate.config_clicked.connect(self.on_config_clicked)
+        self.article_view.setItemDelegate(self.article_delegate)
+        layout.addWidget(self.article_view)
 
     def on_platform_changed(self, platform_name):
         """平台变更处理"""
@@ -210,204 +235,90 @@ class HotSpotWidget(QWidget):
                             self.load_data()
                             break
 
-    def create_article_card(self, article):
-        """创建文章卡片"""
-        card = QFrame()
-        card.setObjectName("newsCard")
-        card.setFixedHeight(90)
-        card.setMinimumWidth(400)
-        card_layout = QHBoxLayout()
-        card_layout.setContentsMargins(15, 12, 15, 12)
-        card.setLayout(card_layout)
-
-        # 文章信息
-        info_layout = QVBoxLayout()
-        info_layout.setSpacing(5)
-        info_layout.setContentsMargins(0, 0, 0, 0)
-
-        # 标题
-        title = QLabel(article["title"])
-        title.setObjectName("titleLabel")
-        title.setWordWrap(True)
-        title.setFixedHeight(40)
-        info_layout.addWidget(title)
-
-        # 平台、分类、时间和配置状态
-        meta_text = f"{article['platform']} · {article['category']} · {article['time']}"
-        # if article.get("configured_account"):
-        #     meta_text += f" · 已配置: {article['configured_account']['nickname']}"
-        meta = QLabel(meta_text)
-        meta.setObjectName("metaLabel")
-        meta.setFixedHeight(20)
-        info_layout.addWidget(meta)
-
-        card_layout.addLayout(info_layout, stretch=1)
-
-        # 按钮组
-        btn_layout = QHBoxLayout()
-        btn_layout.setSpacing(8)
-        btn_layout.setContentsMargins(0, 0, 0, 0)
-
-        # 查看按钮
-        view_btn = QPushButton("查看")
-        view_btn.setObjectName("viewBtn")
-        view_btn.setFixedSize(70, 30)
-        view_btn.clicked.connect(lambda checked, a=article: self.show_article(a))
-        btn_layout.addWidget(view_btn)
-
-        # 配置/取消配置按钮
-        if article.get("configured_account"):
-            config_btn = QPushButton("取消配置")
-            config_btn.setObjectName("cancelBtn")
-            config_btn.setFixedSize(85, 30)  # 增加宽度以适应文字
-        elif article.get("configured_other"):
-            config_btn = QPushButton("他人已用")
-            config_btn.setObjectName("cancelBtn")
-            config_btn.setFixedSize(85, 30)  # 增加宽度以适应文字
-        else:
-            config_btn = QPushButton("开始配置")
-            config_btn.setObjectName("configBtn")
-            config_btn.setFixedSize(85, 30)
-
-        config_btn.clicked.connect(
-            lambda checked, a=article: self.cancel_account_config(a)
-            if a.get("configured_account")
-            else self.show_account_selector(a)
-        )
-        btn_layout.addWidget(config_btn)
-
-        card_layout.addLayout(btn_layout)
-        return card
-
     def load_data(self):
-        """加载数据"""
+        """加载数据，抓取在线程池中执行，有缓存时先展示缓存"""
         if not self.current_platform or not self.current_category:
             return
 
         print(f"正在加载数据... 平台：{self.current_platform}, 分类：{self.current_category}")
 
-        # 清除现有内容
-        for i in reversed(range(self.content_layout.count())):
-            item = self.content_layout.itemAt(i)
-            if item and item.widget():
-                item.widget().deleteLater()
-            self.content_layout.takeAt(i)
+        cached = self.article_cache.get((self.current_platform, self.current_category_code))
+        self.show_articles(cached or [])
 
-        if self.current_platform == "网易新闻":
-            try:
-                articles = self.wangyi_crawler.get_news_list(self.current_category_code)
-            except Exception as e:
-                print(f"获取网易新闻数据失败：{str(e)}")
-                articles = []
-        elif self.current_platform == "澎湃新闻":
-            try:
-                articles = self.pengpai_crawler.get_news_list(self.current_category_code)
-            except Exception as e:
-                print(f"获取澎湃新闻数据失败：{str(e)}")
-                articles = []
-        elif self.current_platform == "中国日报":
-            try:
-                articles = self.zhiguoribao_crawler.get_news_list(self.current_category_code)
-            except Exception as e:
-                print(f"获取中国日报数据失败：{str(e)}")
-                articles = []
-        elif self.current_platform == "腾讯新闻":
-            try:
-                articles = self.tengxunxinwen_crawler.get_news_list(self.current_category_code)
-            except Exception as e:
-                print(f"获取腾讯新闻数据失败：{str(e)}")
-                articles = []
-        elif self.current_platform == "搜狐新闻":
-            try:
-                articles = self.souhu_crawler.get_news_list(self.current_category_code)
-            except Exception as e:
-                print(f"获取搜狐新闻数据失败：{str(e)}")
-                articles = []
-        elif self.current_platform == "腾讯体育":
-            try:
-                articles = self.tengxuntiyu_crawler.get_news_list(self.current_category_code)
-            except Exception as e:
-                print(f"获取腾讯体育数据失败：{str(e)}")
-                articles = []
-        elif self.current_platform == "新浪国际":
-            try:
-                articles = self.xinlangguoji.get_news_list(self.current_category_code)
-            except Exception as e:
-                print(f"获取新浪国际数据失败：{str(e)}")
-                articles = []
-        elif self.current_platform == "IT之家":
-            try:
-                articles = self.it_honme.get_news_list(self.current_category_code)
-            except Exception as e:
-                print(f"获取新浪国际数据失败：{str(e)}")
-                articles = []
-        else:
+        crawler = self.crawlers.get(self.current_platform)
+        if crawler is None:
             # 其他平台暂时使用模拟数据
-            articles = HotSpotService.get_mock_data()
+            self.loader.cancel()
+            self.loading = None
+            self.status_label.clear()
+            self.show_articles(
+                self.format_articles(
+                    HotSpotService.get_mock_data(), self.current_platform, self.current_category, {}
+                )
+            )
+            return
+
+        self.loading = (self.current_platform, self.current_category, self.current_category_code)
+        self.status_label.setText("正在刷新..." if cached else "正在加载...")
+        self.loader.load(crawler, self.current_category_code)
+
+    def on_articles_loaded(self, request_id, articles, configured):
+        """后台加载完成，过期请求的结果直接丢弃"""
+        if self.loader.is_stale(request_id) or self.loading is None:
+            return
+        platform, category, category_code = self.loading
+        self.loading = None
+        self.status_label.clear()
+        formatted_articles = self.format_articles(articles, platform, category, configured)
+        self.article_cache[(platform, category_code)] = formatted_articles
+        self.show_articles(formatted_articles)
+
+    def on_load_failed(self, request_id, message):
+        """后台加载失败，保留当前展示的缓存"""
+        if self.loader.is_stale(request_id) or self.loading is None:
+            return
+        print(f"{self.loading[0]} {message}")
+        self.loading = None
+        self.status_label.setText("加载失败")
+
+    @staticmethod
+    def format_articles(articles, platform, category, configured):
+        """转换数据格式以适配文章卡片
+        Args:
+            configured: 后台已配置任务的 标题 -> 任务ID
+        """
         formatted_articles = []
-        # 转换数据格式以适配现有的display_articles方法
-        all_news = get_news_list()
-        title_list = [item["title"] for item in all_news]
-        id_list = [item["id"] for item in all_news]
         for article in articles:
-            if article["title"] in title_list:
-                idx = title_list.index(article["title"])
-                formatted_article = {
-                    "title": article["title"],
-                    "platform": self.current_platform,
-                    "category": self.current_category,
-                    "time": article["date_str"],
-                    "raw_data": article,  # 保存原始数据，用于后续获取详情
-                    "configured_account": {"account_id": id_list[idx]},
-                }
-            else:
-                formatted_article = {
-                    "title": article["title"],
-                    "platform": self.current_platform,
-                    "category": self.current_category,
-                    "time": article["date_str"],
-                    "raw_data": article,  # 保存原始数据，用于后续获取详情
+            formatted_article = {
+                "title": article["title"],
+                "platform": platform,
+                "category": category,
+                "time": article["date_str"],
+                "raw_data": article,  # 保存原始数据，用于后续获取详情
+            }
+            if article["title"] in configured:
+                formatted_article["configured_account"] = {
+                    "account_id": configured[article["title"]]
                 }
             formatted_articles.append(formatted_article)
+        return formatted_articles
 
-        self.articles = formatted_articles
-        self.display_articles(self.articles)
-
-    def display_articles(self, articles):
-        """显示文章列表"""
-        for article in articles:
-            card = self.create_article_card(article)
-            self.content_layout.addWidget(card)
-
-    def filter_articles(self, _):
-        """根据平台和分类筛选文章"""
-        platform = self.platform_combo.currentText()
-        category = self.category_combo.currentText()
+    def show_articles(self, articles):
+        """替换当前文章列表并刷新显示"""
+        self.articles = articles
+        self.article_model.set_articles(articles)
 
-        filtered = [a for a in self.articles if a["platform"] == platform]
+    def filter_articles(self, text):
+        """按标题过滤文章"""
+        self.article_model.set_filter(text)
 
-        # 分类筛选
-        if category != "全部":
-            filtered = [a for a in filtered if a["category"] == category]
-
-        # 清除现有内容并重新显示筛选后的文章
-        self.display_filtered_articles(filtered)
-
-    def display_filtered_articles(self, articles):
-        """显示筛选后的文章列表"""
-        # 清除现有内容
-        while self.content_layout.count():
-            item = self.content_layout.takeAt(0)
-            if item and item.widget():
-                item.widget().deleteLater()
-
-        # 显示筛选后的文章
-        for article in articles:
-            card = self.create_article_card(article)
-            self.content_layout.addWidget(card)
-
-        # 添加底部弹性空间
-        self.content_layout.addStretch()
+    def on_config_clicked(self, row):
+        """配置/取消配置按钮"""
+        article = self.article_model.article(row)
+        if article.get("configured_account"):
+            self.cancel_account_config(article)
+        else:
+            self.show_account_selector(article)
 
     def show_article(self, article):
         """显示文章详情"""
@@ -638,7 +549,7 @@ class HotSpotWidget(QWidget):
                 if res.get("id"):
                     account["account_id"] = res["id"]
                     article["configured_account"] = account
-                    self.display_filtered_articles(self.articles)
+                    self.article_model.refresh(article)
                     popup = MessagePopup(f"已成功配置账号: {account['nickname']}", parent=self)
                     popup.show()
             except Exception as e:
@@ -670,7 +581,11 @@ class HotSpotWidget(QWidget):
 
     def cancel_account_config(self, article):
         """取消文章的账号配置"""
-        delete_news(article["configured_account"]["account_id"])
+        # configured_account 中的 account_id 为任务（新闻）ID
+        news_id = article["configured_account"]["account_id"]
+        delete_news(news_id)
+        # since= 同步不会返回已删除的任务，需要从本地镜像中移除
+        get_news_sync().remove(news_id)
         article.pop("configured_account", None)
         # 刷新显示
-        self.display_filtered_articles(self.articles)
+        self.article_model.refresh(article)
@@ -1,7 +1,6 @@
 from datetime import datetime
 
 from PySide6.QtCore import Qt
-from PySide6.QtGui import QColor
 from PySide6.QtWidgets import (
     QComboBox,
     QDialog,
@@ -11,14 +10,14 @@ from PySide6.QtWidgets import (
     QLabel,
     QMessageBox,
     QPushButton,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
     QTextEdit,
     QVBoxLayout,
     QWidget,
 )
 
 from components.material_import_dialog import MaterialImportDialog
+from components.table_models import ButtonDelegate, Column, RecordTableModel
 from services.material_service import MaterialService
 from threads.material_thread import MaterialThread
 from utils.message_popup import MessagePopup
@@ -155,12 +154,14 @@ class MaterialImportWidget(QWidget):
 
     # 添加状态映射
     status_map = {-1: "全部", 0: "已配置", 1: "已生成", 2: "已发布", 3: "已失败"}
+    page_size = 50
 
     def __init__(self):
         super().__init__()
         self.material_service = MaterialService()
         self.production_window = None
         self.current_status = -1  # 添加当前状态过滤
+        self.current_page = 1
         self.init_ui()
         self.load_data()
 
@@ -218,19 +219,44 @@ class MaterialImportWidget(QWidget):
         layout.addWidget(toolbar)
 
         # 素材列表
-        self.table = QTableWidget()
+        status_names = {0: "已配置", 1: "已生成", 2: "已发布", 3: "已失败"}
+        status_colors = {0: "#3498DB", 1: "#F1C40F", 2: "#27AE60", 3: "#E74C3C"}
+        self.model = RecordTableModel(
+            [
+                Column("昵称", "nickname"),
+                Column("标题", "title"),
+                Column("上传时间", "upload_time"),
+                Column("平台", "platform", color=lambda data: "#2475A8"),
+                Column(
+                    "任务进度",
+                    lambda data: status_names.get(data["status"], "未知"),
+                    color=lambda data: status_colors.get(data["status"], "#666666"),
+                ),
+                # 只有在"已配置"状态下才能删除
+                Column("操作", lambda data: "", enabled=lambda data: data["status"] == 0),
+            ],
+            parent=self,
+        )
+        self.table = QTableView()
         self.table.setObjectName("materialTable")
-        self.table.setColumnCount(6)
-        self.table.setHorizontalHeaderLabels(
-            ["昵称", "标题", "上传时间", "平台", "任务进度", "操作"]
+        self.table.setModel(self.model)
+        self.table.setEditTriggers(QTableView.NoEditTriggers)
+        self.table.setMouseTracking(True)  # 按钮悬停效果
+
+        self.delete_delegate = ButtonDelegate(
+            "删除", "#FF8C9C", "#FF9FAD", disabled_color="#CCCCCC", parent=self.table
+        )
+        self.delete_delegate.clicked.connect(
+            lambda row: self.delete_material(self.model.record(row)["id"])
         )
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setItemDelegateForColumn(5, self.delete_delegate)
 
         # 设置表格样式
         self.table.setShowGrid(False)
         self.table.setAlternatingRowColors(True)
         self.table.verticalHeader().hide()
-        self.table.setSelectionMode(QTableWidget.NoSelection)
+        self.table.verticalHeader().setDefaultSectionSize(50)  # 设置行高
+        self.table.setSelectionMode(QTableView.NoSelection)
 
         # 设置列宽
         header = self.table.horizontalHeader()
@@ -249,6 +275,24 @@ class MaterialImportWidget(QWidget):
 
         layout.addWidget(self.table)
 
+        # 分页栏
+        pager_layout = QHBoxLayout()
+        pager_layout.addStretch()
+        self.prev_btn = QPushButton("上一页")
+        self.prev_btn.setObjectName("pageBtn")
+        self.prev_btn.setFixedSize(80, 28)
+        self.prev_btn.clicked.connect(lambda: self._change_page(-1))
+        pager_layout.addWidget(self.prev_btn)
+        self.page_label = QLabel()
+        self.page_label.setObjectName("pageLabel")
+        pager_layout.addWidget(self.page_label)
+        self.next_btn = QPushButton("下一页")
+        self.next_btn.setObjectName("pageBtn")
+        self.next_btn.setFixedSize(80, 28)
+        self.next_btn.clicked.connect(lambda: self._change_page(1))
+        pager_layout.addWidget(self.next_btn)
+        layout.addLayout(pager_layout)
+
         # 设置样式
         self.setStyleSheet("""
             QWidget {
@@ -350,91 +394,48 @@ class MaterialImportWidget(QWidget):
                 font-weight: bold;
             }
             
-            QPushButton#deleteBtn {
-                background-color: #FF8C9C;
-                color: white;
-                border: none;
+            QPushButton#pageBtn {
+                background-color: white;
+                border: 1px solid #dcdcdc;
                 border-radius: 4px;
-                padding: 4px 12px;
-                font-size: 12px;
-            }
-            
-            QPushButton#deleteBtn:hover {
-                background-color: #FF9FAD;
             }
-            
-            QPushButton#deleteBtn:pressed {
-                background-color: #FF7C8C;
+
+            QPushButton#pageBtn:disabled {
+                color: #CCCCCC;
             }
-            
-            QPushButton#deleteBtn:disabled {
-                background-color: #CCCCCC;
+
+            #pageLabel {
                 color: #666666;
+                padding: 0 10px;
             }
         """)
 
     def _on_status_changed(self):
         """状态筛选变化时的处理函数"""
         self.current_status = self.status_combo.currentData()
+        self.current_page = 1
+        self.load_data()
+
+    def _change_page(self, step):
+        """翻页"""
+        self.current_page += step
         self.load_data()
 
     def load_data(self):
         """加载素材数据"""
-        # 根据当前选择的状态获取材料列表
+        # 根据当前选择的状态获取材料列表，过滤和分页都在 SQL 中完成
         status = None if self.current_status == -1 else self.current_status
-        material_list = self.material_service.get_material_list(status)
-
-        # 清空表格
-        self.table.setRowCount(0)
-
-        # 填充数据
-        for row, data in enumerate(material_list):
-            self.table.insertRow(row)
-            self.table.verticalHeader().setDefaultSectionSize(50)  # 设置行高
-
-            # 昵称
-            nickname_item = QTableWidgetItem(data["nickname"])
-            nickname_item.setTextAlignment(Qt.AlignVCenter)
-            self.table.setItem(row, 0, nickname_item)
-
-            # 标题
-            title_item = QTableWidgetItem(data["title"])
-            title_item.setTextAlignment(Qt.AlignVCenter)
-            self.table.setItem(row, 1, title_item)
-
-            # 上传时间
-            time_item = QTableWidgetItem(data["upload_time"])
-            time_item.setTextAlignment(Qt.AlignVCenter)
-            self.table.setItem(row, 2, time_item)
-
-            # 平台
-            platform_item = QTableWidgetItem(data["platform"])
-            platform_item.setTextAlignment(Qt.AlignVCenter)
-            platform_item.setForeground(QColor("#2475A8"))  # 设置平台文字为蓝色
-            self.table.setItem(row, 3, platform_item)
-
-            # 任务进度
-            status_map = {0: "已配置", 1: "已生成", 2: "已发布", 3: "已失败"}
-            status_colors = {
-                "已配置": "#3498DB",
-                "已生成": "#F1C40F",
-                "已发布": "#27AE60",
-                "已失败": "#E74C3C",
-            }
-            status = status_map.get(data["status"], "未知")
-            status_item = QTableWidgetItem(status)
-            status_item.setTextAlignment(Qt.AlignVCenter)
-            status_item.setForeground(QColor(status_colors.get(status, "#666666")))
-            self.table.setItem(row, 4, status_item)
-
-            # 操作按钮
-            delete_btn = QPushButton("删除")
-            delete_btn.setObjectName("deleteBtn")
-            delete_btn.setFixedSize(60, 24)
-            delete_btn.clicked.connect(lambda checked, id=data["id"]: self.delete_material(id))
-            # 只有在"已配置"状态下才能删除
-            delete_btn.setEnabled(data["status"] == 0)
-            self.table.setCellWidget(row, 5, delete_btn)
+        total = self.material_service.count_materials(status)
+        page_count = max(1, (total + self.page_size - 1) // self.page_size)
+        self.current_page = min(max(self.current_page, 1), page_count)
+        material_list = self.material_service.get_material_list(
+            status, page=self.current_page, page_size=self.page_size
+        )
+        self.page_label.setText(f"第 {self.current_page}/{page_count} 页，共 {total} 条")
+        self.prev_btn.setEnabled(self.current_page > 1)
+        self.next_btn.setEnabled(self.current_page < page_count)
+
+        self.model.set_records(material_list)
 
     def delete_material(self, material_id):
         """删除素材"""
@@ -0,0 +1,230 @@
+from PySide6.QtCore import (
+    QAbstractTableModel,
+    QEvent,
+    QModelIndex,
+    QRect,
+    Qt,
+    Signal,
+)
+from PySide6.QtGui import QColor, QPainter
+from PySide6.QtWidgets import QStyle, QStyledItemDelegate
+
+# 按钮列是否可点击
+ENABLED_ROLE = Qt.UserRole + 1
+
+
+class Column:
+    """表格列定义
+    Args:
+        title: 表头
+        text: 记录 -> 显示文本，字符串时按字段名取值
+        color: 记录 -> 文字颜色，可选
+        enabled: 记录 -> 按钮是否可用，仅按钮列使用
+    """
+
+    def __init__(self, title, text, color=None, enabled=None):
+        self.title = title
+        self.text = (lambda record: record.get(text, "")) if isinstance(text, str) else text
+        self.color = color
+        self.enabled = enabled or (lambda record: True)
+
+
+class RecordTableModel(QAbstractTableModel):
+    """
+    基于字典列表的表格模型
+
+    - set_records 按主键对比新旧数据，只对增删的行发出 insert/remove，对内容变化的行发出 dataChanged
+    - 行数较多时按批次通过 canFetchMore/fetchMore 暴露给视图，滚动到底部时再加载下一批
+    """
+
+    batch_size = 200
+
+    def __init__(self, columns, key="id", parent=None):
+        super().__init__(parent)
+        self._columns = columns
+        self._key = key
+        self._records = []
+        self._loaded = 0
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._loaded
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._columns)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self._columns[section].title
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        record = self._records[index.row()]
+        column = self._columns[index.column()]
+        if role == Qt.DisplayRole:
+            value = column.text(record)
+            return "" if value is None else str(value)
+        if role == Qt.ForegroundRole and column.color:
+            return QColor(column.color(record))
+        if role == Qt.TextAlignmentRole:
+            return int(Qt.AlignLeft | Qt.AlignVCenter)
+        if role == ENABLED_ROLE:
+            return column.enabled(record)
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._loaded < len(self._records)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        count = min(self.batch_size, len(self._records) - self._loaded)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._loaded, self._loaded + count - 1)
+        self._loaded += count
+        self.endInsertRows()
+
+    def record(self, row):
+        return self._records[row]
+
+    def records(self):
+        return self._records
+
+    def set_records(self, records):
+        """更新数据，尽量只通知发生变化的行"""
+        records = list(records)
+        new_keys = [record[self._key] for record in records]
+        new_key_set = set(new_keys)
+        if len(new_key_set) != len(new_keys):
+            self._reset(records)
+            return
+
+        # 1. 自下而上删除不再存在的行，连续的行合并为一次通知
+        row = len(self._records) - 1
+        while row >= 0:
+            if self._records[row][self._key] in new_key_set:
+                row -= 1
+                continue
+            last = row
+            while row >= 0 and self._records[row][self._key] not in new_key_set:
+                row -= 1
+            self._remove_rows(row + 1, last)
+
+        # 2. 保留下来的行顺序发生变化时无法增量更新，直接重置
+        old_keys = [record[self._key] for record in self._records]
+        old_key_set = set(old_keys)
+        if [key for key in new_keys if key in old_key_set] != old_keys:
+            self._reset(records)
+            return
+
+        if not self._records:
+            self._reset(records)
+            return
+
+        # 3. 插入新行（连续的新行合并为一次通知），比较已有行的内容
+        last_column = len(self._columns) - 1
+        row = 0
+        while row < len(records):
+            if row < len(self._records) and self._records[row][self._key] == new_keys[row]:
+                if self._records[row] != records[row]:
+                    self._records[row] = records[row]
+                    if row < self._loaded:
+                        self.dataChanged.emit(self.index(row, 0), self.index(row, last_column))
+                row += 1
+                continue
+            next_key = self._records[row][self._key] if row < len(self._records) else None
+            end = row
+            while end < len(records) and new_keys[end] != next_key:
+                end += 1
+            self._insert_rows(row, records[row:end])
+            row = end
+
+    def _reset(self, records):
+        self.beginResetModel()
+        self._records = records
+        self._loaded = min(self.batch_size, len(records))
+        self.endResetModel()
+
+    def _remove_rows(self, first, last):
+        if first >= self._loaded:
+            # 还未加载到视图的行，直接删除
+            del self._records[first : last + 1]
+            return
+        visible_last = min(last, self._loaded - 1)
+        self.beginRemoveRows(QModelIndex(), first, visible_last)
+        del self._records[first : last + 1]
+        self._loaded -= visible_last - first + 1
+        self.endRemoveRows()
+
+    def _insert_rows(self, row, records):
+        if row < self._loaded or self._loaded == len(self._records):
+            self.beginInsertRows(QModelIndex(), row, row + len(records) - 1)
+            self._records[row:row] = records
+            self._loaded += len(records)
+            self.endInsertRows()
+        else:
+            # 插入位置在未加载部分，等视图 fetchMore 时再显示
+            self._records[row:row] = records
+
+
+class ButtonDelegate(QStyledItemDelegate):
+    """在单元格中绘制按钮，代替每行创建 QPushButton
+
+    点击时发出 clicked(row)，不可用状态由模型的 ENABLED_ROLE 决定
+    """
+
+    clicked = Signal(int)
+
+    def __init__(
+        self,
+        text,
+        color,
+        hover_color=None,
+        size=(60, 24),
+        disabled_color="#E0E0E0",
+        parent=None,
+    ):
+        super().__init__(parent)
+        self.text = text
+        self.color = QColor(color)
+        self.hover_color = QColor(hover_color or color)
+        self.disabled_color = QColor(disabled_color)
+        self.size = size
+
+    def _button_rect(self, cell_rect):
+        width, height = self.size
+        rect = QRect(0, 0, width, height)
+        rect.moveCenter(cell_rect.center())
+        return rect
+
+    def paint(self, painter, option, index):
+        enabled = bool(index.data(ENABLED_ROLE))
+        if enabled and option.state & QStyle.State_MouseOver:
+            background = self.hover_color
+        elif enabled:
+            background = self.color
+        else:
+            background = self.disabled_color
+        rect = self._button_rect(option.rect)
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(background)
+        painter.drawRoundedRect(rect, 4, 4)
+        painter.setPen(QColor("white") if enabled else QColor("#999999"))
+        painter.drawText(rect, Qt.AlignCenter, self.text)
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if (
+            event.type() == QEvent.MouseButtonRelease
+            and event.button() == Qt.LeftButton
+            and index.data(ENABLED_ROLE)
+            and self._button_rect(option.rect).contains(event.position().toPoint())
+        ):
+            self.clicked.emit(index.row())
+            return True
+        return False
@@ -1,12 +1,12 @@
 import os
 import shutil
 import time
+from concurrent.futures import wait
 
 # 添加时间戳
 from datetime import datetime
 
 from PySide6.QtCore import Qt, QThread, QTimer, Signal
-from PySide6.QtGui import QColor
 from PySide6.QtWidgets import (
     QComboBox,
     QDialog,
@@ -15,16 +15,18 @@ from PySide6.QtWidgets import (
     QHeaderView,
     QLabel,
     QPushButton,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
     QTextEdit,
     QVBoxLayout,
     QWidget,
 )
 
 from api.api_all import check_vip, get_account_info, get_news_list
+from components.table_models import ButtonDelegate, Column, RecordTableModel
 from utils.get_user_ope import user_opt
 from utils.precess_image import precess_image
+from utils.publish_scheduler import PublishLimitReached
+from utils.session_check import SessionExpired, check_session
 from utils.task_service import TaskService
 from utils.token_check import check_user_token
 
@@ -206,7 +208,8 @@ class TaskThread(QThread):
                         break
 
                     self.production_window.append_log("开始任务")
-                    data = get_news_list()
+                    # 任务调度需要最新状态，不使用缓存
+                    data = get_news_list(use_cache=False)
                     if not data:
                         self.production_window.append_log("获取任务列表失败")
                         break
@@ -232,6 +235,10 @@ class TaskThread(QThread):
                         self.production_window.append_log("配置任务已经全部完成")
                         break
 
+                    # 内容逐篇生产，发布交给调度器按账号并发执行
+                    pending = {}
+                    expired = set()
+                    over_limit = set()
                     for item in task:
                         if not self._running:
                             break
@@ -241,6 +248,30 @@ class TaskThread(QThread):
                             self.production_window.append_log(f"任务平台：{item['platform']}")
                             topic = item["title"] + "\n" + item["article_info"]
 
+                            # 额度用完的账号跳过，文章留到第二天再生产，避免每轮重复消耗模型额度
+                            if not self.task_service.has_publish_quota(item["account"]):
+                                over_limit.add(item["id"])
+                                self.production_window.append_log(
+                                    f"账号今日发布数量已达上限，跳过：{item['title']}"
+                                )
+                                continue
+
+                            # 生产内容前先确认账号登录有效，失效账号不消耗模型额度和浏览器时间
+                            cookies = get_account_info(item["account"])
+                            if not cookies or "cookie" not in cookies:
+                                self.production_window.append_log("获取账号信息失败")
+                                continue
+                            cookie = cookies["cookie"]
+                            valid, message = check_session(
+                                item["account"], item["platform"], cookie
+                            )
+                            if valid is False:
+                                expired.add(item["id"])
+                                self.production_window.append_log(
+                                    f"账号登录已失效，请重新绑定账号：{message}"
+                                )
+                                continue
+
                             if item["status"] in [0, 1]:
                                 self.production_window.append_log("开始生产内容")
                                 print("222")
@@ -264,33 +295,39 @@ class TaskThread(QThread):
                                     self.production_window.append_log(
                                         "检测到文章已经生成，获取文章"
                                     )
-                                    cookies = get_account_info(item["account"])
                                     if not self._running:
                                         break
-                                    if not cookies or "cookie" not in cookies:
-                                        self.production_window.append_log("获取账号信息失败")
-                                        continue
 
-                                    cookie = cookies["cookie"]
-                                    self.production_window.append_log("开始发布，等待浏览器启动")
-
-                                    if not self._running:
-                                        break
-
-                                    self.task_service.publish_content(
-                                        article, cookie, img_list, item["platform"], item["id"]
+                                    future = self.task_service.submit_publish(
+                                        article,
+                                        cookie,
+                                        img_list,
+                                        item["platform"],
+                                        item["id"],
+                                        item["account"],
                                     )
-                                    self.production_window.append_log("发布完成")
+                                    pending[future] = (item, img_list)
+                                    img_list = None  # 发布结束后再清理
+                                    self.production_window.append_log("已加入发布队列")
 
                         except Exception as e:
                             self.production_window.append_log(f"处理任务出错: {str(e)}")
                         finally:
-                            if img_list:
-                                try:
-                                    if os.path.exists(img_list):
-                                        shutil.rmtree(img_list)
-                                except Exception as e:
-                                    self.production_window.append_log(f"清理图片失败: {str(e)}")
+                            self.remove_images(img_list)
+
+                    if len(expired) == task_num:
+                        self.production_window.append_log("剩余任务的账号登录均已失效")
+                        break
+                    if len(expired | over_limit) == task_num:
+                        self.production_window.append_log(
+                            "剩余任务的账号登录均已失效或今日发布数量已达上限"
+                        )
+                        break
+                    if not self.wait_publish(pending):
+                        self.production_window.append_log(
+                            "本轮任务均未发布：账号今日发布数量已达上限或登录已失效"
+                        )
+                        break
 
                     time.sleep(1)  # 避免CPU过度使用
 
@@ -303,6 +340,56 @@ class TaskThread(QThread):
         finally:
             self.finished.emit()
 
+    def wait_publish(self, pending):
+        """
+        等待本轮发布结束，线程停止时取消还在排队的发布
+
+        Args:
+            pending: {Future: (任务, 图片目录)}
+
+        Returns:
+            bool: 是否有任务实际执行了发布（全部因额度用完或登录失效被拒绝时返回 False）
+        """
+        attempted = not pending
+        not_done = set(pending)
+        while not_done:
+            if not self._running:
+                for future in not_done:
+                    future.cancel()
+            done, not_done = wait(not_done, timeout=1)
+            for future in done:
+                item, img_list = pending[future]
+                self.remove_images(img_list)
+                if future.cancelled():
+                    self.production_window.append_log(f"已取消发布：{item['title']}")
+                    continue
+                error = future.exception()
+                if isinstance(error, PublishLimitReached):
+                    self.production_window.append_log(
+                        f"账号今日发布数量已达上限（{error}）：{item['title']}"
+                    )
+                    continue
+                if isinstance(error, SessionExpired):
+                    self.production_window.append_log(f"{error}：{item['title']}")
+                    continue
+                attempted = True
+                if error is not None:
+                    self.production_window.append_log(f"发布出错: {str(error)}")
+                elif future.result().get("status"):
+                    self.production_window.append_log(f"发布完成：{item['title']}")
+                else:
+                    self.production_window.append_log(f"发布失败：{item['title']}")
+        return attempted
+
+    def remove_images(self, img_list):
+        if not img_list:
+            return
+        try:
+            if os.path.exists(img_list):
+                shutil.rmtree(img_list)
+        except Exception as e:
+            self.production_window.append_log(f"清理图片失败: {str(e)}")
+
 
 class TaskCenterWidget(QWidget):
     """任务中心组件"""
@@ -365,19 +452,46 @@ class TaskCenterWidget(QWidget):
         layout.addWidget(toolbar)
 
         # 任务列表
-        self.table = QTableWidget()
-        self.table.setObjectName("taskTable")
-        self.table.setColumnCount(7)
-        self.table.setHorizontalHeaderLabels(
-            ["昵称", "UID", "标题", "平台", "任务进度", "开始时间", "操作"]
+        status_colors = {
+            "已配置": "#3498DB",
+            "生产中": "#F1C40F",
+            "已生产": "#2ECC71",
+            "已发布": "#27AE60",
+            "任务失败": "#E74C3C",
+        }
+        self.model = RecordTableModel(
+            [
+                Column("昵称", "nickname"),
+                Column("UID", "uid"),
+                Column("标题", "title"),
+                Column("平台", "platform"),
+                Column(
+                    "任务进度",
+                    "status",
+                    color=lambda task: status_colors.get(task["status"], "#2C3E50"),
+                ),
+                Column("开始时间", "start_time"),
+                Column("操作", lambda task: "", enabled=lambda task: task["status"] != "已发布"),
+            ],
+            parent=self,
         )
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)  # 禁用编辑
+        self.table = QTableView()
+        self.table.setObjectName("taskTable")
+        self.table.setModel(self.model)
+        self.table.setEditTriggers(QTableView.NoEditTriggers)  # 禁用编辑
+        self.table.setMouseTracking(True)  # 按钮悬停效果
+
+        # 操作列的按钮由委托绘制，不再为每行创建 QPushButton
+        self.cancel_delegate = ButtonDelegate("取消", "#E74C3C", "#C0392B", parent=self.table)
+        self.cancel_delegate.clicked.connect(lambda row: self.cancel_task(self.model.record(row)))
+        self.table.setItemDelegateForColumn(6, self.cancel_delegate)
 
         # 设置表格样式
         self.table.setShowGrid(False)
         self.table.setAlternatingRowColors(True)
         self.table.verticalHeader().hide()
-        self.table.setSelectionMode(QTableWidget.NoSelection)
+        self.table.verticalHeader().setDefaultSectionSize(50)  # 设置行高
+        self.table.setSelectionMode(QTableView.NoSelection)
 
         # 设置列宽
         header = self.table.horizontalHeader()
@@ -482,99 +596,17 @@ class TaskCenterWidget(QWidget):
 
     def load_data(self):
         """加载任务数据"""
-        tasks = self.task_service.get_tasks()
+        tasks = self.task_service.get_tasks(self.status_combo.currentText())
         self.display_tasks(tasks)
 
     def display_tasks(self, tasks):
-        """显示任务列表"""
-        self.table.setRowCount(len(tasks))
-        self.table.verticalHeader().setDefaultSectionSize(50)  # 设置行高
+        """显示任务列表，只更新发生变化的行"""
+        self.model.set_records(tasks)
 
-        status_colors = {
-            "已配置": "#3498DB",
-            "生产中": "#F1C40F",
-            "已生产": "#2ECC71",
-            "已发布": "#27AE60",
-            "任务失败": "#E74C3C",
-        }
-
-        for row, task in enumerate(tasks):
-            # 昵称
-            nickname_item = QTableWidgetItem(task["nickname"])
-            nickname_item.setTextAlignment(Qt.AlignVCenter)
-            self.table.setItem(row, 0, nickname_item)
-
-            # UID
-            uid_item = QTableWidgetItem(task["uid"])
-            uid_item.setTextAlignment(Qt.AlignVCenter)
-            self.table.setItem(row, 1, uid_item)
-
-            # 标题
-            title_item = QTableWidgetItem(task["title"])
-            title_item.setTextAlignment(Qt.AlignVCenter)
-            self.table.setItem(row, 2, title_item)
-
-            # 平台
-            platform_item = QTableWidgetItem(task["platform"])
-            platform_item.setTextAlignment(Qt.AlignVCenter)
-            self.table.setItem(row, 3, platform_item)
-
-            # 任务进度
-            status_item = QTableWidgetItem(task["status"])
-            status_item.setTextAlignment(Qt.AlignVCenter)
-            status_item.setForeground(QColor(status_colors.get(task["status"], "#2C3E50")))
-            self.table.setItem(row, 4, status_item)
-
-            # 开始时间
-            start_time_item = QTableWidgetItem(task["start_time"])
-            start_time_item.setTextAlignment(Qt.AlignVCenter)
-            self.table.setItem(row, 5, start_time_item)
-
-            # 操作按钮
-            operation_btn = self.create_operation_button(row, task)
-            self.table.setCellWidget(row, 6, operation_btn)
-
-    def create_operation_button(self, row, task):
-        """创建操作按钮"""
-        btn = QPushButton("取消")
-        btn.setFixedSize(60, 24)
-        btn.setObjectName("operationBtn")
-
-        # 根据任务状态设置按钮状态和样式
-        if task["status"] == "已发布":
-            btn.setEnabled(False)
-            btn.setStyleSheet("""
-                QPushButton#operationBtn {
-                    background-color: #E0E0E0;
-                    color: #999;
-                    border: none;
-                    border-radius: 4px;
-                    padding: 4px 8px;
-                }
-                QPushButton#operationBtn:disabled {
-                    background-color: #E0E0E0;
-                    color: #999;
-                }
-            """)
-        else:
-            btn.setStyleSheet("""
-                QPushButton#operationBtn {
-                    background-color: #E74C3C;
-                    color: white;
-                    border: none;
-                    border-radius: 4px;
-                    padding: 4px 8px;
-                }
-                QPushButton#operationBtn:hover {
-                    background-color: #C0392B;
-                }
-                QPushButton#operationBtn:pressed {
-                    background-color: #A93226;
-                }
-            """)
-            btn.clicked.connect(lambda: self.cancel_task(task))
-
-        return btn
+    def update_task_status(self, task_id, status):
+        """收到推送的任务状态后更新列表，不在列表中的任务等下次加载时显示"""
+        if self.task_service.set_task_status(task_id, status):
+            self.display_tasks(self.task_service.filter_tasks(self.status_combo.currentText()))
 
     def filter_tasks(self):
         """根据状态筛选任务"""
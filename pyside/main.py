@@ -5,8 +5,10 @@ from PySide6.QtGui import QFont
 from PySide6.QtWidgets import QApplication, QDialog
 
 from api.api_all import get_user
+from auto_browser.browser_pool import shutdown_browser_pool
 from utils.auth_service import AuthService
 from utils.local_data import LocalData
+from utils.publish_scheduler import shutdown_publish_scheduler
 from views.login_mode_selector import LoginModeSelector
 from views.login_window import LoginWindow
 from views.main_window import MainWindow
@@ -14,6 +16,9 @@ from views.main_window import MainWindow
 
 def main():
     app = QApplication(sys.argv)
+    # 退出时取消排队中的发布，再关闭发布用的浏览器
+    app.aboutToQuit.connect(shutdown_publish_scheduler)
+    app.aboutToQuit.connect(shutdown_browser_pool)
 
     # 移除特定字体路径依赖
     # QFontDatabase.removeAllApplicationFonts()
@@ -1,52 +1,113 @@
+import json
+import threading
+import time
+
 from api.api_all import get_account_list
 from utils.local_data import LocalData
 
+# 账号列表缓存时间（秒），过期后重新从服务端拉取并同步到本地镜像表
+ACCOUNT_CACHE_TTL = 300
+
 
 class MaterialService:
     """素材服务类"""
 
+    # 账号ID集合在所有实例间共享，发布线程中创建的实例也能复用
+    _account_ids = None
+    _accounts_loaded_at = 0.0
+    _accounts_lock = threading.Lock()
+
     def __init__(self):
         self.local_data = LocalData()
 
-    def get_material_list(self, status=None) -> list[dict]:
-        """获取素材列表
+    @classmethod
+    def invalidate_accounts(cls, clear_mirror=False):
+        """
+        账号增删后调用，下次查询素材时重新拉取账号列表
+
+        Args:
+            clear_mirror: 同时清空本地账号镜像，切换用户时使用，避免拉取失败时沿用上一个用户的账号
+        """
+        with cls._accounts_lock:
+            cls._accounts_loaded_at = 0.0
+            if clear_mirror:
+                cls._account_ids = None
+                local_data = LocalData()
+                try:
+                    local_data.sync_account_mirror([])
+                finally:
+                    local_data.close()
+
+    def _refresh_accounts(self):
+        """按 TTL 刷新账号镜像，账号集合有变化时才写入数据库"""
+        cls = type(self)
+        with cls._accounts_lock:
+            if time.monotonic() - cls._accounts_loaded_at < ACCOUNT_CACHE_TTL:
+                return
+            try:
+                accounts = get_account_list()
+            except Exception as e:
+                accounts = None
+                print(f"获取账号列表失败: {e}")
+            # 请求失败时沿用上次同步的镜像，TTL 内不再重试
+            cls._accounts_loaded_at = time.monotonic()
+            if accounts is None:
+                return
+            account_ids = frozenset(account["id"] for account in accounts)
+            if account_ids != cls._account_ids:
+                self.local_data.sync_account_mirror(accounts)
+                cls._account_ids = account_ids
+
+    @staticmethod
+    def _to_dict(material):
+        # 数据库列顺序：id, title, content, image_list, platform, account_id, nickname, status, upload_time
+        return {
+            "id": material[0],
+            "title": material[1],
+            "content": material[2],
+            "image_list": json.loads(material[3]) if material[3] else [],
+            "platform": material[4],
+            "account_id": material[5],
+            "nickname": material[6],
+            "status": material[7],
+            "upload_time": material[8],
+        }
+
+    def get_material_list(self, status=None, page=None, page_size=50) -> list[dict]:
+        """获取当前账号下的素材列表
         Args:
             status: 可选的状态过滤
+            page: 页码（从1开始），为空时返回全部
+            page_size: 每页数量
         Returns:
             List[Dict]: 素材列表
         """
-        materials = self.local_data.get_materials(status)
-        accounts = [item["id"] for item in get_account_list()]
-        result = []
-        for material in materials:
-            # 数据库列顺序：id, title, content, image_list, platform, account_id, nickname, status, upload_time
-            if int(material[5]) in accounts:
-                result.append(
-                    {
-                        "id": material[0],
-                        "title": material[1],
-                        "content": material[2],
-                        "image_list": material[3].split("===") if material[3] else [],
-                        "platform": material[4],
-                        "account_id": material[5],
-                        "nickname": material[6],
-                        "status": material[7],
-                        "upload_time": material[8],
-                    }
-                )
-        return result
+        self._refresh_accounts()
+        if page is None:
+            materials = self.local_data.get_account_materials(status)
+        else:
+            materials = self.local_data.get_account_materials(
+                status, limit=page_size, offset=(page - 1) * page_size
+            )
+        return [self._to_dict(material) for material in materials]
+
+    def count_materials(self, status=None) -> int:
+        """统计当前账号下的素材数量
+        Args:
+            status: 可选的状态过滤
+        Returns:
+            int: 素材数量
+        """
+        self._refresh_accounts()
+        return self.local_data.count_account_materials(status)
 
     def save_material(self, material_data):
         """保存素材"""
         try:
-            # 将图片列表用===连接
-            image_list = (
-                "===".join(material_data["image_list"]) if material_data["image_list"] else ""
-            )
             return self.local_data.insert_material(
                 material_data["title"],
                 material_data["content"],
-                image_list,
+                material_data["image_list"],
                 material_data["platform"],
                 material_data["account_id"],
                 material_data["nickname"],  # 添加昵称
@@ -64,16 +125,7 @@ class MaterialService:
         """
         material = self.local_data.get_material(material_id)
         if material:
-            return {
-                "id": material[0],
-                "title": material[1],
-                "content": material[2],
-                "image_list": material[3].split(",") if material[3] else [],
-                "platform": material[4],
-                "account_id": material[5],
-                "status": material[6],
-                "upload_time": material[7],
-            }
+            return self._to_dict(material)
         return None
 
     def update_material_status(self, material_id: int, status: int) -> bool:
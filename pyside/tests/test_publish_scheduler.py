@@ -0,0 +1,115 @@
+import threading
+import time
+import unittest
+from datetime import date
+
+from utils.publish_scheduler import PublishLimitReached, PublishScheduler, _AccountState
+from utils.session_check import SessionExpired
+
+TIMEOUT = 5
+
+
+def make_scheduler(limit=15, published=0, **kwargs):
+    kwargs.setdefault("max_workers", 2)
+    kwargs.setdefault("active_hours", (0, 24))
+    kwargs.setdefault("min_interval", 0)
+    return PublishScheduler(
+        limit_loader=lambda account_id: limit,
+        count_loader=lambda account_id: published,
+        **kwargs,
+    )
+
+
+class PublishSchedulerTests(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = None
+
+    def tearDown(self):
+        if self.scheduler is not None:
+            self.scheduler.shutdown()
+
+    def test_same_account_runs_serially(self):
+        self.scheduler = make_scheduler()
+        release = threading.Event()
+        started = []
+        lock = threading.Lock()
+
+        def job(name):
+            with lock:
+                started.append(name)
+            release.wait(TIMEOUT)
+            return False  # 未发布，不触发发布间隔
+
+        first = self.scheduler.submit(1, lambda: job("a1"))
+        second = self.scheduler.submit(1, lambda: job("a2"))
+        other = self.scheduler.submit(2, lambda: job("b1"))
+
+        deadline = time.monotonic() + TIMEOUT
+        while len(started) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.1)
+        # 不同账号并发执行，同一账号的第二个任务等待第一个结束
+        self.assertEqual(sorted(started), ["a1", "b1"])
+        self.assertFalse(second.running() or second.done())
+
+        release.set()
+        for future in (first, second, other):
+            future.result(TIMEOUT)
+        self.assertEqual(started[-1], "a2")
+
+    def test_rejects_when_daily_limit_reached(self):
+        self.scheduler = make_scheduler(limit=2, published=2)
+        called = threading.Event()
+        future = self.scheduler.submit(1, called.set)
+        with self.assertRaises(PublishLimitReached):
+            future.result(TIMEOUT)
+        self.assertFalse(called.is_set())
+
+    def test_has_quota_counts_queued_jobs(self):
+        self.scheduler = make_scheduler(limit=2, published=1)
+        self.assertTrue(self.scheduler.has_quota(1))
+        release = threading.Event()
+        future = self.scheduler.submit(1, lambda: release.wait(TIMEOUT))
+        self.assertFalse(self.scheduler.has_quota(1))
+        self.assertTrue(self.scheduler.has_quota(2))
+        release.set()
+        future.result(TIMEOUT)
+
+    def test_session_expired_fails_queued_jobs(self):
+        self.scheduler = make_scheduler()
+        release = threading.Event()
+        called = threading.Event()
+
+        def expired():
+            release.wait(TIMEOUT)
+            raise SessionExpired("登录已失效")
+
+        first = self.scheduler.submit(1, expired)
+        second = self.scheduler.submit(1, called.set)
+        release.set()
+        with self.assertRaises(SessionExpired):
+            first.result(TIMEOUT)
+        with self.assertRaises(SessionExpired):
+            second.result(TIMEOUT)
+        self.assertFalse(called.is_set())
+
+    def test_next_publish_at_spreads_remaining_quota(self):
+        self.scheduler = make_scheduler(active_hours=(7, 23), min_interval=300)
+        _, end = self.scheduler._window(date.today())
+        state = _AccountState(1)
+        state.limit, state.published = 10, 4
+
+        # 剩余 6 篇均匀分布到剩余的 6 小时
+        now = end - 6 * 3600
+        self.assertEqual(self.scheduler._next_publish_at(state, now), now + 3600)
+        # 间隔不小于 min_interval
+        now = end - 60
+        self.assertEqual(self.scheduler._next_publish_at(state, now), now + 300)
+        # 额度用完或超出发布时段时不再等待
+        self.assertEqual(self.scheduler._next_publish_at(state, end + 1), end + 1)
+        state.published = 10
+        self.assertEqual(self.scheduler._next_publish_at(state, now), now)
+
+
+if __name__ == "__main__":
+    unittest.main()
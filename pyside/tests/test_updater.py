@@ -0,0 +1,212 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+
+import requests
+
+import updater
+from utils import auto_updater
+from utils.auto_updater import UpdateError, download_file
+
+CHUNK = 1024
+BODY = os.urandom(CHUNK * 5 + 100)
+BODY_SHA256 = hashlib.sha256(BODY).hexdigest()
+
+
+class FileHandler(BaseHTTPRequestHandler):
+    """返回 BODY，support_range 为 False 时忽略 Range 返回整个文件"""
+
+    protocol_version = "HTTP/1.1"
+    support_range = True
+    requests = []
+
+    def do_GET(self):
+        byte_range = self.headers.get("Range")
+        self.requests.append(byte_range)
+        if byte_range and self.support_range:
+            start, end = (int(v) for v in byte_range.removeprefix("bytes=").split("-"))
+            body = BODY[start : end + 1]
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(BODY)}")
+        else:
+            body = BODY
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class DownloadFileTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), FileHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}/app.bin"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.dest = os.path.join(self.tmp, "app.bin")
+        FileHandler.support_range = True
+        FileHandler.requests = []
+        patcher = mock.patch.object(auto_updater, "CHUNK_SIZE", CHUNK)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.session = requests.Session()
+        self.addCleanup(self.session.close)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def download(self, sha256=BODY_SHA256):
+        downloaded = []
+        download_file(self.session, self.url, self.dest, len(BODY), sha256, downloaded.append)
+        return sum(downloaded)
+
+    def assert_completed(self):
+        with open(self.dest, "rb") as f:
+            self.assertEqual(f.read(), BODY)
+        self.assertFalse(os.path.exists(self.dest + ".part"))
+        self.assertFalse(os.path.exists(self.dest + ".part.json"))
+
+    def test_downloads_in_chunks(self):
+        self.assertEqual(self.download(), len(BODY))
+        self.assert_completed()
+        self.assertEqual(len(FileHandler.requests), 6)
+
+    def test_resumes_from_part_state(self):
+        # 模拟上次下载完成了前两个分块
+        with open(self.dest + ".part", "wb") as f:
+            f.write(BODY[: CHUNK * 2])
+            f.truncate(len(BODY))
+        state = {"url": self.url, "size": len(BODY), "sha256": BODY_SHA256, "done": [0, 1]}
+        with open(self.dest + ".part.json", "w", encoding="utf-8") as f:
+            json.dump(state, f)
+
+        self.assertEqual(self.download(), len(BODY))
+        self.assert_completed()
+        starts = sorted(int(r.removeprefix("bytes=").split("-")[0]) for r in FileHandler.requests)
+        self.assertEqual(starts, [CHUNK * i for i in range(2, 6)])
+
+    def test_stale_part_state_restarts(self):
+        with open(self.dest + ".part", "wb") as f:
+            f.write(b"\0" * len(BODY))
+        state = {"url": self.url, "size": len(BODY), "sha256": "old", "done": [0, 1, 2]}
+        with open(self.dest + ".part.json", "w", encoding="utf-8") as f:
+            json.dump(state, f)
+
+        self.download()
+        self.assert_completed()
+        self.assertEqual(len(FileHandler.requests), 6)
+
+    def test_falls_back_when_range_ignored(self):
+        FileHandler.support_range = False
+        self.assertEqual(self.download(), len(BODY))
+        self.assert_completed()
+        # 一次分块探测，一次整体下载
+        self.assertEqual(len(FileHandler.requests), 2)
+        self.assertIsNotNone(FileHandler.requests[0])
+        self.assertIsNone(FileHandler.requests[1])
+
+    def test_hash_mismatch_removes_partial_files(self):
+        with self.assertRaises(UpdateError):
+            self.download(sha256="0" * 64)
+        self.assertFalse(os.path.exists(self.dest))
+        self.assertFalse(os.path.exists(self.dest + ".part"))
+        self.assertFalse(os.path.exists(self.dest + ".part.json"))
+
+    def test_skips_existing_file_with_same_hash(self):
+        with open(self.dest, "wb") as f:
+            f.write(BODY)
+        self.download()
+        self.assertEqual(FileHandler.requests, [])
+
+
+def sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+class ApplyUpdateTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp, True)
+        self.app = self.tmp / "app"
+        self.staging = self.tmp / "staging"
+        self.old = {"main.exe": b"old main", "lib/a.dll": b"old a", "obsolete.txt": b"old"}
+        self.new = {"main.exe": b"new main", "lib/a.dll": b"new a", "lib/b.dll": b"new b"}
+        for rel_path, data in self.old.items():
+            self.write(self.app / rel_path, data)
+        self.write_manifest(self.app, "1.0", self.old)
+        for rel_path, data in self.new.items():
+            self.write(self.staging / "files" / rel_path, data)
+        self.write_manifest(self.staging, "1.1", self.new)
+
+    def write(self, path, data):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+
+    def write_manifest(self, root, version, files):
+        manifest = {
+            "version": version,
+            "files": {k: {"sha256": sha256(v), "size": len(v)} for k, v in files.items()},
+        }
+        self.write(root / updater.MANIFEST_NAME, json.dumps(manifest).encode())
+
+    def read_app(self):
+        return {
+            p.relative_to(self.app).as_posix(): p.read_bytes()
+            for p in self.app.rglob("*")
+            if p.is_file() and p.name != updater.MANIFEST_NAME
+        }
+
+    def app_version(self):
+        return json.loads((self.app / updater.MANIFEST_NAME).read_text())["version"]
+
+    def test_applies_update(self):
+        updater.apply_update(str(self.staging), str(self.app))
+        self.assertEqual(self.read_app(), self.new)
+        self.assertEqual(self.app_version(), "1.1")
+        self.assertFalse(self.staging.exists())
+
+    def test_rejects_corrupt_staged_file(self):
+        self.write(self.staging / "files" / "lib/a.dll", b"corrupt")
+        with self.assertRaises(ValueError):
+            updater.apply_update(str(self.staging), str(self.app))
+        self.assertEqual(self.read_app(), self.old)
+
+    def test_rolls_back_when_swap_fails(self):
+        replace = updater._replace
+        failing = (self.staging / "files" / "lib/b.dll").resolve()
+
+        def flaky_replace(src, dst):
+            if Path(src).resolve() == failing:
+                raise PermissionError("文件被占用")
+            replace(src, dst)
+
+        with mock.patch.object(updater, "_replace", flaky_replace):
+            with self.assertRaises(PermissionError):
+                updater.apply_update(str(self.staging), str(self.app))
+        self.assertEqual(self.read_app(), self.old)
+        self.assertEqual(self.app_version(), "1.0")
+
+        # 暂存目录保持完整，再次安装可以成功
+        updater.apply_update(str(self.staging), str(self.app))
+        self.assertEqual(self.read_app(), self.new)
+
+
+if __name__ == "__main__":
+    unittest.main()
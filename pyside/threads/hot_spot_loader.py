@@ -0,0 +1,74 @@
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+from utils.news_sync import get_news_sync
+
+
+class HotSpotLoaderSignals(QObject):
+    """QRunnable 不是 QObject，信号挂在单独的对象上"""
+
+    loaded = Signal(int, list, dict)  # 请求序号, 新闻列表, 已配置标题 -> 任务ID
+    failed = Signal(int, str)
+
+
+class HotSpotLoadTask(QRunnable):
+    """在线程池中抓取热点新闻列表，并查询后台已配置的文章"""
+
+    def __init__(self, request_id, crawler, category_code, loader):
+        super().__init__()
+        self.request_id = request_id
+        self.crawler = crawler
+        self.category_code = category_code
+        self.loader = loader
+
+    def run(self):
+        # 每个阶段前检查请求是否已过期，用户快速切换分类时尽早放弃
+        if self.loader.is_stale(self.request_id):
+            return
+        try:
+            articles = self.crawler.get_news_list(self.category_code)
+        except Exception as e:
+            self.loader.signals.failed.emit(self.request_id, f"获取新闻数据失败：{str(e)}")
+            return
+        if self.loader.is_stale(self.request_id):
+            return
+        try:
+            all_news = get_news_sync().sync()
+        except Exception as e:
+            print(f"获取已配置任务失败：{str(e)}")
+            all_news = []
+        if self.loader.is_stale(self.request_id):
+            return
+        configured = {item["title"]: item["id"] for item in all_news}
+        self.loader.signals.loaded.emit(self.request_id, articles or [], configured)
+
+
+class HotSpotLoader:
+    """
+    热点新闻异步加载器
+
+    - 每次 load 分配递增的请求序号，新请求使旧请求过期
+    - 过期任务开始执行时直接返回，已在运行的在各阶段检查后放弃，结果也不会再发出
+    """
+
+    def __init__(self, max_threads=2):
+        self.signals = HotSpotLoaderSignals()
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(max_threads)
+        self._request_id = 0
+
+    def is_stale(self, request_id):
+        return request_id != self._request_id
+
+    def load(self, crawler, category_code):
+        """提交加载任务，返回请求序号"""
+        self._request_id += 1
+        self.pool.start(HotSpotLoadTask(self._request_id, crawler, category_code, self))
+        return self._request_id
+
+    def cancel(self):
+        """使当前请求过期"""
+        self._request_id += 1
+
+    def shutdown(self):
+        self.cancel()
+        self.pool.waitForDone()
@@ -1,16 +1,18 @@
 import os
 import shutil
 import time
-from datetime import datetime
+from concurrent.futures import wait
+from functools import partial
 
 import requests
 from PySide6.QtCore import QThread, Signal
 
 from api.api_all import get_account_info, token_report
-from auto_browser.auto_base import AutoTools
 from services.material_service import MaterialService
 from utils.article_product import article_create
 from utils.get_user_ope import user_opt
+from utils.publish_scheduler import PublishLimitReached, get_publish_scheduler
+from utils.session_check import check_session, ensure_session
 from utils.token_check import check_user_token
 
 
@@ -41,6 +43,9 @@ class MaterialThread(QThread):
                 self.log_signal.emit("请先在模型中心配置")
                 return
 
+            # 素材逐个生产，发布交给调度器按账号并发执行
+            scheduler = get_publish_scheduler()
+            pending = {}
             for material in self.materials:
                 if not self._running:
                     break
@@ -48,6 +53,21 @@ class MaterialThread(QThread):
                 try:
                     self.log_signal.emit(f"开始处理素材: {material['title']}")
 
+                    # 额度用完的账号不下载图片、不生产内容
+                    if not scheduler.has_quota(material["account_id"]):
+                        self.log_signal.emit(f"账号今日发布数量已达上限，跳过：{material['title']}")
+                        continue
+
+                    # 先确认账号登录有效，失效账号不下载图片、不生产内容
+                    self.log_signal.emit("获取账号信息")
+                    cookie = get_account_info(material["account_id"])["cookie"]
+                    valid, message = check_session(
+                        material["account_id"], material["platform"], cookie
+                    )
+                    if valid is False:
+                        self.log_signal.emit(f"账号登录已失效，请重新绑定账号：{message}")
+                        continue
+
                     # 1. 下载图片
                     self.log_signal.emit("开始下载图片")
                     img_dir = os.path.join("temp", "img_temp", f"zdy_{material['id']}")
@@ -90,31 +110,68 @@ class MaterialThread(QThread):
                         continue
 
                     # 3. 发布内容
-                    self.log_signal.emit("获取账号信息")
-                    cookies = get_account_info(material["account_id"])
-                    cookie = cookies["cookie"]
-
-                    self.log_signal.emit("开始发布，等待浏览器启动")
-                    publish_tool = AutoTools()
-                    result = publish_tool.publish(cookie, article, material["platform"], img_dir)
-
-                    # 4. 更新状态
-                    now = datetime.now()
-                    material_service_ = MaterialService()
-                    if result["status"]:
-                        self.log_signal.emit("发布成功")
-                        material_service_.update_material_status(material["id"], 2)  # 已发布
-                    else:
-                        self.log_signal.emit("发布失败")
-                        material_service_.update_material_status(material["id"], 3)  # 发布失败
-                    shutil.rmtree(img_dir)
+                    # 图片编码在发布任务开始时进行，排队期间不保存编码后的图片
+                    future = scheduler.submit(
+                        material["account_id"],
+                        partial(self.publish_material, material, cookie, article, img_dir),
+                        name=material["title"],
+                    )
+                    pending[future] = material
+                    self.log_signal.emit("已加入发布队列")
                 except Exception as e:
                     self.log_signal.emit(f"处理素材失败: {str(e)}")
                     continue
+            self.wait_publish(pending)
             self.log_signal.emit("任务已经全部完成")
         except Exception as e:
             self.log_signal.emit(f"生产发布任务失败: {str(e)}")
 
+    def publish_material(self, material, cookie, article, img_dir):
+        """在发布调度器的工作线程中发布素材并更新状态"""
+        self.log_signal.emit(f"开始发布 {material['title']}，等待浏览器启动")
+        from auto_browser.auto_base import AutoTools
+
+        try:
+            ensure_session(material["account_id"], material["platform"], cookie)
+            publish_tool = AutoTools()
+            result = publish_tool.publish(
+                cookie, article, material["platform"], img_dir, material["account_id"]
+            )
+
+            # 4. 更新状态
+            material_service_ = MaterialService()
+            if result["status"]:
+                self.log_signal.emit(f"发布成功：{material['title']}")
+                material_service_.update_material_status(material["id"], 2)  # 已发布
+            else:
+                self.log_signal.emit(f"发布失败：{material['title']}")
+                material_service_.update_material_status(material["id"], 3)  # 发布失败
+            return result
+        finally:
+            shutil.rmtree(img_dir, ignore_errors=True)
+
+    def wait_publish(self, pending):
+        """等待发布结束，线程停止时取消还在排队的发布"""
+        not_done = set(pending)
+        while not_done:
+            if not self._running:
+                for future in not_done:
+                    future.cancel()
+            done, not_done = wait(not_done, timeout=1)
+            for future in done:
+                material = pending[future]
+                if future.cancelled():
+                    self.log_signal.emit(f"已取消发布：{material['title']}")
+                elif isinstance(future.exception(), PublishLimitReached):
+                    self.log_signal.emit(f"账号今日发布数量已达上限：{material['title']}")
+                else:
+                    if future.exception() is not None:
+                        self.log_signal.emit(f"处理素材失败: {str(future.exception())}")
+                    continue
+                # 没有执行发布的素材在这里清理图片
+                img_dir = os.path.join("temp", "img_temp", f"zdy_{material['id']}")
+                shutil.rmtree(img_dir, ignore_errors=True)
+
     def produce_content(self, topic, selected_model, api_key, prompt, _id, is_not_full):
         """生产内容"""
         try:
@@ -0,0 +1,145 @@
+import json
+import os
+import random
+import threading
+import time
+from urllib.parse import urlencode, urlsplit
+
+import websocket
+from PySide6.QtCore import QThread, Signal
+
+from api import request_handler
+from utils.notice_service import NoticeService
+
+NOTICE_POLL_INTERVAL = 30 * 60  # 断开期间检查公告的间隔（秒）
+VERSION_POLL_INTERVAL = 60 * 60  # 断开期间检查更新的间隔（秒）
+PING_INTERVAL = 30  # 连接空闲多久发送一次 ping（秒）
+CONNECT_TIMEOUT = 5  # 建立连接的超时（秒）
+POLL_TIMEOUT = 5  # 断开期间轮询请求的超时（秒）
+MIN_BACKOFF = 1
+MAX_BACKOFF = 5 * 60
+
+
+def push_url():
+    url = os.environ.get("AIMEDIA_PUSH_URL")
+    if url:
+        return url
+    parts = urlsplit(request_handler.BASE_URL)
+    scheme = "wss" if parts.scheme == "https" else "ws"
+    return f"{scheme}://{parts.netloc}{parts.path.removesuffix('/api')}/ws/push/"
+
+
+class PushThread(QThread):
+    """
+    推送接收线程
+
+    连接后台 ws/push/ 接收公告、版本发布和任务状态变化。连接断开后按指数退避重连，断开期间按
+    原来的间隔轮询公告和版本；网络请求都在本线程中进行，不阻塞界面。
+    推送地址默认由 BASE_URL 推导（http://host/api -> ws://host/ws/push/），
+    可通过环境变量 AIMEDIA_PUSH_URL 指定。
+
+    Args:
+        updater: AutoUpdater，用于比较推送的版本和轮询检查更新
+    """
+
+    connected_signal = Signal(bool)
+    notice_signal = Signal(int)  # 未读公告数
+    version_signal = Signal(dict)  # 有新版本时的更新信息（AutoUpdater 格式）
+    task_signal = Signal(dict)  # 任务状态变化 {id, status, status_value, created}
+
+    def __init__(self, updater):
+        super().__init__()
+        self.updater = updater
+        self._running = True
+        self._stop_event = threading.Event()
+        self._ws = None
+        self._notice_polled = float("-inf")
+        self._version_polled = float("-inf")
+
+    def stop(self):
+        self._running = False
+        self._stop_event.set()
+        ws = self._ws
+        if ws is not None:
+            ws.abort()  # 唤醒阻塞在 recv 上的线程
+        # 必须等线程结束，销毁运行中的 QThread 会导致进程崩溃。连接或轮询中的请求不能中断，
+        # 最多等待一个 CONNECT_TIMEOUT 或 POLL_TIMEOUT
+        self.wait()
+
+    def run(self):
+        backoff = MIN_BACKOFF
+        while self._running:
+            try:
+                query = urlencode({"token": request_handler.get_token() or ""})
+                self._ws = websocket.create_connection(
+                    f"{push_url()}?{query}", timeout=CONNECT_TIMEOUT
+                )
+                self._ws.settimeout(PING_INTERVAL)
+            except Exception as e:
+                print(f"推送通道连接失败：{str(e)}")
+                self._ws = None
+            if self._ws is not None:
+                backoff = MIN_BACKOFF
+                self.connected_signal.emit(True)
+                self._listen()
+                self.connected_signal.emit(False)
+            if not self._running:
+                break
+            self._poll()
+            # 加入随机抖动，避免服务重启后所有客户端同时重连
+            self._stop_event.wait(random.uniform(backoff / 2, backoff))
+            backoff = min(backoff * 2, MAX_BACKOFF)
+
+    def _listen(self):
+        waiting_pong = False
+        try:
+            while self._running:
+                try:
+                    raw = self._ws.recv()
+                except websocket.WebSocketTimeoutException:
+                    if waiting_pong:
+                        break  # ping 之后仍无响应，视为连接已断开
+                    self._ws.send(json.dumps({"type": "ping"}))
+                    waiting_pong = True
+                    continue
+                if not raw:
+                    break
+                waiting_pong = False
+                self._dispatch(json.loads(raw))
+        except Exception as e:
+            if self._running:
+                print(f"推送通道断开：{str(e)}")
+        finally:
+            ws, self._ws = self._ws, None
+            try:
+                ws.close()
+            except Exception:
+                pass
+
+    def _dispatch(self, message):
+        message_type = message.get("type")
+        if message_type in ("hello", "notice"):
+            self.notice_signal.emit(message["unread"])
+        if message_type in ("hello", "version") and message.get("version"):
+            has_update, update_info = self.updater.parse_version(message["version"])
+            if has_update:
+                self.version_signal.emit(update_info)
+        elif message_type == "task":
+            self.task_signal.emit(message)
+
+    def _poll(self):
+        """推送不可用时轮询公告和版本"""
+        now = time.monotonic()
+        if now - self._notice_polled >= NOTICE_POLL_INTERVAL:
+            self._notice_polled = now
+            try:
+                self.notice_signal.emit(NoticeService().get_unread_count(POLL_TIMEOUT))
+            except Exception as e:
+                print(f"获取通知失败：{str(e)}")
+        if self._stop_event.is_set():
+            return
+        if now - self._version_polled >= VERSION_POLL_INTERVAL:
+            self._version_polled = now
+            has_update, update_info = self.updater.check_for_updates(POLL_TIMEOUT)
+            if has_update:
+                self.version_signal.emit(update_info)
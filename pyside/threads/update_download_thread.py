@@ -0,0 +1,22 @@
+from PySide6.QtCore import QThread, Signal
+
+
+class UpdateDownloadThread(QThread):
+    """在后台下载更新，完成后发出暂存目录或安装包路径"""
+
+    progress_signal = Signal(int, int)  # 已下载字节数, 总字节数
+    finished_signal = Signal(str)
+    failed_signal = Signal(str)
+
+    def __init__(self, updater, update_info):
+        super().__init__()
+        self.updater = updater
+        self.update_info = update_info
+
+    def run(self):
+        try:
+            path = self.updater.download_update(self.update_info, self.progress_signal.emit)
+        except Exception as e:
+            self.failed_signal.emit(str(e))
+            return
+        self.finished_signal.emit(path)
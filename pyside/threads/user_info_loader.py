@@ -0,0 +1,35 @@
+from PySide6.QtCore import QObject, QRunnable, Signal
+
+from api.api_all import get_user
+from utils.user_profile import fetch_avatar, save_profile
+
+
+class UserInfoLoaderSignals(QObject):
+    """QRunnable 不是 QObject，信号挂在单独的对象上"""
+
+    profile_loaded = Signal(dict)  # 最新用户资料
+    avatar_loaded = Signal(str, str)  # 头像 URL, 本地头像路径
+
+
+class UserInfoLoadTask(QRunnable):
+    """在线程池中获取用户资料并下载头像，结果写入缓存后通过信号通知界面"""
+
+    def __init__(self, signals):
+        super().__init__()
+        self.signals = signals
+
+    def run(self):
+        try:
+            profile = get_user()
+        except Exception as e:
+            print(f"获取用户信息失败：{str(e)}")
+            return
+        if not isinstance(profile, dict):
+            return
+        save_profile(profile)
+        self.signals.profile_loaded.emit(profile)
+
+        avatar_url = profile.get("avatar")
+        avatar_path = fetch_avatar(avatar_url)
+        if avatar_path:
+            self.signals.avatar_loaded.emit(avatar_url, avatar_path)
@@ -1,3 +1,5 @@
+import hashlib
+import json
 import logging
 import os
 import shutil
@@ -7,17 +9,122 @@ import time
 import zipfile
 from pathlib import Path
 
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s", filename="update.log"
-)
+# 增量更新的清单文件，与 utils/update_manifest.py 保持一致；updater 独立运行，不导入程序模块
+MANIFEST_NAME = "manifest.json"
+# 文件被占用（程序尚未完全退出）时重试替换的次数和间隔
+REPLACE_RETRIES = 20
+REPLACE_INTERVAL = 0.5
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _safe_path(root: Path, rel_path: str) -> Path:
+    path = (root / rel_path).resolve()
+    if root.resolve() not in path.parents:
+        raise ValueError(f"清单中的路径无效: {rel_path}")
+    return path
+
+
+def _replace(src: Path, dst: Path):
+    """原子替换，文件被占用时等待程序退出后重试"""
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    for attempt in range(REPLACE_RETRIES):
+        try:
+            os.replace(src, dst)
+            return
+        except PermissionError:
+            if attempt == REPLACE_RETRIES - 1:
+                raise
+            time.sleep(REPLACE_INTERVAL)
+
+
+def apply_update(staging_dir: str, app_dir: str):
+    """
+    安装增量更新
+
+    暂存目录结构：manifest.json 为新版本清单，files/ 下是需要更新的文件。每个文件先把旧文件
+    移到 backup/，再把新文件原子替换到程序目录；任一步失败时按相反顺序还原：新文件移回 files/，
+    旧文件从 backup/ 移回程序目录，暂存目录保持完整，可以再次安装。
+    程序目录中旧清单有、新清单没有的文件同样移到 backup/。
+    :param staging_dir: 暂存目录
+    :param app_dir: 应用程序目录
+    """
+    staging = Path(staging_dir)
+    app = Path(app_dir)
+    with open(staging / MANIFEST_NAME, encoding="utf-8") as f:
+        manifest = json.load(f)
+    old_files = {}
+    if (app / MANIFEST_NAME).exists():
+        with open(app / MANIFEST_NAME, encoding="utf-8") as f:
+            old_files = json.load(f).get("files", {})
+
+    # 替换前先校验全部文件，避免替换到一半才发现文件损坏
+    updates = []
+    for rel_path, entry in manifest["files"].items():
+        staged = _safe_path(staging / "files", rel_path)
+        if staged.exists():
+            if _sha256(staged) != entry["sha256"]:
+                raise ValueError(f"文件校验失败: {rel_path}")
+            updates.append((staged, _safe_path(app, rel_path), rel_path))
+    removed = [
+        (_safe_path(app, rel_path), rel_path)
+        for rel_path in old_files
+        if rel_path not in manifest["files"]
+    ]
+
+    backup = staging / "backup"
+    swapped = []  # (目标文件, 备份文件或 None, 暂存文件或 None)
+    try:
+        for staged, target, rel_path in updates:
+            backup_path = None
+            if target.exists():
+                backup_path = backup / rel_path
+                _replace(target, backup_path)
+            swapped.append((target, backup_path, staged))
+            _replace(staged, target)
+            logging.info(f"已更新: {rel_path}")
+        for target, rel_path in removed:
+            if target.exists():
+                _replace(target, backup / rel_path)
+                swapped.append((target, backup / rel_path, None))
+                logging.info(f"已删除: {rel_path}")
+        # 清单最后替换，作为更新完成的标记
+        _replace(staging / MANIFEST_NAME, app / MANIFEST_NAME)
+    except Exception:
+        logging.error("更新失败，还原已替换的文件")
+        for target, backup_path, staged in reversed(swapped):
+            # 已替换到程序目录的新文件移回暂存目录，再次安装时不会漏掉
+            if staged is not None and not staged.exists() and target.exists():
+                os.replace(target, staged)
+            if backup_path is not None and backup_path.exists():
+                os.replace(backup_path, target)
+        raise
+
+    shutil.rmtree(staging, ignore_errors=True)
+    logging.info(f"更新完成: {manifest.get('version')}，共 {len(updates)} 个文件")
 
 
 def update_app(zip_path: str, app_dir: str):
     """
-    解压更新包并更新应用程序
-    :param zip_path: ZIP文件路径
+    安装更新并重新启动应用程序
+    :param zip_path: ZIP文件路径，或增量更新的暂存目录
     :param app_dir: 应用程序目录
     """
+    if Path(zip_path).is_dir():
+        try:
+            apply_update(zip_path, app_dir)
+        except Exception as e:
+            logging.error(f"更新失败: {str(e)}")
+            raise
+        _restart(app_dir)
+        return
+
     try:
         # 创建临时解压目录
         temp_dir = Path("temp_update")
@@ -62,19 +169,28 @@ def update_app(zip_path: str, app_dir: str):
         shutil.rmtree(temp_dir)
         os.remove(zip_path)
 
-        # 启动应用程序
-        app_exe = Path(app_dir) / "AiMedia.exe"
-        if app_exe.exists():
-            subprocess.Popen([str(app_exe)], shell=True)
+        _restart(app_dir)
 
     except Exception as e:
         logging.error(f"更新失败: {str(e)}")
         raise
 
 
+def _restart(app_dir: str):
+    """启动应用程序"""
+    app_exe = Path(app_dir) / "AiMedia.exe"
+    if app_exe.exists():
+        subprocess.Popen([str(app_exe)], shell=True)
+
+
 if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(message)s",
+        filename="update.log",
+    )
     if len(sys.argv) != 3:
-        print("Usage: updater.py <zip_path> <app_dir>")
+        print("Usage: updater.py <zip_path | staging_dir> <app_dir>")
         sys.exit(1)
 
     zip_path = sys.argv[1]
@@ -2,7 +2,6 @@
 # @Time    : 2024/12/10 14:19
 # @Author  : DNQTeach
 # @File    : articl_product.py
-from ai_model.writing_assistant import WritingAssistant
 from api.api_all import token_not_full
 from utils.get_server_key import run_decrypt
 
@@ -19,6 +18,9 @@ def article_create(topic, selected_model, api_key, prompt, is_not_full):
     Returns:
         tuple: (文章内容, token使用量, 是否启用)
     """
+    # 延迟导入，启动时不加载 langchain 等模型依赖
+    from ai_model.writing_assistant import WritingAssistant
+
     try:
         model_config = [selected_model, api_key, prompt]
         print(f"用户配置模型: {selected_model}, 是否用内置key: {is_not_full}")
@@ -3,7 +3,11 @@ import json
 import requests
 from PySide6.QtCore import QSettings
 
-from api.request_handler import BASE_URL
+from api.api_all import invalidate_cache
+from api.request_handler import BASE_URL, invalidate_token
+from services.material_service import MaterialService
+from utils.news_sync import get_news_sync
+from utils.user_profile import clear_profile
 
 
 class AuthService:
@@ -137,6 +141,11 @@ class AuthService:
         """将token保存到设置中"""
         settings = QSettings("AiMedia", "ai-media")
         settings.setValue("token", token)
+        invalidate_token()
+        invalidate_cache()  # 切换用户后不能再使用上一个用户的缓存数据
+        get_news_sync().reset()
+        MaterialService.invalidate_accounts(clear_mirror=True)
+        clear_profile()
 
     @staticmethod
     def get_token() -> str | None:
@@ -150,6 +159,11 @@ class AuthService:
         try:
             settings = QSettings("AiMedia", "ai-media")
             settings.remove("token")
+            invalidate_token()
+            invalidate_cache()
+            get_news_sync().reset()
+            MaterialService.invalidate_accounts(clear_mirror=True)
+            clear_profile()
             print("成功删除token")
             return True
         except Exception as e:
@@ -1,17 +1,156 @@
+"""
+客户端更新
+
+- 后台版本信息带有 manifest_link 时按清单增量更新：只下载与本地不一致的文件，校验 sha256 后
+  放入 .update/<版本号>/files，由 updater.py 在程序退出后逐个原子替换
+- 没有清单时下载完整安装包，交给 updater.py 解压覆盖
+- 下载进度记录在 <文件>.part.json，中断后再次下载只请求缺少的分块；大文件按 CHUNK_SIZE 分块，
+  用 Range 请求并发下载，服务器不支持 Range 时退回整体下载
+"""
+
 import json
 import logging
+import os
+import shutil
+import subprocess
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from api.request_handler import BASE_URL
+from utils.update_manifest import (
+    MANIFEST_NAME,
+    changed_files,
+    file_sha256,
+    file_url,
+    safe_path,
+)
+
+CHUNK_SIZE = 4 * 1024 * 1024
+DOWNLOAD_WORKERS = 4
+DOWNLOAD_TIMEOUT = 30
+
+
+class UpdateError(Exception):
+    """更新下载或校验失败"""
+
+
+def _save_state(state_path, state):
+    with open(state_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(state_path + ".tmp", state_path)
+
+
+def _load_state(state_path, url, size, sha256):
+    """读取未完成下载的进度，文件信息变化时从头下载"""
+    try:
+        with open(state_path, encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if (state.get("url"), state.get("size"), state.get("sha256")) != (url, size, sha256):
+        return None
+    return state
+
+
+def _download_whole(session, url, part_path, on_bytes):
+    with session.get(url, stream=True, timeout=DOWNLOAD_TIMEOUT) as response:
+        response.raise_for_status()
+        with open(part_path, "wb") as f:
+            for block in response.iter_content(64 * 1024):
+                f.write(block)
+                on_bytes(len(block))
+
+
+def download_file(
+    session, url, dest, size=None, sha256=None, on_bytes=None, workers=DOWNLOAD_WORKERS
+):
+    """
+    断点续传下载文件，完成后校验哈希并重命名为 dest
+
+    Args:
+        session: requests.Session
+        url: 下载地址
+        dest: 保存路径
+        size: 文件大小，未知时不分块
+        sha256: 文件哈希，未知时不校验
+        on_bytes: on_bytes(n)，每下载 n 字节回调一次
+        workers: 分块并发数
+    """
+    on_bytes = on_bytes or (lambda n: None)
+    dest = str(dest)
+    if sha256 and os.path.exists(dest) and file_sha256(dest) == sha256:
+        on_bytes(size or 0)
+        return dest
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    part_path, state_path = dest + ".part", dest + ".part.json"
+
+    if not size or size <= CHUNK_SIZE:
+        _download_whole(session, url, part_path, on_bytes)
+    else:
+        state = _load_state(state_path, url, size, sha256)
+        if state is None or not os.path.exists(part_path):
+            state = {"url": url, "size": size, "sha256": sha256, "done": []}
+            with open(part_path, "wb") as f:
+                f.truncate(size)
+            _save_state(state_path, state)
+        done = set(state["done"])
+        chunks = [i for i in range((size + CHUNK_SIZE - 1) // CHUNK_SIZE) if i not in done]
+        on_bytes(size - sum(min(CHUNK_SIZE, size - i * CHUNK_SIZE) for i in chunks))
+        lock = threading.Lock()
+
+        def fetch(index):
+            start = index * CHUNK_SIZE
+            end = min(start + CHUNK_SIZE, size) - 1
+            # 先检查状态码再读取响应体，服务器忽略 Range 时不会把整个文件读入内存
+            with session.get(
+                url,
+                headers={"Range": f"bytes={start}-{end}"},
+                stream=True,
+                timeout=DOWNLOAD_TIMEOUT,
+            ) as response:
+                response.raise_for_status()
+                if response.status_code != 206:
+                    return False
+                with open(part_path, "r+b") as f:
+                    f.seek(start)
+                    for block in response.iter_content(64 * 1024):
+                        f.write(block)
+            with lock:
+                done.add(index)
+                state["done"] = sorted(done)
+                _save_state(state_path, state)
+            on_bytes(end - start + 1)
+            return True
+
+        # 先请求一个分块确认服务器支持 Range，再并发下载其余分块
+        if chunks and not fetch(chunks[0]):
+            logging.info(f"服务器不支持分块下载，整体下载: {url}")
+            _download_whole(session, url, part_path, on_bytes)
+        elif len(chunks) > 1:
+            with ThreadPoolExecutor(workers) as executor:
+                list(executor.map(fetch, chunks[1:]))
+
+    if sha256 and file_sha256(part_path) != sha256:
+        os.remove(part_path)
+        if os.path.exists(state_path):
+            os.remove(state_path)
+        raise UpdateError(f"文件校验失败: {url}")
+    os.replace(part_path, dest)
+    if os.path.exists(state_path):
+        os.remove(state_path)
+    return dest
 
 
 class AutoUpdater:
     def __init__(self, current_version: str, app_name: str = "AiMedia"):
         self.current_version = current_version
         self.app_name = app_name
+        self.session = None
 
         # 获取配置文件路径
         if getattr(sys, "frozen", False):
@@ -26,22 +165,23 @@ class AutoUpdater:
         try:
             with open(config_path, encoding="utf-8") as f:
                 self.config = json.load(f)
-                self.config["update_server"]["base_url"] = f"{BASE_URL}/api/crawler/client_version"
+                self.config["update_server"]["base_url"] = f"{BASE_URL}/crawler/client_version/"
         except Exception as e:
             logging.error(f"加载更新配置失败: {str(e)}")
             self.config = {
-                "update_server": {"base_url": f"{BASE_URL}/api/crawler/client_version"},
+                "update_server": {"base_url": f"{BASE_URL}/crawler/client_version/"},
                 "check_interval": 3600,
             }
 
-    def check_for_updates(self) -> tuple[bool, dict | None]:
+    def check_for_updates(self, timeout=DOWNLOAD_TIMEOUT) -> tuple[bool, dict | None]:
         """
         检查更新
+        :param timeout: 请求超时（秒）
         :return: (是否有更新, 更新信息)
         """
         try:
             # 发送请求
-            response = requests.get(self.config["update_server"]["base_url"])
+            response = requests.get(self.config["update_server"]["base_url"], timeout=timeout)
             if response.status_code != 200:
                 logging.error(f"检查更新失败: HTTP {response.status_code}")
                 return False, None
@@ -55,36 +195,127 @@ class AutoUpdater:
                 return False, None
 
             # 获取最新版本信息（取结果列表的第一个）
-            update_info = response_data["result"][0]
+            return self.parse_version(response_data["result"][0])
+
+        except Exception as e:
+            logging.error(f"检查更新失败: {str(e)}")
+            return False, None
+
+    def parse_version(self, update_info):
+        """
+        解析后台的版本记录，推送通道收到的版本消息也使用该方法
+        :return: (是否有更新, 更新信息)
+        """
+        # 打印调试信息
+        logging.debug(f"服务器返回数据: {update_info}")
 
-            # 打印调试信息
-            logging.debug(f"服务器返回数据: {update_info}")
+        # 获取版本信息
+        server_version = update_info.get("version", "")
+        if not server_version:
+            logging.error("服务器返回的数据中没有版本号")
+            return False, None
+
+        # 比较版本
+        if server_version > self.current_version:
+            # 转换为我们需要的格式
+            formatted_info = {
+                "version": server_version,
+                "release_date": update_info.get("updated_at", ""),
+                "release_notes": update_info.get("content", "暂无更新说明"),
+                "download_url": update_info.get("download_link", ""),
+                "manifest_url": update_info.get("manifest_link", ""),
+            }
 
-            # 获取版本信息
-            server_version = update_info.get("version", "")
-            if not server_version:
-                logging.error("服务器返回的数据中没有版本号")
+            # 检查必要的字段
+            if not formatted_info["download_url"] and not formatted_info["manifest_url"]:
+                logging.error("服务器返回的数据中没有下载链接")
                 return False, None
 
-            # 比较版本
-            if server_version > self.current_version:
-                # 转换为我们需要的格式
-                formatted_info = {
-                    "version": server_version,
-                    "release_date": update_info.get("updated_at", ""),
-                    "release_notes": update_info.get("content", "暂无更新说明"),
-                    "download_url": update_info.get("download_link", ""),
-                }
+            return True, formatted_info
 
-                # 检查必要的字段
-                if not formatted_info["download_url"]:
-                    logging.error("服务器返回的数据中没有下载链接")
-                    return False, None
+        return False, None
 
-                return True, formatted_info
+    def _get_session(self):
+        if self.session is None:
+            self.session = requests.Session()
+            adapter = HTTPAdapter(pool_maxsize=DOWNLOAD_WORKERS * 2)
+            self.session.mount("http://", adapter)
+            self.session.mount("https://", adapter)
+        return self.session
 
-            return False, None
+    def download_update(self, update_info, progress=None):
+        """
+        下载更新，中断后再次调用会从上次的进度继续
 
-        except Exception as e:
-            logging.error(f"检查更新失败: {str(e)}")
-            return False, None
+        Args:
+            update_info: check_for_updates 返回的更新信息
+            progress: progress(已下载字节数, 总字节数)
+
+        Returns:
+            str: 有清单时为暂存目录，否则为下载的安装包路径
+        """
+        staging_root = self.app_dir / ".update"
+        staging = staging_root / update_info["version"]
+        # 清理其他版本未完成的下载
+        if staging_root.exists():
+            for item in staging_root.iterdir():
+                if item != staging:
+                    shutil.rmtree(item, ignore_errors=True)
+
+        session = self._get_session()
+        manifest_url = update_info.get("manifest_url")
+        if not manifest_url:
+            url = update_info["download_url"]
+            dest = staging / (Path(url.split("?")[0]).name or f"{self.app_name}.zip")
+            return download_file(session, url, dest)
+
+        response = session.get(manifest_url, timeout=DOWNLOAD_TIMEOUT)
+        response.raise_for_status()
+        manifest = response.json()
+        changed = changed_files(manifest, self.app_dir)
+        total = sum(entry["size"] for _, entry in changed)
+        logging.info(f"增量更新 {len(changed)}/{len(manifest['files'])} 个文件，共 {total} 字节")
+
+        downloaded = 0
+        lock = threading.Lock()
+
+        def on_bytes(n):
+            nonlocal downloaded
+            with lock:
+                downloaded += n
+                current = downloaded
+            if progress:
+                progress(min(current, total), total)
+
+        def fetch(item):
+            rel_path, entry = item
+            download_file(
+                session,
+                file_url(manifest_url, rel_path),
+                safe_path(staging / "files", rel_path),
+                entry["size"],
+                entry["sha256"],
+                on_bytes,
+            )
+
+        # 大文件依次下载，每个文件内部分块并发；小文件之间并发
+        large = [item for item in changed if item[1]["size"] > CHUNK_SIZE]
+        small = [item for item in changed if item[1]["size"] <= CHUNK_SIZE]
+        for item in large:
+            fetch(item)
+        with ThreadPoolExecutor(DOWNLOAD_WORKERS) as executor:
+            list(executor.map(fetch, small))
+
+        # 清单最后写入，updater 以此判断暂存目录已下载完整
+        with open(staging / (MANIFEST_NAME + ".tmp"), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False)
+        os.replace(staging / (MANIFEST_NAME + ".tmp"), staging / MANIFEST_NAME)
+        return str(staging)
+
+    def install_update(self, update_path):
+        """启动 updater 安装更新，调用方随后退出程序，updater 在文件解除占用后替换"""
+        if getattr(sys, "frozen", False):
+            command = [str(self.app_dir / "updater.exe")]
+        else:
+            command = [sys.executable, str(self.app_dir / "updater.py")]
+        subprocess.Popen(command + [str(update_path), str(self.app_dir)], cwd=str(self.app_dir))
@@ -1,146 +1,286 @@
+import json
 import sqlite3
 import threading
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 
 
+def _migrate_typed_schema(conn):
+    """素材表改为强类型列，图片列表改为 JSON 数组；发布目标拆分到 publish_target 表；补充索引"""
+    conn.execute("""
+        CREATE TABLE material_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            content TEXT NOT NULL,
+            image_list TEXT NOT NULL DEFAULT '[]',
+            platform TEXT NOT NULL,
+            account_id INTEGER NOT NULL,
+            nickname TEXT NOT NULL,
+            status INTEGER NOT NULL DEFAULT 0,
+            upload_time TEXT NOT NULL
+        )
+    """)
+    rows = conn.execute(
+        "SELECT id, title, content, image_list, platform, account_id, nickname, status, upload_time"
+        " FROM material"
+    ).fetchall()
+    conn.executemany(
+        "INSERT INTO material_new VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        [
+            (
+                _id,
+                title,
+                content,
+                json.dumps(image_list.split("===") if image_list else []),
+                platform,
+                int(account_id) if str(account_id).isdigit() else 0,
+                nickname,
+                int(status or 0),
+                upload_time,
+            )
+            for _id, title, content, image_list, platform, account_id, nickname, status, upload_time in rows
+        ],
+    )
+    conn.execute("DROP TABLE material")
+    conn.execute("ALTER TABLE material_new RENAME TO material")
+    conn.execute("CREATE INDEX idx_material_status_upload_time ON material (status, upload_time)")
+    conn.execute("CREATE INDEX idx_material_account_id ON material (account_id)")
+
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_account_uid ON account (uid)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_publish_config_uid ON publish_config (uid)")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_publish_config_account_id ON publish_config (account_id)"
+    )
+
+    # 发布目标：每个账号配置的每个新闻分类一行
+    conn.execute("""
+        CREATE TABLE publish_target (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            config_id INTEGER NOT NULL REFERENCES publish_config (id) ON DELETE CASCADE,
+            account_id INTEGER NOT NULL,
+            classify TEXT NOT NULL,
+            position INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    conn.execute("CREATE INDEX idx_publish_target_classify ON publish_target (classify)")
+    conn.execute("CREATE INDEX idx_publish_target_config_id ON publish_target (config_id)")
+    configs = conn.execute("SELECT id, account_id, codes FROM publish_config").fetchall()
+    conn.executemany(
+        "INSERT INTO publish_target (config_id, account_id, classify, position) VALUES (?, ?, ?, ?)",
+        [
+            (config_id, int(account_id), classify, position)
+            for config_id, account_id, codes in configs
+            if str(account_id).isdigit()
+            for position, classify in enumerate(code for code in codes.split(",") if code)
+        ],
+    )
+
+    # 各新闻平台的分类源，由 sync_platform_sources 从 HotSpotService.PLATFORM_CONFIG 同步
+    conn.execute("""
+        CREATE TABLE platform_source (
+            platform TEXT NOT NULL,
+            name TEXT NOT NULL,
+            code TEXT NOT NULL,
+            classify TEXT NOT NULL
+        )
+    """)
+    conn.execute("CREATE INDEX idx_platform_source_classify ON platform_source (classify)")
+
+
+# 数据库结构迁移，按顺序执行，已执行的版本记录在 PRAGMA user_version 中
+# 每个版本为 SQL 语句列表，或接收连接的函数；新增结构变更时只能在末尾追加，不能修改已发布的版本
+MIGRATIONS = [
+    # 1: 初始表结构
+    [
+        """
+    CREATE TABLE IF NOT EXISTS account (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        platform TEXT NOT NULL,
+        nickname TEXT NOT NULL,
+        uid TEXT NOT NULL,
+        cookie TEXT,
+        status TEXT DEFAULT "正常",
+        publish_limit INTEGER DEFAULT 0,
+        create_time DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+        """
+    CREATE TABLE IF NOT EXISTS publish_config (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        nickname TEXT NOT NULL,
+        uid TEXT NOT NULL,
+        platform TEXT NOT NULL,
+        targets TEXT NOT NULL,
+        codes TEXT NOT NULL,
+        account_id TEXT NOT NULL,
+        create_time DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+        """
+    CREATE TABLE IF NOT EXISTS material (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT NOT NULL,
+        content TEXT NOT NULL,
+        image_list TEXT,
+        platform TEXT NOT NULL,
+        account_id TEXT NOT NULL,
+        nickname TEXT NOT NULL,
+        status INTEGER DEFAULT 0,
+        upload_time TEXT NOT NULL
+    )
+    """,
+    ],
+    # 2: 强类型素材表、索引、publish_target 关联表
+    _migrate_typed_schema,
+    # 3: 服务端账号镜像，素材列表按账号过滤时直接在 SQL 中关联
+    [
+        """
+    CREATE TABLE account_mirror (
+        id INTEGER PRIMARY KEY,
+        platform TEXT NOT NULL DEFAULT '',
+        nickname TEXT NOT NULL DEFAULT ''
+    )
+    """,
+        "CREATE INDEX idx_material_upload_time ON material (upload_time)",
+    ],
+    # 4: 发布账号登录状态检查结果，cookie 变化后按指纹失效
+    [
+        """
+    CREATE TABLE session_check (
+        account_key TEXT PRIMARY KEY,
+        platform TEXT NOT NULL,
+        fingerprint TEXT NOT NULL,
+        valid INTEGER NOT NULL,
+        message TEXT NOT NULL DEFAULT '',
+        checked_at REAL NOT NULL
+    )
+    """,
+    ],
+]
+
+
 class LocalData:
+    """
+    本地 SQLite 存储
+
+    - 每个线程每个数据库只创建一个连接并复用，不再每次调用都检测连接
+    - WAL 日志模式 + synchronous=NORMAL，读写互不阻塞，提交不再每次刷盘
+    - 首次连接时执行一次版本化迁移
+    - 单条语句自动提交，多行操作使用 transaction() 显式事务
+    """
+
     _local = threading.local()
+    _migrated = set()
+    _migrate_lock = threading.Lock()
 
     def __init__(self, db_name="localData.db"):
         self.db_name = db_name
 
-    def _init_db_connection(self):
-        """初始化或重新初始化数据库连接"""
-        try:
-            # 检查连接是否存在且有效
-            if hasattr(self._local, "conn") and self._local.conn is not None:
+    def _connect(self):
+        """创建新连接并初始化"""
+        # isolation_level=None 为自动提交模式，事务由 transaction() 显式控制
+        # cached_statements 缓存预编译语句，相同 SQL 不会重复编译
+        conn = sqlite3.connect(
+            self.db_name, timeout=30, isolation_level=None, cached_statements=256
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        self._migrate(conn)
+        return conn
+
+    def _migrate(self, conn):
+        """执行尚未执行的迁移，每个进程每个数据库只检查一次"""
+        if self.db_name in self._migrated:
+            return
+        with self._migrate_lock:
+            if self.db_name in self._migrated:
+                return
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            for index, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+                conn.execute("BEGIN IMMEDIATE")
                 try:
-                    # 尝试执行一个简单的查询来测试连接
-                    self._local.conn.execute("SELECT 1")
-                    return
-                except (sqlite3.OperationalError, sqlite3.ProgrammingError):
-                    # 如果连接已关闭或无效，关闭它（如果可能）并创建新连接
-                    try:
-                        self._local.conn.close()
-                    except:
-                        pass
-
-            # 创建新连接
-            self._local.conn = sqlite3.connect(self.db_name)
-            self._local.cursor = self._local.conn.cursor()
-
-            # 确保表存在
-            self._ensure_tables_exist()
-
-        except Exception as e:
-            print(f"数据库连接初始化错误: {str(e)}")
-            raise
-
-    def _ensure_tables_exist(self):
-        """确保所有必需的表都存在"""
-        self.create_table()
-        self.create_publish_table()
-        self.create_material_table()
-
-    def _get_cursor(self):
-        """获取当前线程的游标，确保连接有效"""
-        self._init_db_connection()
-        return self._local.cursor
+                    if callable(migration):
+                        migration(conn)
+                    else:
+                        for statement in migration:
+                            conn.execute(statement)
+                    conn.execute(f"PRAGMA user_version = {index}")
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+                conn.execute("COMMIT")
+            self._migrated.add(self.db_name)
 
     def _get_conn(self):
-        """获取当前线程的连接，确保连接有效"""
-        self._init_db_connection()
-        return self._local.conn
-
-    def create_table(self):
-        # 创建账号表，如果不存在
-        self._get_cursor().execute("""
-            CREATE TABLE IF NOT EXISTS account (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                platform TEXT NOT NULL,
-                nickname TEXT NOT NULL,
-                uid TEXT NOT NULL,
-                cookie TEXT,
-                status TEXT DEFAULT "正常",
-                publish_limit INTEGER DEFAULT 0,
-                create_time DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        self._get_conn().commit()
-
-    def create_publish_table(self):
-        # 创建发布配置表，如果不存在
-        self._get_cursor().execute("""
-            CREATE TABLE IF NOT EXISTS publish_config (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                nickname TEXT NOT NULL,
-                uid TEXT NOT NULL,
-                platform TEXT NOT NULL,
-                targets TEXT NOT NULL,
-                codes TEXT NOT NULL,
-                account_id TEXT NOT NULL,
-                create_time DATETIME DEFAULT CURRENT_TIMESTAMP
-                
-            )
-        """)
-        self._get_conn().commit()
-
-    def create_material_table(self):
-        # 创建素材表，如果不存在
-        self._get_cursor().execute("""
-            CREATE TABLE IF NOT EXISTS material (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                content TEXT NOT NULL,
-                image_list TEXT,
-                platform TEXT NOT NULL,
-                account_id TEXT NOT NULL,
-                nickname TEXT NOT NULL,
-                status INTEGER DEFAULT 0,
-                upload_time TEXT NOT NULL
-            )
-        """)
-        self._get_conn().commit()
+        """获取当前线程的连接"""
+        connections = getattr(self._local, "connections", None)
+        if connections is None:
+            connections = self._local.connections = {}
+        conn = connections.get(self.db_name)
+        if conn is None:
+            try:
+                conn = connections[self.db_name] = self._connect()
+            except Exception as e:
+                print(f"数据库连接初始化错误: {str(e)}")
+                raise
+        return conn
+
+    def _execute(self, sql, params=()):
+        return self._get_conn().execute(sql, params)
+
+    @contextmanager
+    def transaction(self):
+        """显式事务，支持嵌套（只有最外层提交）"""
+        conn = self._get_conn()
+        if conn.in_transaction:
+            yield conn
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
 
     def update_status(self):
         # 更新状态，如果 update_time 距离现在大于 30 天，status 设为已过期
         thirty_days_ago = datetime.now() - timedelta(days=30)
-        self._get_cursor().execute(
+        self._execute(
             """
             UPDATE account
             SET status = "已过期"
             WHERE create_time < ?
         """,
-            (thirty_days_ago,),
+            (thirty_days_ago.strftime("%Y-%m-%d %H:%M:%S"),),
         )
-        self._get_conn().commit()
 
     def insert_account(self, platform, nickname, uid, cookie):
-        # 检查 UID 是否存在
-        self._get_cursor().execute("SELECT COUNT(*) FROM account WHERE uid = ?", (uid,))
-        if self._get_cursor().fetchone()[0] > 0:
-            # 如果存在，更新账号信息
-            self.update_account(nickname, cookie, uid)
-            print("账号更新成功")
-        else:
-            # 如果不存在，插入新账号
-            self._get_cursor().execute(
-                """
-                INSERT INTO account (platform, nickname, uid, cookie)
-                VALUES (?, ?, ?, ?)
-            """,
-                (platform, nickname, uid, cookie),
-            )
-            self._get_conn().commit()
-            print("账号插入成功")
+        with self.transaction():
+            # 检查 UID 是否存在
+            exists = self._execute("SELECT 1 FROM account WHERE uid = ? LIMIT 1", (uid,)).fetchone()
+            if exists:
+                # 如果存在，更新账号信息
+                self.update_account(nickname, cookie, uid)
+                print("账号更新成功")
+            else:
+                # 如果不存在，插入新账号
+                self._execute(
+                    """
+                    INSERT INTO account (platform, nickname, uid, cookie)
+                    VALUES (?, ?, ?, ?)
+                """,
+                    (platform, nickname, uid, cookie),
+                )
+                print("账号插入成功")
 
     def get_accounts(self, uid):
-        self._get_cursor().execute("SELECT * FROM account WHERE uid = ?", (uid,))
-        return self._get_cursor().fetchall()
+        return self._execute("SELECT * FROM account WHERE uid = ?", (uid,)).fetchall()
 
     def update_account(self, nickname=None, cookie=None, uid=None):
         if nickname is not None and cookie is not None:
-            self._get_cursor().execute(
+            self._execute(
                 """
                 UPDATE account
                 SET nickname = ?, cookie = ?
@@ -148,52 +288,75 @@ class LocalData:
             """,
                 (nickname, cookie, uid),
             )
-            self._get_conn().commit()
         else:
             raise ValueError("platform, uid, nickname, and cookie must all be provided for update.")
 
     def delete_account(self, uid):
         """根据 UID 删除账号"""
-        self._get_cursor().execute("DELETE FROM account WHERE uid = ?", (uid,))
-        self._get_conn().commit()
+        self._execute("DELETE FROM account WHERE uid = ?", (uid,))
 
     def get_cooke(self, uid):
-        self._get_cursor().execute("SELECT cookie FROM account WHERE uid=?", (uid,))
-        cookie = self._get_cursor().fetchall()
+        cookie = self._execute("SELECT cookie FROM account WHERE uid=?", (uid,)).fetchall()
         return cookie[0][0]
 
     def save_publish_config(self, nickname, uid, platform, targets, codes, account_id):
-        # 检查 UID 是否存在
-        self._get_cursor().execute("SELECT COUNT(*) FROM publish_config WHERE uid = ?", (uid,))
-        if self._get_cursor().fetchone()[0] > 0:
-            # 如果存在，更新发布配置
-            self.update_publish_config(nickname, uid, platform, targets, codes, account_id)
-            print("发布配置更新成功")
-        else:
-            # 如果不存在，插入新配置
-            self._get_cursor().execute(
+        with self.transaction():
+            # 检查 UID 是否存在
+            exists = self._execute(
+                "SELECT 1 FROM publish_config WHERE uid = ? LIMIT 1", (uid,)
+            ).fetchone()
+            if exists:
+                # 如果存在，更新发布配置
+                self.update_publish_config(nickname, uid, platform, targets, codes, account_id)
+                print("发布配置更新成功")
+            else:
+                # 如果不存在，插入新配置
+                cursor = self._execute(
+                    """
+                    INSERT INTO publish_config (nickname, uid, platform, targets, codes, account_id)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                    (nickname, uid, platform, ",".join(targets), ",".join(codes), account_id),
+                )
+                self._replace_publish_targets([cursor.lastrowid], account_id, codes)
+                print("发布配置插入成功")
+
+    def update_publish_config(self, nickname, uid, platform, targets, codes, account_id):
+        with self.transaction():
+            self._execute(
                 """
-                INSERT INTO publish_config (nickname, uid, platform, targets, codes, account_id)
-                VALUES (?, ?, ?, ?, ?, ?)
+                UPDATE publish_config
+                SET nickname = ?, platform = ?, targets = ?, codes = ?, account_id = ?
+                WHERE uid = ?
             """,
-                (nickname, uid, platform, ",".join(targets), ",".join(codes), account_id),
+                (nickname, platform, ",".join(targets), ",".join(codes), account_id, uid),
             )
-            self._get_conn().commit()
-            print("发布配置插入成功")
-
-    def update_publish_config(self, nickname, uid, platform, targets, codes, account_id):
-        self._get_cursor().execute(
+            config_ids = [
+                row[0]
+                for row in self._execute("SELECT id FROM publish_config WHERE uid = ?", (uid,))
+            ]
+            self._replace_publish_targets(config_ids, account_id, codes)
+
+    def _replace_publish_targets(self, config_ids, account_id, codes):
+        """重建发布配置对应的 publish_target 行，需在事务中调用"""
+        conn = self._get_conn()
+        conn.executemany(
+            "DELETE FROM publish_target WHERE config_id = ?", [(_id,) for _id in config_ids]
+        )
+        conn.executemany(
             """
-            UPDATE publish_config
-            SET nickname = ?, platform = ?, targets = ?, codes = ?, account_id = ?
-            WHERE uid = ?
+            INSERT INTO publish_target (config_id, account_id, classify, position)
+            VALUES (?, ?, ?, ?)
         """,
-            (nickname, platform, ",".join(targets), ",".join(codes), account_id, uid),
+            [
+                (config_id, int(account_id), classify, position)
+                for config_id in config_ids
+                for position, classify in enumerate(codes)
+            ],
         )
-        self._get_conn().commit()
 
     def update_publish_config_pat(self, nickname, uid, platform, account_id):
-        self._get_cursor().execute(
+        self._execute(
             """
             UPDATE publish_config
             SET nickname = ?, uid = ?,platform = ?
@@ -201,25 +364,54 @@ class LocalData:
         """,
             (nickname, uid, platform, account_id),
         )
-        self._get_conn().commit()
 
     def delete_publish_config(self, account_id):
         """根据 account_id 删除账号"""
-        self._get_cursor().execute("DELETE FROM publish_config WHERE account_id = ?", (account_id,))
-        self._get_conn().commit()
+        self._execute("DELETE FROM publish_config WHERE account_id = ?", (account_id,))
 
     def get_publish_configs(self, uid):
-        self._get_cursor().execute("SELECT * FROM publish_config WHERE uid=?", (uid,))
-        return self._get_cursor().fetchall()
+        return self._execute("SELECT * FROM publish_config WHERE uid=?", (uid,)).fetchall()
 
     def get_publish_configs_all(self):
-        self._get_cursor().execute("SELECT * FROM publish_config ")
-        return self._get_cursor().fetchall()
+        return self._execute("SELECT * FROM publish_config ").fetchall()
+
+    def sync_platform_sources(self, platform_config):
+        """同步新闻平台分类源
+        Args:
+            platform_config: HotSpotService.PLATFORM_CONFIG 结构的平台列表
+        """
+        rows = [
+            (platform["name"], child["name"], child["code"], child["classify"])
+            for platform in platform_config
+            for child in platform.get("children", [])
+        ]
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM platform_source")
+            conn.executemany(
+                "INSERT INTO platform_source (platform, name, code, classify) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+
+    def get_monitor_tasks(self):
+        """按发布配置展开监控任务，每个账号每个目标分类下的所有平台分类源
+        Returns:
+            list: [{"platform": 平台名称, "code": 分类源代码, "account": 账号ID}]
+        """
+        rows = self._execute("""
+            SELECT DISTINCT s.platform, s.code, t.account_id
+            FROM publish_target t
+            JOIN platform_source s ON s.classify = t.classify
+            ORDER BY t.account_id, t.position
+        """).fetchall()
+        return [
+            {"platform": platform, "code": code, "account": account_id}
+            for platform, code, account_id in rows
+        ]
 
     def insert_material(self, title, content, image_list, platform, account_id, nickname):
-        """插入新的素材"""
+        """插入新的素材，image_list 为图片地址列表"""
         upload_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        self._get_cursor().execute(
+        cursor = self._execute(
             """
             INSERT INTO material (title, content, image_list, platform, account_id, nickname, upload_time)
             VALUES (?, ?, ?, ?, ?, ?, ?)
@@ -227,34 +419,99 @@ class LocalData:
             (
                 title,
                 content,
-                "===".join(image_list) if isinstance(image_list, list) else image_list,
+                json.dumps(image_list or []),
                 platform,
                 account_id,
                 nickname,
                 upload_time,
             ),
         )
-        self._get_conn().commit()
-        return self._get_cursor().lastrowid
+        return cursor.lastrowid
+
+    def insert_materials(self, materials):
+        """批量插入素材，在同一个事务中完成
+        Args:
+            materials: (title, content, image_list, platform, account_id, nickname) 列表
+        """
+        upload_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with self.transaction() as conn:
+            conn.executemany(
+                """
+                INSERT INTO material (title, content, image_list, platform, account_id, nickname, upload_time)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+                [
+                    (
+                        title,
+                        content,
+                        json.dumps(image_list or []),
+                        platform,
+                        account_id,
+                        nickname,
+                        upload_time,
+                    )
+                    for title, content, image_list, platform, account_id, nickname in materials
+                ],
+            )
 
     def get_material(self, material_id):
         """根据ID获取素材"""
-        self._get_cursor().execute("SELECT * FROM material WHERE id = ?", (material_id,))
-        return self._get_cursor().fetchone()
+        return self._execute("SELECT * FROM material WHERE id = ?", (material_id,)).fetchone()
 
     def get_materials(self, status=None):
         """获取所有素材，可选按状态筛选"""
         if status is not None:
-            self._get_cursor().execute(
+            cursor = self._execute(
                 "SELECT * FROM material WHERE status = ? ORDER BY upload_time DESC", (status,)
             )
         else:
-            self._get_cursor().execute("SELECT * FROM material ORDER BY upload_time DESC")
-        return self._get_cursor().fetchall()
+            cursor = self._execute("SELECT * FROM material ORDER BY upload_time DESC")
+        return cursor.fetchall()
+
+    def sync_account_mirror(self, accounts):
+        """用服务端账号列表覆盖本地账号镜像
+        Args:
+            accounts: get_account_list() 返回的账号列表
+        """
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM account_mirror")
+            conn.executemany(
+                "INSERT INTO account_mirror (id, platform, nickname) VALUES (?, ?, ?)",
+                [
+                    (
+                        account["id"],
+                        account.get("platform_value") or "",
+                        account.get("nickname") or "",
+                    )
+                    for account in accounts
+                ],
+            )
+
+    def get_account_materials(self, status=None, limit=None, offset=0):
+        """获取属于镜像账号的素材，按上传时间倒序，可选按状态筛选及分页"""
+        sql = "SELECT * FROM material WHERE account_id IN (SELECT id FROM account_mirror)"
+        params = []
+        if status is not None:
+            sql += " AND status = ?"
+            params.append(status)
+        sql += " ORDER BY upload_time DESC, id DESC"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += [limit, offset]
+        return self._execute(sql, params).fetchall()
+
+    def count_account_materials(self, status=None):
+        """统计属于镜像账号的素材数量"""
+        sql = "SELECT COUNT(*) FROM material WHERE account_id IN (SELECT id FROM account_mirror)"
+        params = []
+        if status is not None:
+            sql += " AND status = ?"
+            params.append(status)
+        return self._execute(sql, params).fetchone()[0]
 
     def update_material_status(self, material_id, status):
         """更新素材状态"""
-        self._get_cursor().execute(
+        self._execute(
             """
             UPDATE material
             SET status = ?
@@ -262,12 +519,10 @@ class LocalData:
         """,
             (status, material_id),
         )
-        self._get_conn().commit()
 
     def delete_material(self, material_id):
         """删除素材"""
-        self._get_cursor().execute("DELETE FROM material WHERE id = ?", (material_id,))
-        self._get_conn().commit()
+        self._execute("DELETE FROM material WHERE id = ?", (material_id,))
 
     def update_publish_limit(self, uid, limit):
         """更新账号发布量限制
@@ -276,16 +531,14 @@ class LocalData:
             limit: 发布量限制
         """
         try:
-            cursor = self._get_cursor()
-            cursor.execute(
+            self._execute(
                 """
-                UPDATE account 
-                SET publish_limit = ? 
+                UPDATE account
+                SET publish_limit = ?
                 WHERE uid = ?
             """,
                 (limit, uid),
             )
-            self._get_conn().commit()
             return True
         except Exception as e:
             print(f"更新发布量限制失败: {str(e)}")
@@ -299,21 +552,45 @@ class LocalData:
             int: 发布量限制
         """
         try:
-            cursor = self._get_cursor()
-            cursor.execute(
+            result = self._execute(
                 """
-                SELECT publish_limit 
-                FROM account 
+                SELECT publish_limit
+                FROM account
                 WHERE uid = ?
             """,
                 (uid,),
-            )
-            result = cursor.fetchone()
+            ).fetchone()
             return result[0] if result else 0
         except Exception as e:
             print(f"获取发布量限制失败: {str(e)}")
             return 0
 
+    def get_session_check(self, account_key):
+        """获取账号登录状态检查结果
+        Returns:
+            tuple: (fingerprint, valid, message, checked_at)，没有记录时返回 None
+        """
+        return self._execute(
+            """
+            SELECT fingerprint, valid, message, checked_at
+            FROM session_check
+            WHERE account_key = ?
+        """,
+            (account_key,),
+        ).fetchone()
+
+    def save_session_check(self, account_key, platform, fingerprint, valid, message, checked_at):
+        """保存账号登录状态检查结果"""
+        self._execute(
+            """
+            INSERT OR REPLACE INTO session_check
+            (account_key, platform, fingerprint, valid, message, checked_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """,
+            (account_key, platform, fingerprint, int(valid), message, checked_at),
+        )
+
     def close(self):
-        if hasattr(self._local, "conn") and self._local.conn is not None:
-            self._local.conn.close()
+        connections = getattr(self._local, "connections", None)
+        if connections and connections.get(self.db_name) is not None:
+            connections.pop(self.db_name).close()
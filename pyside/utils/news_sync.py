@@ -0,0 +1,104 @@
+"""
+新闻任务列表的本地镜像
+
+第一次同步按游标分页（cursor/size）下载后台返回的全部任务，之后只通过 since= 下载上次同步以来
+新增或修改的任务，按 id 合并。后台列表只返回近三天的任务，本地同样按创建时间清理过期的任务。
+
+since= 不会返回已删除的任务：本进程删除的任务通过 remove 立即移除，其他途径删除的任务
+在每 FULL_SYNC_INTERVAL 一次的全量同步时移除。
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+
+from api.api_all import get_news_list
+
+# 任务列表和热点页面用到的字段，大字段（正文、图片）不下载
+FIELDS = "id,account_name,account_uid,title,account_platform_name,status_value,created_at,updated_at"
+PAGE_SIZE = 500
+FULL_SYNC_INTERVAL = 10 * 60  # 全量同步间隔（秒）
+KEEP_DAYS = 3  # 与后台列表接口的时间范围一致
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+class NewsSync:
+    """按 id 保存任务列表，sync 返回同步后的任务列表（按创建时间倒序）"""
+
+    def __init__(self):
+        self._rows = {}
+        self._since = None  # 已同步到的最大 updated_at
+        self._full_synced = float("-inf")
+        self._lock = threading.Lock()
+
+    def sync(self):
+        with self._lock:
+            # 本地为空时没有 since 可用，直接全量同步
+            if self._since is None or time.monotonic() - self._full_synced >= FULL_SYNC_INTERVAL:
+                self._full_sync()
+            else:
+                self._merge(self._fetch({"since": self._since}))
+            self._prune()
+            return self.rows()
+
+    def rows(self):
+        return sorted(self._rows.values(), key=lambda r: (r["created_at"], r["id"]), reverse=True)
+
+    def remove(self, news_id):
+        with self._lock:
+            self._rows.pop(news_id, None)
+
+    def reset(self):
+        """切换账号后清空，下次 sync 重新全量同步"""
+        with self._lock:
+            self._rows = {}
+            self._since = None
+            self._full_synced = float("-inf")
+
+    def _full_sync(self):
+        rows = []
+        cursor = None
+        while True:
+            params = {"size": PAGE_SIZE}
+            if cursor:
+                params["cursor"] = cursor
+            page = self._fetch(params)
+            rows.extend(page["results"])
+            cursor = page["next"]
+            if not cursor:
+                break
+        self._rows = {}
+        self._since = None
+        self._merge(rows)
+        self._full_synced = time.monotonic()
+
+    def _fetch(self, params):
+        result = get_news_list({**params, "fields": FIELDS}, use_cache=False)
+        if result is None:
+            raise Exception("获取任务列表超时")
+        return result
+
+    def _merge(self, rows):
+        for row in rows:
+            self._rows[row["id"]] = row
+            # updated_at 精确到秒，取整后作为 since 会再次返回同一秒内的任务，按 id 合并不会重复
+            if self._since is None or row["updated_at"] > self._since:
+                self._since = row["updated_at"]
+
+    def _prune(self):
+        expired = (datetime.now() - timedelta(days=KEEP_DAYS)).strftime(TIME_FORMAT)
+        self._rows = {k: r for k, r in self._rows.items() if r["created_at"] >= expired}
+
+
+_news_sync = None
+_news_sync_lock = threading.Lock()
+
+
+def get_news_sync():
+    """进程内共享的任务列表镜像，任务中心和热点页面共用"""
+    global _news_sync
+    if _news_sync is None:
+        with _news_sync_lock:
+            if _news_sync is None:
+                _news_sync = NewsSync()
+    return _news_sync
@@ -5,9 +5,7 @@ import re
 import time
 
 import requests
-from openai import OpenAI
 from PIL import Image, ImageDraw, ImageFilter
-from zhipuai import ZhipuAI
 
 from utils.get_user_ope import user_opt
 
@@ -268,6 +266,10 @@ def add_frame(img, style):
 
 
 def get_img_key(content):
+    # 延迟导入模型 SDK，只在需要补充配图时加载
+    from openai import OpenAI
+    from zhipuai import ZhipuAI
+
     selected_model, api_key, _config = user_opt()
     if selected_model == "glm":
         client = ZhipuAI(api_key=api_key)  # 填写您自己的APIKey
@@ -0,0 +1,308 @@
+"""
+多账号并发发布调度
+
+- 同时运行的发布任务数按 CPU 核数和内存估算，不超过浏览器池的会话数
+- 同一账号的任务串行执行，多个账号轮流取任务
+- 每个账号每天的发布量不超过本地设置的 publish_limit（未设置时使用后台的 daily_publish_count），
+  达到上限的任务直接失败，留到第二天再处理；生产线程在生成文章前用 has_quota 检查，
+  没有额度的账号不再消耗模型额度
+- 同一账号两次发布之间按当天剩余时间和剩余额度均匀间隔，不在 ACTIVE_HOURS 之外发布
+- 任务因登录失效（SessionExpired）失败时，该账号排队中的任务直接失败，不再启动浏览器
+"""
+
+import ctypes
+import os
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from datetime import time as dtime
+
+from api.api_all import get_account_list, get_news_list
+from utils.local_data import LocalData
+from utils.session_check import SessionExpired
+
+MAX_PUBLISH_WORKERS = 4  # 与浏览器池的 max_sessions 保持一致
+BROWSER_MEMORY = 700 * 1024 * 1024  # 单个发布浏览器按 700MB 估算
+ACTIVE_HOURS = (7, 23)  # 每天允许发布的时间段
+MIN_PUBLISH_INTERVAL = 5 * 60  # 同一账号两次发布的最小间隔（秒）
+DEFAULT_DAILY_LIMIT = 15
+LIMIT_TTL = 10 * 60  # 账号发布上限的缓存时间（秒）
+
+
+class PublishLimitReached(Exception):
+    """账号当天发布数量已达上限"""
+
+
+def total_memory():
+    """物理内存字节数，获取失败返回 None"""
+    try:
+        if sys.platform == "win32":
+
+            class MemoryStatus(ctypes.Structure):
+                _fields_ = [
+                    ("dwLength", ctypes.c_ulong),
+                    ("dwMemoryLoad", ctypes.c_ulong),
+                    ("ullTotalPhys", ctypes.c_ulonglong),
+                    ("ullAvailPhys", ctypes.c_ulonglong),
+                    ("ullTotalPageFile", ctypes.c_ulonglong),
+                    ("ullAvailPageFile", ctypes.c_ulonglong),
+                    ("ullTotalVirtual", ctypes.c_ulonglong),
+                    ("ullAvailVirtual", ctypes.c_ulonglong),
+                    ("ullAvailExtendedVirtual", ctypes.c_ulonglong),
+                ]
+
+            status = MemoryStatus()
+            status.dwLength = ctypes.sizeof(MemoryStatus)
+            ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status))
+            return status.ullTotalPhys
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def default_workers():
+    """按 CPU 和内存估算可同时运行的浏览器数量"""
+    workers = max(1, (os.cpu_count() or 2) // 2)
+    memory = total_memory()
+    if memory:
+        # 最多使用一半内存运行发布浏览器
+        workers = min(workers, max(1, int(memory * 0.5 // BROWSER_MEMORY)))
+    return min(workers, MAX_PUBLISH_WORKERS)
+
+
+def load_daily_limit(account_id):
+    """账号每日发布上限，本地设置优先"""
+    account = next(
+        (a for a in get_account_list() or [] if str(a["id"]) == str(account_id)),
+        None,
+    )
+    if account is None:
+        return DEFAULT_DAILY_LIMIT
+    local_data = LocalData()
+    try:
+        local_limit = local_data.get_publish_limit(account["uid"])
+    finally:
+        local_data.close()
+    return local_limit or account.get("daily_publish_count") or DEFAULT_DAILY_LIMIT
+
+
+def load_published_today(account_id):
+    """账号今天已发布的数量"""
+    today = date.today().isoformat()
+    history = get_news_list({"account__id": account_id, "status": 2}, use_cache=False) or []
+    return sum(1 for h in history if (h.get("published_at") or "").startswith(today))
+
+
+class _AccountState:
+    def __init__(self, account_id):
+        self.account_id = account_id
+        self.queue = deque()  # (future, job, name)
+        self.running = False
+        self.day = None
+        self.published = 0
+        self.limit = None
+        self.limit_loaded_at = 0
+        self.next_at = 0
+        self.last_started = 0
+
+
+class PublishScheduler:
+    """
+    发布任务调度器
+
+    Args:
+        max_workers: 同时运行的任务数，默认按 CPU 和内存估算
+        limit_loader: limit_loader(account_id) -> 每日上限
+        count_loader: count_loader(account_id) -> 今天已发布数量
+        active_hours: (开始小时, 结束小时)
+        min_interval: 同一账号两次发布的最小间隔（秒）
+    """
+
+    def __init__(
+        self,
+        max_workers=None,
+        limit_loader=load_daily_limit,
+        count_loader=load_published_today,
+        active_hours=ACTIVE_HOURS,
+        min_interval=MIN_PUBLISH_INTERVAL,
+    ):
+        self.max_workers = max_workers or default_workers()
+        self.limit_loader = limit_loader
+        self.count_loader = count_loader
+        self.active_hours = active_hours
+        self.min_interval = min_interval
+        self._accounts = {}
+        self._running_count = 0
+        self._cond = threading.Condition()
+        self._closed = False
+        self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="publish")
+        self._dispatcher = threading.Thread(target=self._dispatch, daemon=True)
+        self._dispatcher.start()
+
+    def submit(self, account_id, job, name=""):
+        """
+        提交发布任务，返回 Future
+
+        Args:
+            account_id: 账号ID，同一账号的任务串行执行
+            job: 无参数的可调用对象，返回发布结果（dict 含 status 或 bool）
+            name: 任务名称，用于日志
+        """
+        future = Future()
+        state = self._load_state(account_id)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("发布调度器已关闭")
+            state.queue.append((future, job, name))
+            self._cond.notify_all()
+        return future
+
+    def has_quota(self, account_id):
+        """
+        账号今天是否还能再提交一篇，已发布、排队中和正在发布的任务都计入额度
+
+        在生产内容前调用，没有额度时跳过该任务，不生成文章、不下载图片
+        """
+        state = self._load_state(account_id)
+        with self._cond:
+            if state.limit is None:
+                return True
+            used = state.published + len(state.queue) + int(state.running)
+            return used < state.limit
+
+    def next_publish_time(self, account_id):
+        """账号下一次可以发布的时间"""
+        state = self._accounts.get(account_id)
+        if state is None or not state.next_at:
+            return None
+        return datetime.fromtimestamp(state.next_at)
+
+    def _load_state(self, account_id):
+        """在提交线程中加载账号上限和今日发布量，避免网络请求阻塞调度"""
+        with self._cond:
+            state = self._accounts.setdefault(account_id, _AccountState(account_id))
+            today = date.today()
+            stale_limit = time.time() - state.limit_loaded_at > LIMIT_TTL
+            stale_count = state.day != today
+        if stale_limit:
+            limit = self.limit_loader(account_id)
+            with self._cond:
+                state.limit, state.limit_loaded_at = limit, time.time()
+        if stale_count:
+            published = self.count_loader(account_id)
+            with self._cond:
+                state.day, state.published = today, published
+        return state
+
+    def _window(self, day):
+        midnight = datetime.combine(day, dtime())
+        start = midnight + timedelta(hours=self.active_hours[0])
+        end = midnight + timedelta(hours=self.active_hours[1])
+        return start.timestamp(), end.timestamp()
+
+    def _earliest_start(self, state, now):
+        """账号下一个任务最早的开始时间"""
+        start, end = self._window(date.today())
+        if now >= end:
+            start, _ = self._window(date.today() + timedelta(days=1))
+        return max(state.next_at, start)
+
+    def _dispatch(self):
+        with self._cond:
+            while not self._closed:
+                timeout = None
+                now = time.time()
+                # 最久没有开始任务的账号优先
+                for state in sorted(self._accounts.values(), key=lambda s: s.last_started):
+                    while state.queue and state.queue[0][0].cancelled():
+                        state.queue.popleft()
+                    if state.running or not state.queue:
+                        continue
+                    if state.day != date.today():
+                        # 跨天后重新计数，额度以本地记录为准
+                        state.day, state.published, state.next_at = date.today(), 0, 0
+                    if state.limit is not None and state.published >= state.limit:
+                        while state.queue:
+                            future, _, _ = state.queue.popleft()
+                            if future.set_running_or_notify_cancel():
+                                future.set_exception(
+                                    PublishLimitReached(f"今日已发布 {state.published} 篇")
+                                )
+                        continue
+                    start_at = self._earliest_start(state, now)
+                    if start_at > now:
+                        wait = start_at - now
+                        timeout = wait if timeout is None else min(timeout, wait)
+                        continue
+                    if self._running_count >= self.max_workers:
+                        break
+                    future, job, name = state.queue.popleft()
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    state.running = True
+                    state.last_started = now
+                    self._running_count += 1
+                    self._executor.submit(self._execute, state, future, job)
+                self._cond.wait(timeout)
+
+    def _execute(self, state, future, job):
+        try:
+            result = job()
+        except BaseException as e:
+            future.set_exception(e)
+            result = None
+        else:
+            future.set_result(result)
+        published = result is True or (isinstance(result, dict) and bool(result.get("status")))
+        with self._cond:
+            state.running = False
+            self._running_count -= 1
+            if isinstance(future.exception(), SessionExpired):
+                while state.queue:
+                    queued, _, _ = state.queue.popleft()
+                    if queued.set_running_or_notify_cancel():
+                        queued.set_exception(future.exception())
+            if published:
+                state.published += 1
+                state.next_at = self._next_publish_at(state, time.time())
+            self._cond.notify_all()
+
+    def _next_publish_at(self, state, now):
+        """把剩余额度均匀分布到当天剩余的发布时间内"""
+        remaining = (state.limit or DEFAULT_DAILY_LIMIT) - state.published
+        _, end = self._window(date.today())
+        if remaining <= 0 or now >= end:
+            return now
+        return now + max(self.min_interval, (end - now) / remaining)
+
+    def shutdown(self):
+        """取消排队中的任务，不等待正在运行的任务"""
+        with self._cond:
+            self._closed = True
+            for state in self._accounts.values():
+                while state.queue:
+                    state.queue.popleft()[0].cancel()
+            self._cond.notify_all()
+        self._executor.shutdown(wait=False)
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_publish_scheduler():
+    """进程内共享的发布调度器，各发布线程共用并发额度和账号串行约束"""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = PublishScheduler()
+    return _scheduler
+
+
+def shutdown_publish_scheduler():
+    if _scheduler is not None:
+        _scheduler.shutdown()
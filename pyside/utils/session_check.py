@@ -0,0 +1,146 @@
+"""
+发布账号登录状态检查
+
+用账号保存的 cookie 直接请求各平台一个需要登录的轻量接口，判断登录是否已失效，
+在启动浏览器、生产内容之前跳过失效的账号。
+
+- 检查结果按账号保存在本地 session_check 表中，有效结果缓存 SESSION_TTL，
+  失效结果缓存 EXPIRED_TTL；cookie 变化（重新绑定账号）后缓存自动失效
+- 只有平台明确返回未登录时才判定为失效，网络错误或无法识别的响应视为未知，不阻止发布
+"""
+
+import threading
+import time
+
+import requests
+
+from auto_browser.browser_pool import cookie_fingerprint
+from utils.local_data import LocalData
+
+SESSION_TTL = 30 * 60
+EXPIRED_TTL = 10 * 60
+CHECK_TIMEOUT = 8
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/130.0.0.0 Safari/537.36"
+)
+
+_locks = {}
+_locks_guard = threading.Lock()
+
+
+class SessionExpired(Exception):
+    """账号登录已失效，需要重新绑定"""
+
+
+def _json(response):
+    try:
+        return response.json()
+    except ValueError:
+        return None
+
+
+def check_toutiao(session):
+    response = session.get(
+        "https://mp.toutiao.com/mp/agw/media/get_media_info", timeout=CHECK_TIMEOUT
+    )
+    data = _json(response)
+    if not isinstance(data, dict):
+        return None, f"HTTP {response.status_code}"
+    if data.get("code") == 0 and data.get("data"):
+        return True, ""
+    return False, data.get("message") or "未登录"
+
+
+def check_baijiahao(session):
+    response = session.get("https://baijiahao.baidu.com/builder/app/appinfo", timeout=CHECK_TIMEOUT)
+    data = _json(response)
+    if not isinstance(data, dict) or "errno" not in data:
+        return None, f"HTTP {response.status_code}"
+    if data["errno"] == 0:
+        return True, ""
+    return False, data.get("errmsg") or "未登录"
+
+
+def check_weixin(session):
+    # 已登录时首页跳转到带 token 的后台首页，未登录时返回登录页
+    response = session.get(
+        "https://mp.weixin.qq.com/", timeout=CHECK_TIMEOUT, allow_redirects=False
+    )
+    location = response.headers.get("Location", "")
+    if response.is_redirect and "token=" in location:
+        return True, ""
+    if response.status_code == 200:
+        return False, "未登录"
+    return None, f"HTTP {response.status_code}"
+
+
+# 企鹅号没有可用的轻量接口，不做检查
+CHECKERS = {
+    "头条号": check_toutiao,
+    "百家号": check_baijiahao,
+    "微信公众号": check_weixin,
+}
+
+
+def _account_lock(account_key):
+    with _locks_guard:
+        return _locks.setdefault(account_key, threading.Lock())
+
+
+def _request_session(cookie):
+    session = requests.Session()
+    session.headers["User-Agent"] = USER_AGENT
+    for ck in cookie or []:
+        session.cookies.set(
+            ck["name"], ck["value"], domain=ck.get("domain", ""), path=ck.get("path", "/")
+        )
+    return session
+
+
+def check_session(account_key, platform_, cookie, use_cache=True):
+    """
+    检查账号登录状态
+
+    Args:
+        account_key: 账号标识（账号ID）
+        platform_: 发布平台
+        cookie: 账号 cookie 列表
+        use_cache: 是否使用本地缓存的检查结果
+
+    Returns:
+        tuple: (valid, message)，valid 为 True/False，无法判断时为 None
+    """
+    checker = CHECKERS.get(platform_)
+    if checker is None:
+        return None, "不支持检查"
+    account_key = str(account_key)
+    fingerprint = cookie_fingerprint(cookie)
+    local_data = LocalData()
+    # 同一账号并发检查时只请求一次
+    with _account_lock(account_key):
+        if use_cache:
+            cached = local_data.get_session_check(account_key)
+            if cached and cached[0] == fingerprint:
+                _, valid, message, checked_at = cached
+                ttl = SESSION_TTL if valid else EXPIRED_TTL
+                if time.time() - checked_at < ttl:
+                    return bool(valid), message
+        try:
+            with _request_session(cookie) as session:
+                valid, message = checker(session)
+        except requests.RequestException as e:
+            return None, f"{e.__class__.__name__}"
+        if valid is not None:
+            local_data.save_session_check(
+                account_key, platform_, fingerprint, valid, message, time.time()
+            )
+    return valid, message
+
+
+def ensure_session(account_key, platform_, cookie):
+    """登录已失效时抛出 SessionExpired"""
+    valid, message = check_session(account_key, platform_, cookie)
+    if valid is False:
+        raise SessionExpired(f"{platform_}账号登录已失效：{message}")
@@ -3,6 +3,7 @@ import random
 import shutil
 import time
 from datetime import datetime
+from functools import partial
 
 from api.api_all import (
     create_news,
@@ -13,7 +14,6 @@ from api.api_all import (
     partial_update_news,
     token_report,
 )
-from auto_browser.auto_base import AutoTools
 from crawlers.spider_all import (
     get_lsit,
     get_lsit_info,
@@ -24,7 +24,10 @@ from utils.article_product import article_create
 from utils.get_user_ope import user_opt
 from utils.hot_spot_service import HotSpotService
 from utils.local_data import LocalData
+from utils.news_sync import get_news_sync
 from utils.precess_image import precess_image
+from utils.publish_scheduler import PublishLimitReached, get_publish_scheduler
+from utils.session_check import SessionExpired, check_session, ensure_session
 from utils.token_check import check_user_token
 
 
@@ -58,7 +61,8 @@ class TaskService:
 
     def _init_mock_data(self):
         """初始化模拟数据"""
-        results = get_news_list()
+        # 首次全量下载，之后只下载新增或修改的任务
+        results = get_news_sync().sync()
         self._tasks = [
             {
                 "id": item["id"],
@@ -79,34 +83,41 @@ class TaskService:
             status: 任务状态过滤
         """
         self._init_mock_data()
+        return self.filter_tasks(status)
+
+    def filter_tasks(self, status=None):
+        """按状态筛选已加载的任务，不重新请求"""
         if status and status != "全部":
             return [t for t in self._tasks if t["status"] == status]
         return self._tasks
 
+    def set_task_status(self, task_id, status):
+        """
+        更新已加载任务的状态
+
+        Returns:
+            bool: 任务是否在已加载的列表中
+        """
+        for index, task in enumerate(self._tasks):
+            if task["id"] == task_id:
+                # 替换为新字典，表格模型据此识别发生变化的行
+                self._tasks[index] = {**task, "status": status}
+                return True
+        return False
+
     def cancel_task(self, task_id):
         """取消任务"""
         delete_news(task_id)
+        get_news_sync().remove(task_id)
 
     def start_monitor_task(self, log):
         """启动新闻监控任务"""
         # TODO: 实现新闻监控任务
         # 获取分类
         local_data = LocalData()
-        accounts = local_data.get_publish_configs_all()
+        local_data.sync_platform_sources(HotSpotService.PLATFORM_CONFIG)
         log.append_log("获取新闻监控配置")
-        task = []
-        for item in accounts:
-            account = item[6]
-            targets = item[5]
-            for info in HotSpotService.PLATFORM_CONFIG:
-                platform = info["name"]
-                for c in info["children"]:
-                    if c["classify"] in targets:
-                        code = c["code"]
-                        dict_ = {"platform": platform, "code": code, "account": account}
-                        task.append(dict_)
-
-        return task
+        return local_data.get_monitor_tasks()
 
     def start_production_task(self, log, item):
         """启动任务生产任务"""
@@ -118,6 +129,16 @@ class TaskService:
             if is_publish:
                 log.append_log("加载任务")
                 log.append_log(f"任务平台：{item['platform']}")
+                if not self.has_publish_quota(item["account"]):
+                    log.append_log("账号今日发布数量已达上限，明天继续发布")
+                    return
+                # 生产内容前先确认账号登录有效，失效账号不消耗模型额度和浏览器时间
+                cookie = get_account_info(item["account"])["cookie"]
+                valid, message = check_session(item["account"], item["platform"], cookie)
+                if valid is False:
+                    self.cancel_task(item["id"])
+                    log.append_log(f"账号登录已失效，请重新绑定账号：{message}")
+                    return
                 topic = item["title"] + "\n" + item["article_info"]
                 log.append_log("开始生产内容")
                 is_create, article = self.produce_content(
@@ -129,13 +150,17 @@ class TaskService:
                 if len(img_l) == 3:
                     if is_create:
                         log.append_log("检测到文章已经生成，获取文章")
-                        cookies = get_account_info(item["account"])
-                        cookie = cookies["cookie"]
                         log.append_log("开始发布，等待浏览器启动")
-                        self.publish_content(
-                            article, cookie, img_list, item["platform"], item["id"]
+                        future = self.submit_publish(
+                            article, cookie, img_list, item["platform"], item["id"], item["account"]
                         )
-                        log.append_log("发布成功")
+                        try:
+                            future.result()
+                            log.append_log("发布成功")
+                        except PublishLimitReached:
+                            log.append_log("账号今日发布数量已达上限，明天继续发布")
+                        except SessionExpired as e:
+                            log.append_log(str(e))
                         log.append_log("清除缓存")
                     else:
                         print("删除任务")
@@ -228,11 +253,16 @@ class TaskService:
             print(f"Error in produce_content: {str(e)}")
             return False, None
 
-    def publish_content(self, article, cookie, img_list, platform, _id):
-        """发布内容"""
+    def publish_content(self, article, cookie, img_list, platform, _id, account_id=None):
+        """发布内容，账号登录已失效时抛出 SessionExpired，任务保留"""
         # TODO: 实现内容发布逻辑
+        # 延迟导入浏览器自动化模块，打开任务页面时不加载 selenium
+        from auto_browser.auto_base import AutoTools
+
+        if account_id is not None:
+            ensure_session(account_id, platform, cookie)
         publish_tool = AutoTools()
-        result = publish_tool.publish(cookie, article, platform, img_list)
+        result = publish_tool.publish(cookie, article, platform, img_list, account_id)
 
         # 获取当前日期和时间
         now = datetime.now()
@@ -246,6 +276,30 @@ class TaskService:
             # partial_update_news(_id, {"status": 3,"published_at":now.strftime("%Y-%m-%d %H:%M:%S")})
         return result
 
+    def has_publish_quota(self, account_id):
+        """账号今天是否还有发布额度，没有额度时不必生产内容"""
+        return get_publish_scheduler().has_quota(account_id)
+
+    def submit_publish(self, article, cookie, img_list, platform, _id, account_id):
+        """加入发布调度队列，同一账号的发布串行执行，返回 Future
+
+        标题清理、正文分段和图片编码在任务开始执行、借出浏览器之前完成，
+        排队期间不保存编码后的图片
+
+        Args:
+            article: 文章内容
+            cookie: 账号 cookie
+            img_list: 图片目录
+            platform: 发布平台
+            _id: 文章ID
+            account_id: 账号ID
+        """
+        return get_publish_scheduler().submit(
+            account_id,
+            partial(self.publish_content, article, cookie, img_list, platform, _id, account_id),
+            name=f"{platform}_{_id}",
+        )
+
     def start_auto_publish_task(self, log):
         """启动一键托管任务"""
         log.append_log("托管启动")
@@ -0,0 +1,103 @@
+"""
+增量更新清单
+
+清单（manifest.json）记录发布目录中每个文件的 sha256 和大小，与各文件一起上传到同一目录：
+
+    {
+        "version": "1.2.0",
+        "files": {
+            "main.exe": {"sha256": "…", "size": 123456},
+            "docs/logo.png": {"sha256": "…", "size": 2048}
+        }
+    }
+
+客户端只下载与本地不一致的文件，安装完成后把清单保存为程序目录下的 manifest.json，
+下次更新时据此删除新版本中已不存在的文件。
+
+生成清单（在 pyside 目录下执行，打包完成后）:
+    python -m utils.update_manifest output --version 1.2.0
+"""
+
+import argparse
+import hashlib
+import json
+import os
+from pathlib import Path
+from urllib.parse import quote, urljoin
+
+MANIFEST_NAME = "manifest.json"
+# 用户数据和更新过程中的临时文件，不写入清单，更新时也不会覆盖或删除
+EXCLUDED = {MANIFEST_NAME, ".update", "temp", "localData.db", ".env", "opt.json", "update.log"}
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def safe_path(root, rel_path):
+    """清单中的相对路径转换为 root 下的路径，路径越出 root 时抛出 ValueError"""
+    root = Path(root).resolve()
+    path = (root / rel_path).resolve()
+    if root not in path.parents:
+        raise ValueError(f"清单中的路径无效: {rel_path}")
+    return path
+
+
+def build_manifest(app_dir, version):
+    """按发布目录生成清单"""
+    app_dir = Path(app_dir)
+    files = {}
+    for path in sorted(app_dir.rglob("*")):
+        rel_path = path.relative_to(app_dir)
+        if not path.is_file() or rel_path.parts[0] in EXCLUDED:
+            continue
+        files[rel_path.as_posix()] = {"sha256": file_sha256(path), "size": path.stat().st_size}
+    return {"version": version, "files": files}
+
+
+def changed_files(manifest, app_dir):
+    """
+    与本地文件不一致的文件
+
+    Returns:
+        list[tuple[str, dict]]: (相对路径, 清单中的文件信息)
+    """
+    changed = []
+    for rel_path, entry in manifest["files"].items():
+        path = safe_path(app_dir, rel_path)
+        # 大小不同时不必计算哈希
+        if (
+            not path.is_file()
+            or path.stat().st_size != entry["size"]
+            or file_sha256(path) != entry["sha256"]
+        ):
+            changed.append((rel_path, entry))
+    return changed
+
+
+def file_url(manifest_url, rel_path):
+    """文件与清单位于同一目录"""
+    return urljoin(manifest_url, quote(rel_path))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="生成增量更新清单")
+    parser.add_argument("app_dir", help="打包输出目录")
+    parser.add_argument("--version", required=True, help="版本号")
+    args = parser.parse_args()
+
+    manifest = build_manifest(args.app_dir, args.version)
+    with open(os.path.join(args.app_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    total = sum(entry["size"] for entry in manifest["files"].values())
+    print(
+        f"已生成 {MANIFEST_NAME}: {len(manifest['files'])} 个文件，共 {total / 1024 / 1024:.1f} MB"
+    )
+
+
+if __name__ == "__main__":
+    main()
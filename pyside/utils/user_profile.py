@@ -0,0 +1,89 @@
+"""
+用户资料缓存
+
+- 用户资料保存在 QSettings 中，主窗口启动时先用缓存显示，后台请求到最新资料后再刷新
+- 头像按 URL 缓存在 temp/avatar 目录，同时记录 ETag，再次下载时带 If-None-Match，
+  未变化（304）时直接使用本地文件
+- 切换、退出账号时清除缓存的资料
+"""
+
+import hashlib
+import json
+import os
+
+import requests
+from PySide6.QtCore import QSettings
+
+PROFILE_KEY = "user_profile"
+AVATAR_DIR = os.path.join("temp", "avatar")
+AVATAR_TIMEOUT = 10
+
+
+def load_profile():
+    """缓存的用户资料，没有时返回空字典"""
+    settings = QSettings("AiMedia", "ai-media")
+    try:
+        return json.loads(settings.value(PROFILE_KEY, "") or "{}")
+    except ValueError:
+        return {}
+
+
+def save_profile(profile):
+    settings = QSettings("AiMedia", "ai-media")
+    settings.setValue(PROFILE_KEY, json.dumps(profile, ensure_ascii=False))
+
+
+def clear_profile():
+    settings = QSettings("AiMedia", "ai-media")
+    settings.remove(PROFILE_KEY)
+
+
+def _avatar_path(url):
+    return os.path.join(AVATAR_DIR, hashlib.sha1(url.encode("utf-8")).hexdigest())
+
+
+def cached_avatar(url):
+    """URL 对应的本地头像文件，未缓存时返回 None"""
+    if not url:
+        return None
+    path = _avatar_path(url)
+    return path if os.path.exists(path) else None
+
+
+def fetch_avatar(url):
+    """
+    下载头像，ETag 未变化时使用缓存
+
+    Returns:
+        str | None: 本地头像路径，下载失败且没有缓存时返回 None
+    """
+    if not url:
+        return None
+    path = _avatar_path(url)
+    etag_path = path + ".etag"
+    headers = {}
+    if os.path.exists(path) and os.path.exists(etag_path):
+        with open(etag_path, encoding="utf-8") as f:
+            headers["If-None-Match"] = f.read().strip()
+    try:
+        response = requests.get(url, headers=headers, timeout=AVATAR_TIMEOUT)
+    except requests.RequestException as e:
+        print(f"头像下载失败: {e}")
+        return cached_avatar(url)
+    if response.status_code == 304:
+        return path
+    if response.status_code != 200 or not response.content:
+        return cached_avatar(url)
+
+    os.makedirs(AVATAR_DIR, exist_ok=True)
+    # 先写临时文件再替换，界面线程不会读到写了一半的图片
+    with open(path + ".tmp", "wb") as f:
+        f.write(response.content)
+    os.replace(path + ".tmp", path)
+    etag = response.headers.get("ETag")
+    if etag:
+        with open(etag_path, "w", encoding="utf-8") as f:
+            f.write(etag)
+    elif os.path.exists(etag_path):
+        os.remove(etag_path)
+    return path
@@ -355,15 +355,6 @@ class LoginWindow(QMainWindow):
         from views.main_window import MainWindow
 
         self.main_window = MainWindow()
-
-        # 设置测试用户信息
-        self.main_window.update_user_info(
-            nickname="测试用户",
-            avatar_path="docs/default_avatar.png",
-            is_vip=True,
-            vip_expire_date="2024-12-31",
-        )
-
         self.main_window.show()
         self.close()
 
@@ -1,36 +1,48 @@
+import importlib
 import json
 import logging
 import sys
 from pathlib import Path
 
-import requests
-from PySide6.QtCore import Qt, QTimer
-from PySide6.QtGui import QFont, QIcon, QPixmap
+from PySide6.QtCore import Qt, QThreadPool, QTimer
+from PySide6.QtGui import QCursor, QFont, QIcon, QPixmap
 from PySide6.QtWidgets import (
     QApplication,
     QHBoxLayout,
     QLabel,
     QMainWindow,
     QMessageBox,
+    QProgressDialog,
     QPushButton,
     QStackedWidget,
     QVBoxLayout,
     QWidget,
 )
 
-from api.api_all import get_user
-from components.account_manager_widget import AccountManagerWidget
-from components.auto_publish_widget import AutoPublishWidget
-from components.help_widget import HelpWidget
-from components.hot_spot_widget import HotSpotWidget
-from components.material_import_widget import MaterialImportWidget
-from components.model_config_widget import ModelConfigWidget
-from components.notice_widget import NoticeWidget
-from components.task_center_widget import TaskCenterWidget
+from api.api_all import invalidate_cache
 from components.user_info_widget import UserInfoWidget
-from components.vip_widget import VipWidget
+from threads.push_thread import PushThread
+from threads.update_download_thread import UpdateDownloadThread
+from threads.user_info_loader import UserInfoLoaderSignals, UserInfoLoadTask
 from utils.auto_updater import AutoUpdater
 from utils.notice_service import NoticeService
+from utils.user_profile import cached_avatar, load_profile
+
+# 导航页面 (标题, 模块, 类名)，按索引顺序排列；页面在第一次打开时才导入模块并创建，
+# 启动时不加载爬虫、selenium、模型 SDK 等依赖
+PAGES = [
+    ("实时热点", "components.hot_spot_widget", "HotSpotWidget"),
+    ("账号管理", "components.account_manager_widget", "AccountManagerWidget"),
+    ("任务中心", "components.task_center_widget", "TaskCenterWidget"),
+    ("一键托管", "components.auto_publish_widget", "AutoPublishWidget"),
+    ("模型配置", "components.model_config_widget", "ModelConfigWidget"),
+    ("素材导入", "components.material_import_widget", "MaterialImportWidget"),
+    ("指导通知", "components.notice_widget", "NoticeWidget"),
+    ("开通会员", "components.vip_widget", "VipWidget"),
+    ("使用帮助", "components.help_widget", "HelpWidget"),
+]
+TASK_PAGE = 2
+NOTICE_PAGE = 6
 
 
 class MainWindow(QMainWindow):
@@ -43,6 +55,9 @@ class MainWindow(QMainWindow):
 
         super().__init__()
 
+        self.pages = {}
+        self.first_painted = False
+
         # 加载版本信息
         try:
             if getattr(sys, "frozen", False):
@@ -61,21 +76,12 @@ class MainWindow(QMainWindow):
 
         # 初始化自动更新器
         self.updater = AutoUpdater(current_version=self.current_version, app_name="AiMedia")
+        self.update_thread = None
+        self.prompted_version = None
 
         # 初始化通知服务
         self.notice_service = NoticeService()
 
-        # 设置定时检查更新
-        self.update_timer = QTimer(self)
-        self.update_timer.timeout.connect(self.check_for_updates)
-        # 设置为每小时检查一次（3600000毫秒）
-        self.update_timer.start(3600000)
-
-        # 设置定时检查通知
-        self.notice_timer = QTimer(self)
-        self.notice_timer.timeout.connect(self.update_notice_badge)
-        self.notice_timer.start(1800000)  # 每30分钟检查一次 (30 * 60 * 1000 毫秒)
-
         # 设置Qt文本渲染
         self.setAttribute(Qt.WA_TranslucentBackground, False)
         self.setAttribute(Qt.WA_OpaquePaintEvent, True)
@@ -86,11 +92,21 @@ class MainWindow(QMainWindow):
 
         self.init_ui()
 
-        # 设置默认用户信息
+        # 先显示缓存的用户信息，后台获取到最新资料和头像后再刷新
+        self.profile = {}
+        self.user_info_signals = UserInfoLoaderSignals()
+        self.user_info_signals.profile_loaded.connect(self.show_user_info)
+        self.user_info_signals.avatar_loaded.connect(self.on_avatar_loaded)
+        self.show_user_info(load_profile())
         self.update_user_info()
 
-        # 首次检查更新
-        QTimer.singleShot(5000, self.check_for_updates)  # 启动5秒后检查更新
+        # 公告、版本和任务状态由后台推送，推送不可用时该线程改为轮询
+        self.push_thread = PushThread(self.updater)
+        self.push_thread.notice_signal.connect(self.set_notice_badge)
+        self.push_thread.version_signal.connect(self.prompt_update)
+        self.push_thread.task_signal.connect(self.on_task_status)
+        QApplication.instance().aboutToQuit.connect(self.push_thread.stop)
+        self.push_thread.start()
 
     def init_ui(self):
         """初始化UI"""
@@ -217,12 +233,9 @@ class MainWindow(QMainWindow):
         # 创建左侧导航栏
         self.create_sidebar(main_layout)
 
-        # 创建右侧内容区
+        # 创建右侧内容区，默认页面在窗口首次绘制后创建（见 paintEvent）
         self.create_content_area(main_layout)
 
-        # 设置默认显示的页面
-        self.stacked_widget.setCurrentIndex(0)
-
     def create_sidebar(self, main_layout):
         """创建左侧导航栏"""
         sidebar = QWidget()
@@ -244,17 +257,7 @@ class MainWindow(QMainWindow):
 
         # 导航按钮
         self.nav_buttons = []
-        nav_items = [
-            {"text": "实时热点", "icon": ""},
-            {"text": "账号管理", "icon": ""},
-            {"text": "任务中心", "icon": ""},
-            {"text": "一键托管", "icon": ""},
-            {"text": "模型配置", "icon": ""},
-            {"text": "素材导入", "icon": ""},
-            {"text": "指导通知", "icon": ""},
-            {"text": "开通会员", "icon": ""},
-            {"text": "使用帮助", "icon": ""},
-        ]
+        nav_items = [{"text": title, "icon": ""} for title, _, _ in PAGES]
 
         for i, item in enumerate(nav_items):
             btn_container = QWidget()
@@ -297,9 +300,6 @@ class MainWindow(QMainWindow):
         sidebar_layout.addStretch()
         main_layout.addWidget(sidebar)
 
-        # 初始化通知红点
-        self.update_notice_badge()
-
     def create_content_area(self, main_layout):
         """创建右侧内容区"""
         content_area = QWidget()
@@ -315,7 +315,7 @@ class MainWindow(QMainWindow):
         title_layout.setContentsMargins(20, 0, 20, 0)
 
         # 页面标题
-        self.page_title = QLabel("实时热点")
+        self.page_title = QLabel(PAGES[0][0])
         self.page_title.setObjectName("page_title")
         title_layout.addWidget(self.page_title)
 
@@ -325,34 +325,17 @@ class MainWindow(QMainWindow):
         # 添加用户信息组件
         self.user_info_widget = UserInfoWidget()
         self.user_info_widget.setObjectName("user_info")
+        # 弹出框的信号由 UserInfoWidget 转发，只在这里连接一次
+        self.user_info_widget.logout_clicked.connect(self.handle_logout)
+        self.user_info_widget.recharge_clicked.connect(self.handle_recharge)
         title_layout.addWidget(self.user_info_widget)
 
         content_layout.addWidget(title_bar)
 
-        # 创建堆叠窗口
+        # 创建堆叠窗口，先放入空白占位页，打开时再替换为实际页面
         self.stacked_widget = QStackedWidget()
-
-        # 创建各个页面
-        self.hot_spot_page = HotSpotWidget()
-        self.account_page = AccountManagerWidget()
-        self.task_page = TaskCenterWidget()
-        self.auto_page = AutoPublishWidget()
-        self.model_page = ModelConfigWidget()
-        self.material_page = MaterialImportWidget()
-        self.create_notice_page()  # 使用create_notice_page方法创建通知页面
-        self.vip_page = VipWidget()
-        self.help_page = HelpWidget()
-
-        # 将页面添加到堆叠窗口
-        self.stacked_widget.addWidget(self.hot_spot_page)  # 索引 0
-        self.stacked_widget.addWidget(self.account_page)  # 索引 1
-        self.stacked_widget.addWidget(self.task_page)  # 索引 2
-        self.stacked_widget.addWidget(self.auto_page)  # 索引 3
-        self.stacked_widget.addWidget(self.model_page)  # 索引 4
-        self.stacked_widget.addWidget(self.material_page)  # 索引 5
-        self.stacked_widget.addWidget(self.notice_widget)  # 索引 6
-        self.stacked_widget.addWidget(self.vip_page)  # 索引 7
-        self.stacked_widget.addWidget(self.help_page)  # 索引 8
+        for _ in PAGES:
+            self.stacked_widget.addWidget(QWidget())
 
         content_layout.addWidget(self.stacked_widget)
         main_layout.addWidget(content_area)
@@ -366,56 +349,69 @@ class MainWindow(QMainWindow):
         self.nav_buttons[index].setChecked(True)
 
         # 切换到对应的页面
+        page = self.page(index)
         self.stacked_widget.setCurrentIndex(index)
 
         # 更新页面标题
-        titles = [
-            "实时热点",
-            "账号管理",
-            "任务中心",
-            "一键托管",
-            "模型配置",
-            "素材导入",
-            "指导通知",
-            "开通会员",
-            "使用帮助",
-        ]
-        self.page_title.setText(titles[index])
+        self.page_title.setText(PAGES[index][0])
 
         # 如果是通知页面，加载通知
-        if index == 6:  # 通知页面索引
-            self.notice_widget.load_notices()
-
-    def update_user_info(
-        self, nickname="未登录用户", avatar_path=None, is_vip=False, vip_expire_date=None
-    ):
-        user_info = get_user()  # 调用 API 获取用户信息
-        nickname = user_info.get("nickname", nickname)  # 提取昵称
-        avatar_path = user_info.get("avatar", avatar_path)  # 提取头像路径
+        if index == NOTICE_PAGE:
+            page.load_notices()
+
+    def page(self, index):
+        """返回索引对应的页面，第一次打开时导入模块并替换占位页"""
+        page = self.pages.get(index)
+        if page is not None:
+            return page
+
+        _, module_name, class_name = PAGES[index]
+        QApplication.setOverrideCursor(QCursor(Qt.WaitCursor))
         try:
-            res = requests.get(avatar_path)
-            avatar_path = "docs/avatar.png"
-            with open("docs/avatar.png", "wb") as f:
-                f.write(res.content)
-
-        except:
-            avatar_path = avatar_path
-        vip_expire_date = user_info.get("expiry_time")  # 提取 VIP 到期日期
-        level = user_info.get("level")
-
-        """更新用户信息"""
-        if hasattr(self, "user_info_widget"):
-            self.user_info_widget.set_user_info(
-                nickname=nickname,
-                avatar_path=avatar_path,
-                level=level,
-                vip_expire_date=vip_expire_date,
-            )
+            page = getattr(importlib.import_module(module_name), class_name)()
+        finally:
+            QApplication.restoreOverrideCursor()
+        if index == NOTICE_PAGE:
+            page.notice_read.connect(self.update_notice_badge)  # 连接通知已读信号
+
+        placeholder = self.stacked_widget.widget(index)
+        self.stacked_widget.removeWidget(placeholder)
+        placeholder.deleteLater()
+        self.stacked_widget.insertWidget(index, page)
+        self.pages[index] = page
+        return page
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self.first_painted:
+            # 窗口先显示出来，再在下一轮事件循环中创建默认页面
+            self.first_painted = True
+            QTimer.singleShot(0, lambda: self.on_nav_button_clicked(0))
+
+    def update_user_info(self):
+        """在后台刷新用户资料和头像"""
+        QThreadPool.globalInstance().start(UserInfoLoadTask(self.user_info_signals))
+
+    def show_user_info(self, profile, avatar_path=None):
+        """
+        显示用户信息
+
+        Args:
+            profile: get_user 返回的用户资料，可以是缓存数据
+            avatar_path: 本地头像路径，默认使用该头像 URL 已缓存的文件
+        """
+        self.profile = profile
+        self.user_info_widget.set_user_info(
+            nickname=profile.get("nickname") or "未登录用户",
+            avatar_path=avatar_path or cached_avatar(profile.get("avatar")),
+            level=profile.get("level") or "普通用户",
+            vip_expire_date=profile.get("expiry_time"),
+        )
 
-        # 连接用户信息弹出框的信号
-        if self.user_info_widget.popup:
-            self.user_info_widget.popup.logout_clicked.connect(self.handle_logout)
-            self.user_info_widget.popup.recharge_clicked.connect(self.handle_recharge)
+    def on_avatar_loaded(self, avatar_url, avatar_path):
+        """头像下载完成，资料已切换到其他头像时忽略"""
+        if avatar_url == self.profile.get("avatar"):
+            self.show_user_info(self.profile, avatar_path)
 
     def handle_logout(self):
         """处理退出登录"""
@@ -430,58 +426,98 @@ class MainWindow(QMainWindow):
         # TODO: 实现充值会员功能
         pass
 
-    def check_for_updates(self):
-        """检查更新"""
-        try:
-            has_update, update_info = self.updater.check_for_updates()
-            if has_update and update_info:
-                # 显示更新提示对话框
-                msg = QMessageBox(self)
-                msg.setWindowTitle("发现新版本")
-                msg.setText(f"发现新版本 {update_info['version']}")
-                msg.setInformativeText(
-                    f"当前版本: {self.updater.current_version}\n"
-                    f"最新版本: {update_info['version']}\n"
-                    f"发布日期: {update_info['release_date']}\n"
-                    f"更新说明: {update_info['release_notes']}\n\n"
-                    f"下载地址: {update_info['download_url']}"
-                )
-                msg.setStandardButtons(QMessageBox.Ok)
-
-                # 添加复制下载链接按钮
-                copy_button = msg.addButton("复制下载链接", QMessageBox.ActionRole)
-                copy_button.clicked.connect(
-                    lambda: QApplication.clipboard().setText(update_info["download_url"])
-                )
-
-                msg.exec_()
-        except Exception as e:
-            logging.error(f"检查更新失败: {str(e)}")
-            QMessageBox.warning(self, "更新检查失败", f"检查更新时发生错误: {str(e)}")
+    def prompt_update(self, update_info):
+        """提示新版本，同一版本只提示一次"""
+        if self.update_thread is not None or self.prompted_version == update_info["version"]:
+            return  # 正在下载更新或已提示过
+        self.prompted_version = update_info["version"]
+        # 显示更新提示对话框
+        msg = QMessageBox(self)
+        msg.setWindowTitle("发现新版本")
+        msg.setText(f"发现新版本 {update_info['version']}")
+        msg.setInformativeText(
+            f"当前版本: {self.updater.current_version}\n"
+            f"最新版本: {update_info['version']}\n"
+            f"发布日期: {update_info['release_date']}\n"
+            f"更新说明: {update_info['release_notes']}"
+            + (
+                f"\n\n下载地址: {update_info['download_url']}"
+                if update_info["download_url"]
+                else ""
+            )
+        )
+        msg.setStandardButtons(QMessageBox.Ok)
 
-    def start_update(self, download_url):
-        """开始更新过程"""
-        try:
-            # 下载新版本
-            new_file_path = self.updater.download_update(download_url)
-            if new_file_path:
-                # 安装新版本
-                self.updater.install_update(new_file_path)
-            else:
-                QMessageBox.warning(self, "更新失败", "下载更新失败，请稍后重试。")
-        except Exception as e:
-            QMessageBox.warning(self, "更新失败", f"更新过程中出错：{str(e)}")
+        # 添加立即更新按钮
+        update_button = msg.addButton("立即更新", QMessageBox.AcceptRole)
+        update_button.clicked.connect(lambda: self.start_update(update_info))
+
+        # 添加复制下载链接按钮
+        if update_info["download_url"]:
+            copy_button = msg.addButton("复制下载链接", QMessageBox.ActionRole)
+            copy_button.clicked.connect(
+                lambda: QApplication.clipboard().setText(update_info["download_url"])
+            )
+
+        msg.exec_()
+
+    def start_update(self, update_info):
+        """开始更新过程，后台下载完成后启动 updater 并退出程序"""
+        self.update_progress = QProgressDialog("正在下载更新…", "后台下载", 0, 100, self)
+        self.update_progress.setWindowTitle("更新")
+        self.update_progress.setMinimumDuration(0)
+        self.update_thread = UpdateDownloadThread(self.updater, update_info)
+        self.update_thread.progress_signal.connect(self.on_update_progress)
+        self.update_thread.finished_signal.connect(self.on_update_downloaded)
+        self.update_thread.failed_signal.connect(self.on_update_failed)
+        self.update_thread.start()
+
+    def on_update_progress(self, downloaded, total):
+        if total:
+            self.update_progress.setValue(int(downloaded * 100 / total))
+
+    def on_update_downloaded(self, update_path):
+        self.update_progress.close()
+        self.update_thread = None
+        reply = QMessageBox.question(
+            self,
+            "更新",
+            "更新已下载完成，是否立即重启程序完成安装？",
+            QMessageBox.Yes | QMessageBox.No,
+        )
+        if reply == QMessageBox.Yes:
+            try:
+                self.updater.install_update(update_path)
+            except Exception as e:
+                QMessageBox.warning(self, "更新失败", f"启动更新程序失败：{str(e)}")
+                return
+            QApplication.quit()
+
+    def on_update_failed(self, message):
+        self.update_progress.close()
+        self.update_thread = None
+        # 已下载的部分保留在 .update 目录，下次更新时继续下载
+        QMessageBox.warning(self, "更新失败", f"下载更新失败，请稍后重试：{message}")
 
     def update_notice_badge(self):
+        """重新获取未读数并更新通知红点"""
+        self.set_notice_badge(self.notice_service.get_unread_count())
+
+    def set_notice_badge(self, unread_count):
         """更新通知红点"""
-        unread_count = self.notice_service.get_unread_count()
         if unread_count > 0:
             self.notice_badge.setText(str(min(unread_count, 99)))
             self.notice_badge.show()
         else:
             self.notice_badge.hide()
 
-    def create_notice_page(self):
-        """创建通知页面"""
-        self.notice_widget = NoticeWidget()
-        self.notice_widget.notice_read.connect(self.update_notice_badge)  # 连接通知已读信号
+    def on_task_status(self, message):
+        """推送的任务状态变化，任务中心页面已创建时直接更新对应行"""
+        invalidate_cache("news")
+        page = self.pages.get(TASK_PAGE)
+        if page is not None:
+            page.update_task_status(message["id"], message["status_value"])
+
+    def closeEvent(self, event):
+        self.push_thread.stop()
+        super().closeEvent(event)